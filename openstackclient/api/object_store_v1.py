@@ -13,15 +13,77 @@
 
 """Object Store v1 API Library"""
 
+import hashlib
+import hmac
 import io
 import logging
 import os
 import sys
+import time
+import uuid
 
+from osc_lib import exceptions
 from osc_lib import utils
 from six.moves import urllib
 
 from openstackclient.api import api
+from openstackclient.i18n import _
+
+
+# Size of the chunks read from a streamed object download
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Largest object Swift stores with a single PUT by default
+MAX_SEGMENT_SIZE = 5 * 1024 ** 3
+
+# Size of the segments of an object uploaded from stdin
+DEFAULT_SEGMENT_SIZE = 1024 ** 3
+
+
+def _is_encoded(headers):
+    """Return True if a response body is sent with a Content-Encoding"""
+    encoding = headers.get('content-encoding', '').strip().lower()
+    return encoding not in ('', 'identity')
+
+
+class _StreamReader(object):
+    """Read a file-like stream of unknown size as a series of segments"""
+
+    def __init__(self, stream, segment_size=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        self.stream = stream
+        self.segment_size = segment_size
+        self.chunk_size = chunk_size
+        self._chunk = self._read(segment_size)
+
+    @property
+    def eof(self):
+        return not self._chunk
+
+    def _read(self, remaining=None):
+        if remaining:
+            return self.stream.read(min(self.chunk_size, remaining))
+        return self.stream.read(self.chunk_size)
+
+    def segment(self):
+        """Iterate over the chunks of the next segment of the stream
+
+        The whole stream is a single segment if segment_size is not set.
+        """
+
+        remaining = self.segment_size
+        while self._chunk:
+            chunk = self._chunk
+            if remaining:
+                remaining -= len(chunk)
+                if remaining <= 0:
+                    # Read ahead into the next segment so that the end
+                    # of the stream is known once this segment is sent
+                    self._chunk = self._read(self.segment_size)
+                    yield chunk
+                    return
+            self._chunk = self._read(remaining)
+            yield chunk
 
 
 class APIv1(api.BaseAPI):
@@ -215,15 +277,21 @@ class APIv1(api.BaseAPI):
         container=None,
         object=None,
         name=None,
+        segment_size=None,
     ):
         """Create an object inside a container
 
         :param string container:
             name of container to store object
         :param string object:
-            local path to object
+            local path to object, or '-' to read the object from stdin
         :param string name:
-            name of object to create
+            name of object to create, required when reading from stdin
+        :param integer segment_size:
+            when reading from stdin, store an object larger than this many
+            bytes as segments in ``<container>_segments`` tied together by
+            a dynamic large object manifest, DEFAULT_SEGMENT_SIZE if not
+            given
         :returns:
             dict of returned headers
         """
@@ -232,18 +300,30 @@ class APIv1(api.BaseAPI):
             # TODO(dtroyer): What exception to raise here?
             return {}
 
+        if object == '-' and not name:
+            msg = _("An object name is required when uploading from stdin")
+            raise exceptions.CommandError(msg)
+
         # For uploading a file, if name is provided then set it as the
         # object's name in the container.
         object_name_str = name if name else object
 
         full_url = "%s/%s" % (urllib.parse.quote(container),
                               urllib.parse.quote(object_name_str))
-        with io.open(object, 'rb') as f:
-            response = self.create(
-                full_url,
-                method='PUT',
-                data=f,
+        if object == '-':
+            response = self._object_create_stream(
+                container,
+                object_name_str,
+                getattr(sys.stdin, 'buffer', sys.stdin),
+                segment_size=segment_size or DEFAULT_SEGMENT_SIZE,
             )
+        else:
+            with io.open(object, 'rb') as f:
+                response = self.create(
+                    full_url,
+                    method='PUT',
+                    data=f,
+                )
         data = {
             'account': self._find_account_id(),
             'container': container,
@@ -355,19 +435,35 @@ class APIv1(api.BaseAPI):
         container=None,
         object=None,
         file=None,
+        chunk_size=None,
+        verify=True,
     ):
         """Save an object stored in a container
 
+        The object is written to a temporary file next to ``file`` that is
+        flushed to disk and renamed into place once the download completes,
+        so an interrupted or corrupt download never replaces ``file``.
+
         :param string container:
             name of container that stores object
         :param string object:
             name of object to save
         :param string file:
             local name of object
+        :param integer chunk_size:
+            size in bytes of the chunks read from the response stream,
+            defaults to DEFAULT_CHUNK_SIZE
+        :param boolean verify:
+            if True, compare the MD5 of the downloaded data with the object
+            ETag; segmented (DLO/SLO) objects have no whole-object MD5, and
+            objects with a Content-Encoding are saved decoded, so neither
+            are verified
         """
 
         if not file:
             file = object
+        if not chunk_size:
+            chunk_size = DEFAULT_CHUNK_SIZE
 
         response = self._request(
             'GET',
@@ -376,17 +472,69 @@ class APIv1(api.BaseAPI):
             stream=True,
         )
         if response.status_code == 200:
+            etag = self._get_object_etag(response.headers) if verify else None
+            checksum = hashlib.md5() if etag else None
+
             if file == '-':
                 with os.fdopen(sys.stdout.fileno(), 'wb') as f:
-                    for chunk in response.iter_content(64 * 1024):
-                        f.write(chunk)
-            else:
-                if not os.path.exists(os.path.dirname(file)):
-                    if len(os.path.dirname(file)) > 0:
-                        os.makedirs(os.path.dirname(file))
-                with open(file, 'wb') as f:
-                    for chunk in response.iter_content(64 * 1024):
-                        f.write(chunk)
+                    self._write_object(response, f, chunk_size, checksum)
+                self._verify_object(object, etag, checksum)
+                return
+
+            dirname = os.path.dirname(file)
+            if not os.path.exists(dirname):
+                if len(dirname) > 0:
+                    os.makedirs(dirname)
+            tmp_file = os.path.join(
+                dirname,
+                '.%s.%s' % (os.path.basename(file), uuid.uuid4().hex),
+            )
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                         0o666)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    self._write_object(response, f, chunk_size, checksum)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._verify_object(object, etag, checksum)
+                os.rename(tmp_file, file)
+            except Exception:
+                os.unlink(tmp_file)
+                raise
+
+    def object_stream(
+        self,
+        container=None,
+        object=None,
+    ):
+        """Open the content of an object as a stream
+
+        :param string container:
+            name of container that stores object
+        :param string object:
+            name of object to read
+        :returns:
+            tuple of (file-like object, size in bytes, ETag); the ETag is
+            None for segmented and encoded objects, where it is not the MD5
+            of the object content, and the size is None for encoded objects
+        """
+
+        response = self._request(
+            'GET',
+            "%s/%s" % (urllib.parse.quote(container),
+                       urllib.parse.quote(object)),
+            stream=True,
+        )
+        response.raw.decode_content = True
+        size = response.headers.get('content-length')
+        if _is_encoded(response.headers):
+            # The length is that of the encoded data
+            size = None
+        return (
+            response.raw,
+            int(size) if size is not None else None,
+            self._get_object_etag(response.headers),
+        )
 
     def object_set(
         self,
@@ -479,6 +627,120 @@ class APIv1(api.BaseAPI):
 
         return data
 
+    def object_temp_url(
+        self,
+        container,
+        object,
+        expires,
+        key,
+        method='GET',
+        digest='sha256',
+    ):
+        """Generate a temporary URL for an object
+
+        The URL is signed locally, no request is made.
+
+        :param string container:
+            container name for object
+        :param string object:
+            name of object
+        :param integer expires:
+            expiry time of the URL in seconds since the epoch
+        :param string key:
+            temporary URL key of the container or account
+        :param string method:
+            HTTP method the URL is valid for
+        :param string digest:
+            name of the HMAC digest, one of sha1, sha256 or sha512
+        :returns:
+            temporary URL string
+        """
+
+        url_parts = urllib.parse.urlparse(self.endpoint)
+        path = '/'.join([url_parts.path.rstrip('/'), container, object])
+        hmac_body = '\n'.join([method.upper(), str(int(expires)), path])
+        signature = hmac.new(
+            key.encode('utf-8'),
+            hmac_body.encode('utf-8'),
+            getattr(hashlib, digest),
+        ).hexdigest()
+        query = urllib.parse.urlencode([
+            ('temp_url_sig', signature),
+            ('temp_url_expires', int(expires)),
+        ])
+        return '%s://%s%s?%s' % (url_parts.scheme, url_parts.netloc,
+                                 urllib.parse.quote(path), query)
+
+    def object_form_post(
+        self,
+        container,
+        expires,
+        key,
+        prefix='',
+        redirect='',
+        max_file_size=0,
+        max_file_count=1,
+        digest='sha256',
+    ):
+        """Sign an HTML form uploading objects with the FormPost middleware
+
+        The form is signed locally, no request is made.
+
+        :param string container:
+            container name the objects are uploaded to
+        :param integer expires:
+            expiry time of the form in seconds since the epoch
+        :param string key:
+            temporary URL key of the container or account
+        :param string prefix:
+            prefix of the names of the uploaded objects
+        :param string redirect:
+            URL the browser is redirected to once the upload is done
+        :param integer max_file_size:
+            maximum size in bytes of each uploaded file
+        :param integer max_file_count:
+            maximum number of files uploaded with the form
+        :param string digest:
+            name of the HMAC digest, one of sha1, sha256 or sha512
+        :returns:
+            tuple of (form action URL, signature)
+        """
+
+        url_parts = urllib.parse.urlparse(self.endpoint)
+        path = '/'.join([url_parts.path.rstrip('/'), container, prefix])
+        hmac_body = '\n'.join([path, redirect, str(int(max_file_size)),
+                               str(int(max_file_count)), str(int(expires))])
+        signature = hmac.new(
+            key.encode('utf-8'),
+            hmac_body.encode('utf-8'),
+            getattr(hashlib, digest),
+        ).hexdigest()
+        url = '%s://%s%s' % (url_parts.scheme, url_parts.netloc,
+                             urllib.parse.quote(path))
+        return url, signature
+
+    def temp_url_key(
+        self,
+        container=None,
+    ):
+        """Get the key used to sign temporary URLs
+
+        The container key is preferred over the account key.
+
+        :param string container:
+            name of container to look for a key on first
+        :returns:
+            key string or None if no key is set
+        """
+
+        if container:
+            response = self._request('HEAD', urllib.parse.quote(container))
+            key = response.headers.get('x-container-meta-temp-url-key')
+            if key:
+                return key
+        response = self._request('HEAD', '')
+        return response.headers.get('x-account-meta-temp-url-key')
+
     def account_set(
         self,
         properties,
@@ -531,6 +793,90 @@ class APIv1(api.BaseAPI):
         if headers:
             self.create("", headers=headers)
 
+    def _get_object_etag(self, headers):
+        # NOTE: The ETag of a dynamic or static large object is computed
+        # over the segment ETags, not over the object content, so there is
+        # nothing to compare the downloaded data against.
+        if 'x-object-manifest' in headers:
+            return None
+        # NOTE: The ETag of an object stored with a Content-Encoding is the
+        # MD5 of the encoded data, which requests decodes as it is read.
+        if _is_encoded(headers):
+            return None
+        if headers.get('x-static-large-object', '').lower() == 'true':
+            return None
+        etag = headers.get('etag')
+        if etag:
+            return etag.strip('"')
+        return None
+
+    def _write_object(self, response, f, chunk_size, checksum=None):
+        for chunk in response.iter_content(chunk_size):
+            if checksum:
+                checksum.update(chunk)
+            f.write(chunk)
+
+    def _verify_object(self, object, etag, checksum):
+        if checksum and checksum.hexdigest() != etag:
+            msg = _("Checksum mismatch for object %(object)s: "
+                    "expected %(etag)s, got %(md5)s")
+            raise exceptions.CommandError(msg % {
+                'object': object,
+                'etag': etag,
+                'md5': checksum.hexdigest(),
+            })
+
+    def _object_create_stream(
+        self,
+        container,
+        name,
+        stream,
+        segment_size=None,
+    ):
+        # The size of the stream is not known in advance so it is sent
+        # with chunked transfer encoding.
+        full_url = "%s/%s" % (urllib.parse.quote(container),
+                              urllib.parse.quote(name))
+        reader = _StreamReader(stream, segment_size=segment_size)
+        response = self.create(full_url, method='PUT', data=reader.segment())
+        if reader.eof:
+            return response
+
+        # The stream outgrew a single segment: copy what has been uploaded
+        # so far into the first segment of a dynamic large object, upload
+        # the rest as further segments and replace the object with the
+        # manifest once the stream is exhausted.
+        segment_container = '%s_segments' % container
+        segment_prefix = '%s/%f/%d' % (name, time.time(), segment_size)
+        self.container_create(container=segment_container)
+
+        def segment_url(index):
+            return "%s/%s/%08d" % (urllib.parse.quote(segment_container),
+                                   urllib.parse.quote(segment_prefix),
+                                   index)
+
+        index = 0
+        self.create(
+            segment_url(index),
+            method='PUT',
+            headers={'X-Copy-From': '/' + full_url},
+        )
+        while not reader.eof:
+            index += 1
+            self.create(segment_url(index), method='PUT',
+                        data=reader.segment())
+
+        return self.create(
+            full_url,
+            method='PUT',
+            headers={
+                'X-Object-Manifest': '%s/%s/' % (
+                    urllib.parse.quote(segment_container),
+                    urllib.parse.quote(segment_prefix),
+                ),
+            },
+        )
+
     def _find_account_id(self):
         url_parts = urllib.parse.urlparse(self.endpoint)
         return url_parts.path.split('/')[-1]
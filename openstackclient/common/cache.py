@@ -0,0 +1,235 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""On-disk cache of resource names"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+from oslo_utils import strutils
+
+from openstackclient.common import parallel
+
+
+LOG = logging.getLogger(__name__)
+
+# Number of seconds a cached name is trusted before it is looked up again
+CACHE_TTL = 3600
+
+# Number of seconds a failed lookup is remembered, so that the IDs of
+# deleted resources are not looked up on every invocation
+NEGATIVE_TTL = 300
+
+# Above this number of unknown IDs, the whole listing is fetched rather
+# than each resource
+MAX_LOOKUPS = 5
+
+
+def cache_dir():
+    """Return the directory the name caches are kept in"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'openstackclient', 'names')
+
+
+class NameCache(object):
+    """Map of resource IDs to names kept on disk between invocations
+
+    Names are kept per kind of resource (``image``, ``flavor``, ...) and
+    expire after ``ttl`` seconds.  IDs that could not be looked up are
+    remembered for ``negative_ttl`` seconds.  A cache file holds the names
+    visible to one project of one cloud; without a path the names are only
+    kept in memory.
+    """
+
+    def __init__(self, path, ttl=CACHE_TTL, negative_ttl=NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = min(negative_ttl, ttl)
+        self._dirty = False
+        self._names = {}
+        if not path:
+            return
+        try:
+            with open(path) as f:
+                self._names = json.load(f)
+        except (IOError, OSError, ValueError):
+            pass
+
+    @classmethod
+    def from_client_manager(cls, client_manager, ttl=None):
+        """Return the cache for the current cloud and project
+
+        The cache is disabled by setting ``name_cache: false`` in the cloud
+        configuration or ``OS_NAME_CACHE=false`` in the environment, and
+        its TTL is set by ``name_cache_ttl`` or ``OS_NAME_CACHE_TTL``.
+
+        :returns:
+            a NameCache, or None if the project is not known or the cache
+            is disabled
+        """
+        config = client_manager.get_configuration()
+        enabled = config.get('name_cache',
+                             os.environ.get('OS_NAME_CACHE', True))
+        if not strutils.bool_from_string(enabled, default=True):
+            return None
+        if ttl is None:
+            try:
+                ttl = int(config.get('name_cache_ttl',
+                                     os.environ.get('OS_NAME_CACHE_TTL',
+                                                    CACHE_TTL)))
+            except ValueError:
+                ttl = CACHE_TTL
+        if ttl <= 0:
+            return None
+        auth_ref = client_manager.auth_ref
+        if not auth_ref or not auth_ref.project_id:
+            return None
+        scope = '|'.join(str(x) for x in (
+            config.get('auth', {}).get('auth_url'),
+            config.get('region_name'),
+            auth_ref.project_id,
+        ))
+        name = hashlib.sha256(scope.encode('utf-8')).hexdigest() + '.json'
+        return cls(os.path.join(cache_dir(), name), ttl=ttl)
+
+    def _fresh(self, entry, now):
+        ttl = self.ttl if entry[0] is not None else self.negative_ttl
+        return now - entry[1] < ttl
+
+    def get(self, kind, resource_id):
+        """Return the cached name of a resource, or None if not known"""
+        entry = self._names.get(kind, {}).get(resource_id)
+        if entry and entry[0] is not None and self._fresh(entry, time.time()):
+            return entry[0]
+        return None
+
+    def is_missing(self, kind, resource_id):
+        """Return True if the resource recently failed to be looked up"""
+        entry = self._names.get(kind, {}).get(resource_id)
+        return bool(entry and entry[0] is None and
+                    self._fresh(entry, time.time()))
+
+    def has_names(self, kind):
+        """Return True if any unexpired name of kind is cached"""
+        now = time.time()
+        return any(entry[0] is not None and self._fresh(entry, now)
+                   for entry in self._names.get(kind, {}).values())
+
+    def set(self, kind, resource_id, name):
+        self._names.setdefault(kind, {})[resource_id] = [
+            name or '', time.time()]
+        self._dirty = True
+
+    def set_missing(self, kind, resource_id):
+        """Remember that a resource could not be looked up"""
+        self._names.setdefault(kind, {})[resource_id] = [None, time.time()]
+        self._dirty = True
+
+    def save(self):
+        """Write the cache back to disk if it has changed
+
+        The file is replaced atomically; failing to write it only logs,
+        as the cache is an optimisation.
+        """
+        if not self._dirty or not self.path:
+            return
+        now = time.time()
+        names = {}
+        for kind, entries in self._names.items():
+            names[kind] = dict((k, v) for k, v in entries.items()
+                               if self._fresh(v, now))
+        directory = os.path.dirname(self.path)
+        temp = os.path.join(directory, '.%s.%s' % (
+            os.path.basename(self.path), uuid.uuid4().hex))
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(names, f)
+            os.rename(temp, self.path)
+        except (IOError, OSError) as e:
+            LOG.debug('Unable to write name cache %s: %s', self.path, e)
+            try:
+                os.unlink(temp)
+            except OSError:
+                pass
+        else:
+            self._names = names
+            self._dirty = False
+
+
+def get_names(name_cache, kind, ids, get, list_all=None):
+    """Map resource IDs to names
+
+    Cached names are used first.  When list_all is given and nothing of
+    this kind is cached yet, or more than MAX_LOOKUPS IDs are unknown, the
+    whole listing is fetched once to fill the cache; otherwise only the
+    unknown IDs are looked up, concurrently.  Lookups that fail map to None
+    and are not retried until the negative TTL of the cache expires.
+
+    :param name_cache:
+        a NameCache, or None to always look names up
+    :param string kind:
+        kind of resource, e.g. ``image``
+    :param ids:
+        iterable of resource IDs, duplicates and None are ignored
+    :param callable get:
+        function returning the resource with the given ID
+    :param callable list_all:
+        function returning all resources of this kind
+    :returns:
+        dict mapping each ID to its name, or None
+    """
+    ids = set(i for i in ids if i is not None)
+    names = {}
+    if name_cache:
+        for i in ids:
+            names[i] = name_cache.get(kind, i)
+    missing = [i for i in ids if names.get(i) is None and
+               not (name_cache and name_cache.is_missing(kind, i))]
+    if not missing:
+        return names
+
+    if list_all and (len(missing) > MAX_LOOKUPS or
+                     not (name_cache and name_cache.has_names(kind))):
+        try:
+            resources = list_all()
+        except Exception:
+            resources = []
+        found = dict((r.id, r.name) for r in resources)
+        failed = []
+    else:
+        results = parallel.run(get, missing, return_exceptions=True)
+        found = dict((i, r.name) for i, r in zip(missing, results)
+                     if not isinstance(r, Exception))
+        failed = [i for i in missing if i not in found]
+
+    for i, name in found.items():
+        if name_cache:
+            name_cache.set(kind, i, name)
+        if i in ids:
+            names[i] = name
+    for i in failed:
+        if name_cache:
+            name_cache.set_missing(kind, i)
+    for i in missing:
+        names.setdefault(i, None)
+    if name_cache:
+        name_cache.save()
+    return names
@@ -0,0 +1,97 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Run independent API calls over a bounded pool of threads"""
+
+from multiprocessing import pool
+import threading
+import time
+
+
+# Default number of API calls in flight at any time
+DEFAULT_WORKERS = 10
+
+
+def run(func, items, workers=None, return_exceptions=False):
+    """Call func once for each of items, concurrently
+
+    :param callable func:
+        function called with a single item
+    :param items:
+        iterable of items
+    :param integer workers:
+        maximum number of concurrent calls, defaults to DEFAULT_WORKERS
+    :param boolean return_exceptions:
+        if True, an exception raised by func is returned in place of the
+        result for that item, else the first exception is re-raised once
+        all calls have finished
+    :returns:
+        list of results in the order of items
+    """
+
+    items = list(items)
+    if not items:
+        return []
+
+    def _call(item):
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    workers = min(workers or DEFAULT_WORKERS, len(items))
+    if workers <= 1:
+        outcomes = [_call(item) for item in items]
+    else:
+        thread_pool = pool.ThreadPool(workers)
+        try:
+            outcomes = thread_pool.map(_call, items)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+
+    results = []
+    for result, error in outcomes:
+        if error is not None:
+            if not return_exceptions:
+                raise error
+            result = error
+        results.append(result)
+    return results
+
+
+class RateLimiter(object):
+    """Space out calls made from several threads
+
+    Each call to wait() returns no sooner than 1/rate seconds after the
+    previous one was allowed through.
+    """
+
+    def __init__(self, rate=None):
+        """
+        :param float rate:
+            maximum number of calls per second, or None for no limit
+        """
+        self.interval = 1.0 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,186 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Helpers for streaming image and object data"""
+
+import hashlib
+import sys
+import threading
+import time
+
+from six.moves import queue
+
+
+# Size of the chunks read from the source of a HashingReader
+CHUNK_SIZE = 1024 * 1024
+
+# Number of chunks a HashingReader buffers ahead of its consumer
+READ_AHEAD = 16
+
+
+class HashingReader(object):
+    """File-like wrapper that hashes data as it is read
+
+    Once the first chunk is requested a background thread reads ahead
+    from the source, so that reading the source overlaps with sending the
+    previous chunks over the network.  read() returns whole chunks as
+    they were read from the source, regardless of the size requested.
+    """
+
+    def __init__(self, source, algorithms=('md5', 'sha512'), size=None,
+                 chunk_size=CHUNK_SIZE, read_ahead=READ_AHEAD,
+                 progress=None):
+        """Wrap a file-like source
+
+        :param source:
+            file-like object to read from
+        :param algorithms:
+            names of the hashlib algorithms to compute
+        :param integer size:
+            expected number of bytes, used to report progress
+        :param integer chunk_size:
+            number of bytes read from source at a time
+        :param integer read_ahead:
+            maximum number of chunks buffered ahead of the consumer
+        :param callable progress:
+            called with this reader after every chunk
+        """
+
+        self.source = source
+        self.hashes = dict((a, hashlib.new(a)) for a in algorithms)
+        self.size = size
+        self.bytes = 0
+        self.eof = False
+        self.chunk_size = chunk_size
+        self._progress = progress
+        self._start = None
+        self._queue = queue.Queue(read_ahead)
+        self._closed = threading.Event()
+        self._thread = None
+
+    def _read_ahead(self):
+        try:
+            while not self._closed.is_set():
+                chunk = self.source.read(self.chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item):
+        # Give up once the consumer has gone away rather than block
+        # forever on a full queue
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def read(self, size=-1):
+        """Return the next chunk of data, or an empty string at the end"""
+
+        if self.eof:
+            return b''
+        if self._thread is None:
+            self._start = time.time()
+            self._thread = threading.Thread(target=self._read_ahead)
+            self._thread.daemon = True
+            self._thread.start()
+
+        chunk = self._queue.get()
+        if isinstance(chunk, Exception):
+            self.eof = True
+            raise chunk
+        if not chunk:
+            self.eof = True
+            return b''
+
+        for h in self.hashes.values():
+            h.update(chunk)
+        self.bytes += len(chunk)
+        if self._progress:
+            self._progress(self)
+        return chunk
+
+    def hexdigest(self, algorithm):
+        return self.hashes[algorithm].hexdigest()
+
+    @property
+    def elapsed(self):
+        """Seconds since the first chunk was requested"""
+        if self._start is None:
+            return 0.0
+        return time.time() - self._start
+
+    @property
+    def throughput(self):
+        """Average number of bytes read per second"""
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return self.bytes / elapsed
+
+    def close(self):
+        self._closed.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _format_bytes(count):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if count < 1024:
+            return '%.1f %s' % (count, unit)
+        count /= 1024.0
+    return '%.1f TiB' % count
+
+
+class Progress(object):
+    """Report the progress of a HashingReader
+
+    An instance is meant to be passed as the progress callback of a
+    HashingReader; it rewrites a single status line on the output stream
+    at most once per interval.
+    """
+
+    def __init__(self, output=None, interval=0.5):
+        self.output = output or sys.stderr
+        self.interval = interval
+        self._last = 0
+
+    def _write(self, reader, end=''):
+        if reader.size:
+            percent = 100.0 * reader.bytes / reader.size
+            line = '%3d%% %s of %s' % (percent,
+                                       _format_bytes(reader.bytes),
+                                       _format_bytes(reader.size))
+        else:
+            line = _format_bytes(reader.bytes)
+        line += ' (%s/s)' % _format_bytes(reader.throughput)
+        self.output.write('\r' + line + end)
+        self.output.flush()
+
+    def __call__(self, reader):
+        now = time.time()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._write(reader)
+
+    def finish(self, reader):
+        """Write the final status line"""
+        self._write(reader, end='\n')
@@ -0,0 +1,154 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Wait for long-running operations with adaptive polling"""
+
+import logging
+import random
+import time
+
+from openstackclient.i18n import _
+
+
+LOG = logging.getLogger(__name__)
+
+# First and longest interval between two polls (seconds)
+INITIAL_INTERVAL = 1
+MAX_INTERVAL = 30
+
+# Each interval is this many times the previous one
+BACKOFF_FACTOR = 1.5
+
+# Intervals are randomly lengthened or shortened by up to this fraction so
+# that clients started at the same time do not poll in lockstep
+JITTER = 0.25
+
+# Typical duration of operations (seconds), used as a hint to poll less
+# often for the slow ones
+EXPECTED_DURATION = {
+    'image_import': 60,
+    'image_snapshot': 120,
+    'server_action': 10,
+    'server_build': 30,
+    'server_delete': 10,
+    'server_migrate': 60,
+    'server_resize': 60,
+}
+
+
+def intervals(expected_duration=None, timeout=None):
+    """Generate the intervals to sleep for between polls
+
+    The intervals grow exponentially from INITIAL_INTERVAL to MAX_INTERVAL.
+    With an expected duration the first interval is a tenth of it and the
+    intervals may grow to a fifth of it.
+
+    :param expected_duration: typical duration of the operation (seconds)
+    :param timeout: stop once the intervals add up to this (seconds)
+    """
+    interval = INITIAL_INTERVAL
+    maximum = MAX_INTERVAL
+    if expected_duration:
+        interval = max(interval, expected_duration / 10.0)
+        maximum = max(maximum, expected_duration / 5.0)
+
+    waited = 0
+    while timeout is None or waited < timeout:
+        sleep = interval * random.uniform(1 - JITTER, 1 + JITTER)
+        if timeout is not None:
+            sleep = min(sleep, timeout - waited)
+        waited += sleep
+        yield sleep
+        interval = min(interval * BACKOFF_FACTOR, maximum)
+
+
+def wait_for_status(status_f,
+                    res_id,
+                    status_field='status',
+                    success_status=['active'],
+                    error_status=['error'],
+                    callback=None,
+                    expected_duration=None,
+                    timeout=None):
+    """Wait for status change on a resource during a long-running operation
+
+    :param status_f: a status function that takes a single id argument
+    :param res_id: the resource id to watch
+    :param status_field: the status attribute in the returned resource object
+    :param success_status: a list of status strings for successful completion
+    :param error_status: a list of status strings for error
+    :param callback: called per sleep cycle, useful to display progress
+    :param expected_duration: typical duration of the operation (seconds)
+    :param timeout: give up after waiting this long (seconds)
+    :rtype: True on success, False on error or timeout
+    """
+    schedule = intervals(expected_duration, timeout)
+    while True:
+        res = status_f(res_id)
+        status = (getattr(res, status_field, '') or '').lower()
+        if status in success_status:
+            return True
+        if status in error_status:
+            return False
+        if callback:
+            progress = getattr(res, 'progress', None) or 0
+            callback(progress)
+        try:
+            time.sleep(next(schedule))
+        except StopIteration:
+            LOG.error(_('Timed out waiting for %s'), res_id)
+            return False
+
+
+def wait_for_delete(manager,
+                    res_id,
+                    status_field='status',
+                    error_status=['error'],
+                    exception_name=['NotFound'],
+                    callback=None,
+                    expected_duration=None,
+                    timeout=300):
+    """Wait for resource deletion
+
+    :param manager: the manager from which we can get the resource
+    :param res_id: the resource id to watch
+    :param status_field: the status attribute in the returned resource object,
+        this is used to check for error states while the resource is being
+        deleted
+    :param error_status: a list of status strings for error
+    :param exception_name: a list of exception strings for deleted case
+    :param callback: called per sleep cycle, useful to display progress
+    :param expected_duration: typical duration of the deletion (seconds)
+    :param timeout: give up after waiting this long (seconds)
+    :rtype: True on success, False on error or timeout
+    """
+    schedule = intervals(expected_duration, timeout)
+    while True:
+        try:
+            res = manager.get(res_id)
+        except Exception as ex:
+            if type(ex).__name__ in exception_name:
+                return True
+            raise
+
+        status = (getattr(res, status_field, '') or '').lower()
+        if status in error_status:
+            return False
+        if callback:
+            progress = getattr(res, 'progress', None) or 0
+            callback(progress)
+        try:
+            time.sleep(next(schedule))
+        except StopIteration:
+            LOG.error(_('Timed out waiting for %s to be deleted'), res_id)
+            return False
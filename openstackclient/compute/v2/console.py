@@ -15,13 +15,55 @@
 
 """Compute v2 Console action implementations"""
 
+import time
+
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import utils
 
+from openstackclient.common import wait
 from openstackclient.i18n import _
 
 
+# Number of lines retrieved from the end of the console log on each poll
+# when following it, doubled while the lines already shown are not found
+FOLLOW_LINES = 50
+MAX_FOLLOW_LINES = 3200
+
+# Number of lines shown last that are looked for in a new tail of the log
+OVERLAP_LINES = 10
+
+
+def _complete_lines(data):
+    """Split console output into lines, leaving out an unfinished last line"""
+    lines = (data or '').splitlines(True)
+    if lines and not lines[-1].endswith('\n'):
+        lines.pop()
+    return lines
+
+
+def _new_lines(shown, lines):
+    """Return the lines of a tail of the log that have not been shown yet
+
+    The console log has no offset to resume from, so the last lines shown
+    are looked for in the new tail, either in full or, when fewer lines
+    than those were left from the previous tail, at its start.
+
+    :param shown: the last lines shown
+    :param lines: complete lines from the end of the log
+    :returns: the new lines, or None if the lines shown are not found
+    """
+    if not shown:
+        return lines
+    for end in range(len(lines), len(shown) - 1, -1):
+        if lines[end - len(shown):end] == shown:
+            return lines[end:]
+    for overlap in range(min(len(shown) - 1, len(lines)), 0, -1):
+        if lines[:overlap] == shown[-overlap:]:
+            return lines[overlap:]
+    return None
+
+
 class ShowConsoleLog(command.Command):
     _description = _("Show server's console output")
 
@@ -41,8 +83,48 @@ class ShowConsoleLog(command.Command):
             help=_("Number of lines to display from the end of the log "
                    "(default=all)")
         )
+        parser.add_argument(
+            '--follow',
+            action='store_true',
+            default=False,
+            help=_("Keep displaying the lines added to the log until "
+                   "interrupted. Only the end of the log is retrieved "
+                   "on each poll, and polls are spaced out while the "
+                   "log does not change.")
+        )
         return parser
 
+    def _follow(self, server, lines):
+        """Display the lines added to the log until interrupted
+
+        :param server: the server whose console log is displayed
+        :param lines: the complete lines displayed so far
+        """
+        shown = lines[-OVERLAP_LINES:]
+        length = FOLLOW_LINES
+        schedule = wait.intervals()
+        while True:
+            time.sleep(next(schedule))
+            while True:
+                # Without any line shown there is nothing to look for,
+                # so the whole log is retrieved
+                tail = _complete_lines(server.get_console_output(
+                    length=length if shown else None))
+                new = _new_lines(shown, tail)
+                if new is not None or length is None:
+                    break
+                length = length * 2 if length < MAX_FOLLOW_LINES else None
+            if new is None:
+                # The log was truncated, when the server was rebuilt for
+                # instance, so it is displayed again from the start
+                new = tail
+            if new:
+                self.app.stdout.write(''.join(new))
+                self.app.stdout.flush()
+                shown = (shown + new)[-OVERLAP_LINES:]
+                schedule = wait.intervals()
+            length = max(FOLLOW_LINES, min(2 * len(new), MAX_FOLLOW_LINES))
+
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
 
@@ -58,6 +140,17 @@ class ShowConsoleLog(command.Command):
 
         data = server.get_console_output(length=length)
 
+        if parsed_args.follow:
+            # An unfinished last line is displayed once it is complete
+            lines = _complete_lines(data)
+            self.app.stdout.write(''.join(lines))
+            self.app.stdout.flush()
+            try:
+                self._follow(server, lines)
+            except KeyboardInterrupt:
+                pass
+            return
+
         if data and data[-1] != '\n':
             data += '\n'
         self.app.stdout.write(data)
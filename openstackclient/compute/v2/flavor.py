@@ -23,6 +23,7 @@ from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
@@ -302,8 +303,20 @@ class ListFlavor(command.Lister):
                 "RXTX Factor",
                 "Properties",
             )
+            # From microversion 2.61 the extra specs are embedded in the
+            # flavors listed, else they are retrieved for each flavor,
+            # concurrently
+            embedded = (compute_client.api_version >=
+                        api_versions.APIVersion('2.61'))
+            missing = []
             for f in data:
-                f.properties = f.get_keys()
+                if embedded and 'extra_specs' in f._info:
+                    f.properties = f._info['extra_specs']
+                else:
+                    missing.append(f)
+            extra_specs = parallel.run(lambda f: f.get_keys(), missing)
+            for f, properties in zip(missing, extra_specs):
+                f.properties = properties
 
         column_headers = columns
 
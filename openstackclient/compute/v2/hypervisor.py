@@ -24,6 +24,39 @@ from osc_lib import utils
 from openstackclient.i18n import _
 
 
+def _index_aggregates(aggregates):
+    """Map each host to the aggregates it is a member of
+
+    :param aggregates: a list of Aggregate resources
+    :rtype: a dict mapping host names to lists of Aggregate resources
+    """
+    index = {}
+    for aggregate in aggregates:
+        for host in aggregate.hosts or []:
+            index.setdefault(host, []).append(aggregate)
+    return index
+
+
+def _get_aggregate_names(index, host):
+    """Return the names of the aggregates a service host is a member of
+
+    :param index: a dict returned by _index_aggregates()
+    :param host: the host of the compute service of a hypervisor
+    :rtype: a list of aggregate names
+    """
+    # Hypervisors in nova cells are prefixed by "<cell>@"
+    if "@" in host:
+        cell, service_host = host.split('@', 1)
+    else:
+        cell = None
+        service_host = host
+
+    # The host aggregates are also prefixed by "<cell>@"
+    return [aggregate.name
+            for aggregate in index.get(service_host, [])
+            if not cell or cell in aggregate.name]
+
+
 class ListHypervisor(command.Lister):
     _description = _("List hypervisors")
 
@@ -51,16 +84,26 @@ class ListHypervisor(command.Lister):
             "State"
         )
         if parsed_args.long:
-            columns += ("vCPUs Used", "vCPUs", "Memory MB Used", "Memory MB")
+            columns += ("vCPUs Used", "vCPUs", "Memory MB Used", "Memory MB",
+                        "Aggregates")
 
         if parsed_args.matching:
             data = compute_client.hypervisors.search(parsed_args.matching)
         else:
             data = compute_client.hypervisors.list()
 
+        if parsed_args.long:
+            # Resolve the aggregates of all the hypervisors at once
+            index = _index_aggregates(compute_client.aggregates.list())
+            for s in data:
+                service = getattr(s, 'service', None) or {}
+                s.aggregates = _get_aggregate_names(
+                    index, service.get('host', ''))
+
         return (columns,
                 (utils.get_item_properties(
                     s, columns,
+                    formatters={'Aggregates': utils.format_list},
                 ) for s in data))
 
 
@@ -81,28 +124,9 @@ class ShowHypervisor(command.ShowOne):
         hypervisor = utils.find_resource(compute_client.hypervisors,
                                          parsed_args.hypervisor)._info.copy()
 
-        aggregates = compute_client.aggregates.list()
-        hypervisor["aggregates"] = list()
-        if aggregates:
-            # Hypervisors in nova cells are prefixed by "<cell>@"
-            if "@" in hypervisor['service']['host']:
-                cell, service_host = hypervisor['service']['host'].split('@',
-                                                                         1)
-            else:
-                cell = None
-                service_host = hypervisor['service']['host']
-
-            if cell:
-                # The host aggregates are also prefixed by "<cell>@"
-                member_of = [aggregate.name
-                             for aggregate in aggregates
-                             if cell in aggregate.name and
-                             service_host in aggregate.hosts]
-            else:
-                member_of = [aggregate.name
-                             for aggregate in aggregates
-                             if service_host in aggregate.hosts]
-            hypervisor["aggregates"] = member_of
+        hypervisor["aggregates"] = _get_aggregate_names(
+            _index_aggregates(compute_client.aggregates.list()),
+            hypervisor['service']['host'])
 
         try:
             uptime = compute_client.hypervisors.uptime(hypervisor['id'])._info
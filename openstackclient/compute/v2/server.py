@@ -16,12 +16,18 @@
 """Compute v2 Server action implementations"""
 
 import argparse
+import datetime
+import functools
 import getpass
 import io
+import json
 import logging
 import os
+import subprocess
+import time
 
 from novaclient import api_versions
+from novaclient import exceptions as nova_exceptions
 from novaclient.v2 import servers
 from openstack import exceptions as sdk_exceptions
 from osc_lib.cli import parseractions
@@ -30,7 +36,11 @@ from osc_lib import exceptions
 from osc_lib import utils
 from oslo_utils import timeutils
 import six
+import yaml
 
+from openstackclient.common import cache
+from openstackclient.common import parallel
+from openstackclient.common import wait
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 from openstackclient.network import common as network_common
@@ -122,7 +132,304 @@ def _prefix_checked_value(prefix):
     return func
 
 
-def _prep_server_detail(compute_client, image_client, server, refresh=True):
+def _add_parallel_option_to_parser(parser):
+    parser.add_argument(
+        '--parallel',
+        metavar='<num-servers>',
+        type=int,
+        default=None,
+        help=_('Act on up to <num-servers> servers at the same time. '
+               'Failures are reported once all servers have been '
+               'processed (default: one server at a time, stopping at the '
+               'first failure)'),
+    )
+
+
+def _act_on_servers(compute_client, servers, action, verb, workers=None):
+    """Find each server and apply an action to it
+
+    :param compute_client: a compute client instance
+    :param servers: names or IDs of the servers
+    :param action: function called with each Server resource
+    :param verb: name of the action used in error messages, e.g. ``stop``
+    :param workers: number of servers to act on concurrently. If not given
+                    the servers are processed one at a time and the first
+                    error is raised as is.
+    :rtype: a list of the Server resources acted on
+    """
+    def _act(server):
+        server = utils.find_resource(compute_client.servers, server)
+        action(server)
+        return server
+
+    if workers is None:
+        return [_act(server) for server in servers]
+
+    if workers < 1:
+        msg = _('--parallel must be a positive number')
+        raise exceptions.CommandError(msg)
+
+    result = 0
+    results = parallel.run(_act, servers, workers=workers,
+                           return_exceptions=True)
+    for server, e in zip(servers, results):
+        if isinstance(e, Exception):
+            result += 1
+            LOG.error(_("Failed to %(verb)s server with name or ID "
+                        "'%(server)s': %(e)s"),
+                      {'verb': verb, 'server': server, 'e': e})
+
+    if result > 0:
+        total = len(servers)
+        msg = (_("%(result)s of %(total)s servers failed to %(verb)s.") %
+               {'result': result, 'total': total, 'verb': verb})
+        raise exceptions.CommandError(msg)
+    return results
+
+
+def _add_wait_option_to_parser(parser):
+    parser.add_argument(
+        '--wait',
+        action='store_true',
+        help=_('Wait for the action to complete on all servers'),
+    )
+
+
+def _wait_for_servers(compute_client, server_ids, success_status=('active',),
+                      error_status=('error',), callback=None,
+                      expected_duration=None, timeout=None,
+                      all_projects=False):
+    """Wait for a set of servers to reach a status
+
+    Rather than fetching every server on each poll, the servers changed
+    since the wait began are listed, following every page of the listing;
+    only servers missing from that listing, for instance because they were
+    deleted, are fetched one by one.
+
+    :param compute_client: a compute client instance
+    :param server_ids: IDs of the servers to watch
+    :param success_status: statuses for successful completion, ``deleted``
+                           also matches servers that no longer exist
+    :param error_status: statuses for error
+    :param callback: called per poll with the percentage of servers done
+    :param expected_duration: typical duration of the operation (seconds)
+    :param timeout: give up after waiting this long (seconds); the servers
+                    still pending then count as failed
+    :param all_projects: list the servers of all projects, for servers that
+                         do not all belong to the current project
+    :rtype: a list of the IDs of the servers that failed
+    """
+    schedule = wait.intervals(expected_duration, timeout)
+    # Allow for some clock skew between the client and the API
+    since = (timeutils.utcnow() - datetime.timedelta(minutes=1)).strftime(
+        '%Y-%m-%dT%H:%M:%SZ')
+    total = len(server_ids)
+    pending = set(server_ids)
+    failed = []
+    search_opts = {'changes-since': since}
+    if all_projects:
+        search_opts['all_tenants'] = True
+    while pending:
+        statuses = {}
+        for server in compute_client.servers.list(
+                search_opts=dict(search_opts), limit=-1):
+            if server.id in pending:
+                statuses[server.id] = server.status
+        for server_id in pending - set(statuses):
+            try:
+                statuses[server_id] = compute_client.servers.get(
+                    server_id).status
+            except nova_exceptions.NotFound:
+                statuses[server_id] = 'deleted'
+
+        for server_id, status in statuses.items():
+            status = (status or '').lower()
+            if status in success_status:
+                pending.discard(server_id)
+            elif status in error_status or status == 'deleted':
+                pending.discard(server_id)
+                failed.append(server_id)
+
+        if callback:
+            callback((total - len(pending)) * 100 // total)
+        if pending:
+            try:
+                time.sleep(next(schedule))
+            except StopIteration:
+                LOG.error(_('Timed out waiting for %d servers'),
+                          len(pending))
+                failed.extend(pending)
+                break
+    return failed
+
+
+def _wait_for_server_action(app, compute_client, servers, success_status,
+                            verb):
+    """Wait for an action on servers to complete, showing progress
+
+    :raises CommandError: if any of the servers failed
+    """
+    def _show_progress(progress):
+        app.stdout.write('\rProgress: %s' % progress)
+        app.stdout.flush()
+
+    if 'deleted' in success_status:
+        expected_duration = wait.EXPECTED_DURATION['server_delete']
+    else:
+        expected_duration = wait.EXPECTED_DURATION['server_action']
+    # An admin acting on the servers of other projects only sees them
+    # when listing the servers of all projects
+    auth_ref = app.client_manager.auth_ref
+    project_id = auth_ref.project_id if auth_ref else None
+    all_projects = bool(project_id) and any(
+        getattr(s, 'tenant_id', project_id) != project_id for s in servers)
+    failed = _wait_for_servers(compute_client, [s.id for s in servers],
+                               success_status=success_status,
+                               callback=_show_progress,
+                               expected_duration=expected_duration,
+                               all_projects=all_projects)
+    app.stdout.write('\n')
+    for server_id in failed:
+        LOG.error(_("Failed to %(verb)s server '%(server)s'"),
+                  {'verb': verb, 'server': server_id})
+    if failed:
+        msg = (_("%(result)s of %(total)s servers failed to %(verb)s.") %
+               {'result': len(failed), 'total': len(servers), 'verb': verb})
+        raise exceptions.CommandError(msg)
+
+
+def _add_server_search_options_to_parser(parser):
+    parser.add_argument(
+        '--reservation-id',
+        metavar='<reservation-id>',
+        help=_('Only return instances that match the reservation'),
+    )
+    parser.add_argument(
+        '--ip',
+        metavar='<ip-address-regex>',
+        help=_('Regular expression to match IP addresses'),
+    )
+    parser.add_argument(
+        '--ip6',
+        metavar='<ip-address-regex>',
+        help=_('Regular expression to match IPv6 addresses. Note '
+               'that this option only applies for non-admin users '
+               'when using ``--os-compute-api-version`` 2.5 or greater.'),
+    )
+    parser.add_argument(
+        '--name',
+        metavar='<name-regex>',
+        help=_('Regular expression to match names'),
+    )
+    parser.add_argument(
+        '--instance-name',
+        metavar='<server-name>',
+        help=_('Regular expression to match instance name (admin only)'),
+    )
+    parser.add_argument(
+        '--status',
+        metavar='<status>',
+        # FIXME(dhellmann): Add choices?
+        help=_('Search by server status'),
+    )
+    parser.add_argument(
+        '--flavor',
+        metavar='<flavor>',
+        help=_('Search by flavor (name or ID)'),
+    )
+    parser.add_argument(
+        '--image',
+        metavar='<image>',
+        help=_('Search by image (name or ID)'),
+    )
+    parser.add_argument(
+        '--host',
+        metavar='<hostname>',
+        help=_('Search by hostname'),
+    )
+    parser.add_argument(
+        '--all-projects',
+        action='store_true',
+        default=bool(int(os.environ.get("ALL_PROJECTS", 0))),
+        help=_('Include all projects (admin only)'),
+    )
+    parser.add_argument(
+        '--project',
+        metavar='<project>',
+        help=_("Search by project (admin only) (name or ID)")
+    )
+    identity_common.add_project_domain_option_to_parser(parser)
+    parser.add_argument(
+        '--user',
+        metavar='<user>',
+        help=_('Search by user (admin only) (name or ID)'),
+    )
+    identity_common.add_user_domain_option_to_parser(parser)
+
+
+def _get_server_search_opts(client_manager, parsed_args):
+    """Build the server search options from the parsed arguments
+
+    Projects, users, flavors and images given by name are looked up.
+
+    :param client_manager: the client manager of the command
+    :param parsed_args: arguments parsed by a parser set up with
+                        ``_add_server_search_options_to_parser``
+    :rtype: a dict of search options for ``servers.list``
+    """
+    compute_client = client_manager.compute
+    identity_client = client_manager.identity
+    image_client = client_manager.image
+
+    project_id = None
+    if parsed_args.project:
+        project_id = identity_common.find_project(
+            identity_client,
+            parsed_args.project,
+            parsed_args.project_domain,
+        ).id
+        parsed_args.all_projects = True
+
+    user_id = None
+    if parsed_args.user:
+        user_id = identity_common.find_user(
+            identity_client,
+            parsed_args.user,
+            parsed_args.user_domain,
+        ).id
+
+    # Nova only supports list servers searching by flavor ID. So if a
+    # flavor name is given, map it to ID.
+    flavor_id = None
+    if parsed_args.flavor:
+        flavor_id = utils.find_resource(compute_client.flavors,
+                                        parsed_args.flavor).id
+
+    # Nova only supports list servers searching by image ID. So if a
+    # image name is given, map it to ID.
+    image_id = None
+    if parsed_args.image:
+        image_id = utils.find_resource(image_client.images,
+                                       parsed_args.image).id
+
+    return {
+        'reservation_id': parsed_args.reservation_id,
+        'ip': parsed_args.ip,
+        'ip6': parsed_args.ip6,
+        'name': parsed_args.name,
+        'instance_name': parsed_args.instance_name,
+        'status': parsed_args.status,
+        'flavor': flavor_id,
+        'image': image_id,
+        'host': parsed_args.host,
+        'tenant_id': project_id,
+        'all_tenants': parsed_args.all_projects,
+        'user_id': user_id,
+    }
+
+
+def _prep_server_detail(compute_client, image_client, server, refresh=True,
+                        name_cache=None):
     """Prepare the detailed server dict for printing
 
     :param compute_client: a compute client instance
@@ -131,6 +438,8 @@ def _prep_server_detail(compute_client, image_client, server, refresh=True):
     :param refresh: Flag indicating if ``server`` is already the latest version
                     or if it needs to be refreshed, for example when showing
                     the latest details of a server after creating it.
+    :param name_cache: a NameCache consulted for image and flavor names
+                       before looking them up
     :rtype: a dict of server details
     """
     info = server.to_dict()
@@ -138,27 +447,54 @@ def _prep_server_detail(compute_client, image_client, server, refresh=True):
         server = utils.find_resource(compute_client.servers, info['id'])
         info.update(server.to_dict())
 
-    # Convert the image blob to a name
     image_info = info.get('image', {})
-    if image_info:
-        image_id = image_info.get('id', '')
-        try:
-            image = utils.find_resource(image_client.images, image_id)
-            info['image'] = "%s (%s)" % (image.name, image_id)
-        except Exception:
-            info['image'] = image_id
-
-    # Convert the flavor blob to a name
+    image_id = image_info.get('id', '') if image_info else None
     flavor_info = info.get('flavor', {})
     # Microversion 2.47 puts the embedded flavor into the server response
     # body but omits the id, so if not present we just expose the flavor
     # dict in the server output.
-    if 'id' in flavor_info:
-        flavor_id = flavor_info.get('id', '')
-        try:
-            flavor = utils.find_resource(compute_client.flavors, flavor_id)
-            info['flavor'] = "%s (%s)" % (flavor.name, flavor_id)
-        except Exception:
+    flavor_id = flavor_info.get('id', '') if 'id' in flavor_info else None
+
+    # The image and flavor names are independent, so those that are not
+    # cached are looked up concurrently
+    names = {}
+    lookups = []
+    for kind, manager, resource_id in (
+            ('image', image_client.images, image_id),
+            ('flavor', compute_client.flavors, flavor_id)):
+        if resource_id is None:
+            continue
+        name = name_cache.get(kind, resource_id) if name_cache else None
+        if name is None:
+            lookups.append((kind, manager, resource_id))
+        else:
+            names[kind] = name
+
+    def _get_name(lookup):
+        return utils.find_resource(lookup[1], lookup[2]).name
+
+    results = parallel.run(_get_name, lookups, return_exceptions=True)
+    for (kind, _manager, resource_id), name in zip(lookups, results):
+        if isinstance(name, Exception):
+            continue
+        names[kind] = name
+        if name_cache:
+            name_cache.set(kind, resource_id, name)
+    if name_cache and lookups:
+        name_cache.save()
+
+    # Convert the image blob to a name
+    if image_id is not None:
+        if 'image' in names:
+            info['image'] = "%s (%s)" % (names['image'], image_id)
+        else:
+            info['image'] = image_id
+
+    # Convert the flavor blob to a name
+    if flavor_id is not None:
+        if 'flavor' in names:
+            info['flavor'] = "%s (%s)" % (names['flavor'], flavor_id)
+        else:
             info['flavor'] = flavor_id
     else:
         info['flavor'] = utils.format_dict(flavor_info)
@@ -1055,10 +1391,18 @@ class CreateServer(command.ShowOne):
             if hasattr(userdata, 'close'):
                 userdata.close()
 
+        # The last server retrieved while waiting is already up to date
+        latest = {}
+
+        def _get_server(server_id):
+            latest['server'] = compute_client.servers.get(server_id)
+            return latest['server']
+
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
+            if wait.wait_for_status(
+                _get_server,
                 server.id,
+                expected_duration=wait.EXPECTED_DURATION['server_build'],
                 callback=_show_progress,
             ):
                 self.app.stdout.write('\n')
@@ -1068,10 +1412,323 @@ class CreateServer(command.ShowOne):
                 self.app.stdout.write(_('Error creating server\n'))
                 raise SystemExit
 
-        details = _prep_server_detail(compute_client, image_client, server)
+        # The image and flavor were looked up above, so their names are
+        # already known
+        name_cache = cache.NameCache.from_client_manager(
+            self.app.client_manager) or cache.NameCache(None)
+        if getattr(image, 'id', None) and getattr(image, 'name', None):
+            name_cache.set('image', image.id, image.name)
+        name_cache.set('flavor', flavor.id, flavor.name)
+
+        details = _prep_server_detail(
+            compute_client, image_client, latest.get('server', server),
+            refresh='server' not in latest, name_cache=name_cache)
         return zip(*sorted(details.items()))
 
 
+class CreateServerBatch(command.Lister):
+    """Create servers described in a file
+
+    The file is a YAML or JSON document with a ``servers`` list. Each
+    entry describes one server, or ``count`` servers named
+    ``<name>-1`` to ``<name>-<count>``, with these keys: ``name``,
+    ``count``, ``image``, ``flavor``, ``volume``, ``boot_from_volume``,
+    ``network``, ``port``, ``security_group``, ``key_name``,
+    ``availability_zone``, ``property``, ``user_data``, ``config_drive``,
+    ``hint`` and ``description``. ``network``, ``port`` and
+    ``security_group`` take a name or ID, or a list of them. Keys given in
+    an optional ``defaults`` mapping apply to every server that does not
+    set them itself.
+
+    Images, flavors, volumes, networks and security groups are looked up
+    once however many servers use them, and all of them are looked up
+    before any server is created.
+    """
+
+    SERVER_KEYS = (
+        'availability_zone', 'boot_from_volume', 'config_drive', 'count',
+        'description', 'flavor', 'hint', 'image', 'key_name', 'name',
+        'network', 'port', 'property', 'security_group', 'user_data',
+        'volume',
+    )
+
+    def get_parser(self, prog_name):
+        parser = super(CreateServerBatch, self).get_parser(prog_name)
+        parser.add_argument(
+            'file',
+            metavar='<file>',
+            help=_('YAML or JSON file describing the servers to create'),
+        )
+        parser.add_argument(
+            '--concurrency',
+            metavar='<num-servers>',
+            type=int,
+            default=parallel.DEFAULT_WORKERS,
+            help=_('Maximum number of create requests in flight at any '
+                   'time (default: %d)') % parallel.DEFAULT_WORKERS,
+        )
+        parser.add_argument(
+            '--rate',
+            metavar='<requests-per-second>',
+            type=float,
+            default=None,
+            help=_('Maximum number of create requests sent per second '
+                   '(default: no limit)'),
+        )
+        parser.add_argument(
+            '--wait',
+            action='store_true',
+            help=_('Wait for all the servers to be active'),
+        )
+        return parser
+
+    def _load(self, path):
+        try:
+            with io.open(path) as f:
+                manifest = yaml.safe_load(f)
+        except IOError as e:
+            msg = _("Can't open '%(source)s': %(exception)s")
+            raise exceptions.CommandError(
+                msg % {"source": path, "exception": e})
+        except yaml.YAMLError as e:
+            msg = _("Can't parse '%(source)s': %(exception)s")
+            raise exceptions.CommandError(
+                msg % {"source": path, "exception": e})
+
+        if (not isinstance(manifest, dict) or
+                not isinstance(manifest.get('servers'), list)):
+            msg = _("'%s' must contain a list of servers") % path
+            raise exceptions.CommandError(msg)
+
+        defaults = manifest.get('defaults') or {}
+        specs = []
+        for entry in [defaults] + manifest['servers']:
+            if not isinstance(entry, dict):
+                msg = _("Invalid server description: %s") % entry
+                raise exceptions.CommandError(msg)
+            unknown = sorted(set(entry) - set(self.SERVER_KEYS))
+            if unknown:
+                msg = _("Unknown server attributes: %s") % ', '.join(unknown)
+                raise exceptions.CommandError(msg)
+
+        for entry in manifest['servers']:
+            spec = dict(defaults)
+            spec.update(entry)
+            if not spec.get('name') or not spec.get('flavor'):
+                msg = _("Every server needs a name and a flavor: %s") % entry
+                raise exceptions.CommandError(msg)
+            if not (spec.get('image') or spec.get('volume')):
+                msg = _("Every server needs an image or a volume: %s") % entry
+                raise exceptions.CommandError(msg)
+            count = spec.pop('count', 1)
+            if (not isinstance(count, six.integer_types) or
+                    isinstance(count, bool) or count < 1):
+                msg = _("The count of server '%(name)s' must be a positive "
+                        "integer: %(count)s") % {'name': spec['name'],
+                                                 'count': count}
+                raise exceptions.CommandError(msg)
+            for key in ('network', 'port', 'security_group'):
+                # A single value may be given rather than a list
+                if isinstance(spec.get(key), six.string_types):
+                    spec[key] = [spec[key]]
+                elif not isinstance(spec.get(key) or [], list):
+                    msg = _("The %(key)s of server '%(name)s' must be a "
+                            "name or ID, or a list of them") % {
+                                'key': key, 'name': spec['name']}
+                    raise exceptions.CommandError(msg)
+            if count == 1:
+                specs.append(spec)
+                continue
+            for index in range(1, count + 1):
+                server_spec = dict(spec)
+                server_spec['name'] = '%s-%d' % (spec['name'], index)
+                specs.append(server_spec)
+        return specs
+
+    def _boot_args(self, spec, find):
+        """Build the arguments of servers.create() for one server"""
+
+        compute_client = self.app.client_manager.compute
+        image = find('image', spec.get('image'))
+        flavor = find('flavor', spec['flavor'])
+
+        block_device_mapping_v2 = []
+        if spec.get('volume'):
+            block_device_mapping_v2 = [{
+                'uuid': find('volume', spec['volume']),
+                'boot_index': '0',
+                'source_type': 'volume',
+                'destination_type': 'volume',
+            }]
+            image = None
+        elif spec.get('boot_from_volume'):
+            block_device_mapping_v2 = [{
+                'uuid': image.id,
+                'boot_index': '0',
+                'source_type': 'image',
+                'destination_type': 'volume',
+                'volume_size': spec['boot_from_volume'],
+            }]
+            image = None
+
+        nics = [{'net-id': find('network', n), 'v4-fixed-ip': '',
+                 'v6-fixed-ip': '', 'port-id': ''}
+                for n in spec.get('network') or []]
+        nics += [{'net-id': '', 'v4-fixed-ip': '', 'v6-fixed-ip': '',
+                  'port-id': find('port', p)}
+                 for p in spec.get('port') or []]
+        if not nics:
+            if compute_client.api_version >= api_versions.APIVersion('2.37'):
+                nics = 'auto'
+
+        config_drive = spec.get('config_drive')
+        if str(config_drive).lower() in ("true", "1"):
+            config_drive = True
+        elif str(config_drive).lower() in ("false", "0", "", "none"):
+            config_drive = None
+
+        kwargs = dict(
+            meta=spec.get('property'),
+            reservation_id=None,
+            min_count=1,
+            max_count=1,
+            security_groups=[find('security_group', sg)
+                             for sg in spec.get('security_group') or []],
+            userdata=find('user_data', spec.get('user_data')),
+            key_name=spec.get('key_name'),
+            availability_zone=spec.get('availability_zone'),
+            block_device_mapping_v2=block_device_mapping_v2,
+            nics=nics,
+            scheduler_hints=spec.get('hint') or {},
+            config_drive=config_drive,
+        )
+        if spec.get('description'):
+            if compute_client.api_version < api_versions.APIVersion("2.19"):
+                msg = _("Description is not supported for "
+                        "--os-compute-api-version less than 2.19")
+                raise exceptions.CommandError(msg)
+            kwargs['description'] = spec['description']
+        return [spec['name'], image, flavor], kwargs
+
+    def take_action(self, parsed_args):
+        compute_client = self.app.client_manager.compute
+        image_client = self.app.client_manager.image
+        volume_client = self.app.client_manager.volume
+
+        if parsed_args.concurrency < 1:
+            msg = _('--concurrency must be a positive number')
+            raise exceptions.CommandError(msg)
+
+        specs = self._load(parsed_args.file)
+
+        network_client = None
+        if self.app.client_manager.is_network_endpoint_enabled():
+            network_client = self.app.client_manager.network
+
+        def find_network(network):
+            if network_client:
+                return network_client.find_network(
+                    network, ignore_missing=False).id
+            return compute_client.api.network_find(network)['id']
+
+        def find_port(port):
+            if network_client:
+                return network_client.find_port(port, ignore_missing=False).id
+            msg = _("can't create server with port specified "
+                    "since network endpoint not enabled")
+            raise exceptions.CommandError(msg)
+
+        def find_security_group(security_group):
+            if network_client:
+                # Use security group ID to avoid multiple security group have
+                # same name in neutron networking backend
+                return network_client.find_security_group(
+                    security_group, ignore_missing=False).id
+            return compute_client.api.security_group_find(
+                security_group)['name']
+
+        def read_user_data(path):
+            try:
+                with io.open(path) as f:
+                    return f.read()
+            except IOError as e:
+                msg = _("Can't open '%(data)s': %(exception)s")
+                raise exceptions.CommandError(
+                    msg % {"data": path, "exception": e})
+
+        finders = {
+            'flavor': lambda f: utils.find_resource(compute_client.flavors,
+                                                    f),
+            'image': lambda i: utils.find_resource(image_client.images, i),
+            'network': find_network,
+            'port': find_port,
+            'security_group': find_security_group,
+            'user_data': read_user_data,
+            'volume': lambda v: utils.find_resource(volume_client.volumes,
+                                                    v).id,
+        }
+        found = {}
+
+        def find(kind, name):
+            if name is None:
+                return None
+            if (kind, name) not in found:
+                found[kind, name] = finders[kind](name)
+            return found[kind, name]
+
+        # Resolve every reference before creating anything
+        boot_args = [self._boot_args(spec, find) for spec in specs]
+
+        limiter = parallel.RateLimiter(parsed_args.rate)
+
+        def _create(args):
+            limiter.wait()
+            LOG.debug('boot_args: %s', args[0])
+            LOG.debug('boot_kwargs: %s', args[1])
+            return compute_client.servers.create(*args[0], **args[1])
+
+        results = parallel.run(_create, boot_args,
+                               workers=parsed_args.concurrency,
+                               return_exceptions=True)
+
+        rows = []
+        for spec, result in zip(specs, results):
+            if isinstance(result, Exception):
+                LOG.error(_("Failed to create server '%(server)s': %(e)s"),
+                          {'server': spec['name'], 'e': result})
+                rows.append([spec['name'], '', 'ERROR'])
+            else:
+                rows.append([spec['name'], result.id, 'BUILD'])
+
+        created = [row[1] for row in rows if row[1]]
+        if not created:
+            msg = _("Failed to create any of the %d servers") % len(specs)
+            raise exceptions.CommandError(msg)
+
+        if parsed_args.wait:
+            def _show_progress(progress):
+                self.app.stderr.write('\rProgress: %s' % progress)
+                self.app.stderr.flush()
+
+            failed = _wait_for_servers(
+                compute_client, created, callback=_show_progress,
+                expected_duration=wait.EXPECTED_DURATION['server_build'])
+            self.app.stderr.write('\n')
+            for row in rows:
+                if row[1]:
+                    row[2] = 'ERROR' if row[1] in failed else 'ACTIVE'
+
+        columns = ('Name', 'ID', 'Status')
+        failed = len([row for row in rows if row[2] == 'ERROR'])
+        if failed:
+            # Display the servers that were created before failing
+            self.produce_output(parsed_args, columns, rows)
+            msg = (_("%(failed)s of %(total)s servers failed to create.") %
+                   {'failed': failed, 'total': len(rows)})
+            raise exceptions.CommandError(msg)
+        return (columns, rows)
+
+
 class CreateServerDump(command.Command):
     """Create a dump file in server(s)
 
@@ -1091,15 +1748,15 @@ class CreateServerDump(command.Command):
             nargs='+',
             help=_('Server(s) to create dump file (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).trigger_crash_dump()
+        _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.trigger_crash_dump(), 'dump',
+            workers=parsed_args.parallel)
 
 
 class DeleteServer(command.Command):
@@ -1118,6 +1775,7 @@ class DeleteServer(command.Command):
             action='store_true',
             help=_('Wait for delete to complete'),
         )
+        _add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -1128,18 +1786,25 @@ class DeleteServer(command.Command):
                 self.app.stdout.flush()
 
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            server_obj = utils.find_resource(
-                compute_client.servers, server)
-            compute_client.servers.delete(server_obj.id)
-            if parsed_args.wait:
-                if not utils.wait_for_delete(compute_client.servers,
-                                             server_obj.id,
-                                             callback=_show_progress):
-                    LOG.error(_('Error deleting server: %s'),
-                              server_obj.id)
-                    self.app.stdout.write(_('Error deleting server\n'))
-                    raise SystemExit
+        deleted = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: compute_client.servers.delete(server.id),
+            'delete', workers=parsed_args.parallel)
+        if not parsed_args.wait:
+            return
+
+        if len(deleted) > 1:
+            # Watch all the servers with one request per poll
+            _wait_for_server_action(self.app, compute_client, deleted,
+                                    ('deleted',), 'delete')
+        elif not wait.wait_for_delete(
+                compute_client.servers,
+                deleted[0].id,
+                callback=_show_progress,
+                expected_duration=wait.EXPECTED_DURATION['server_delete']):
+            LOG.error(_('Error deleting server: %s'), deleted[0].id)
+            self.app.stdout.write(_('Error deleting server\n'))
+            raise SystemExit
 
 
 class ListServer(command.Lister):
@@ -1147,72 +1812,7 @@ class ListServer(command.Lister):
 
     def get_parser(self, prog_name):
         parser = super(ListServer, self).get_parser(prog_name)
-        parser.add_argument(
-            '--reservation-id',
-            metavar='<reservation-id>',
-            help=_('Only return instances that match the reservation'),
-        )
-        parser.add_argument(
-            '--ip',
-            metavar='<ip-address-regex>',
-            help=_('Regular expression to match IP addresses'),
-        )
-        parser.add_argument(
-            '--ip6',
-            metavar='<ip-address-regex>',
-            help=_('Regular expression to match IPv6 addresses. Note '
-                   'that this option only applies for non-admin users '
-                   'when using ``--os-compute-api-version`` 2.5 or greater.'),
-        )
-        parser.add_argument(
-            '--name',
-            metavar='<name-regex>',
-            help=_('Regular expression to match names'),
-        )
-        parser.add_argument(
-            '--instance-name',
-            metavar='<server-name>',
-            help=_('Regular expression to match instance name (admin only)'),
-        )
-        parser.add_argument(
-            '--status',
-            metavar='<status>',
-            # FIXME(dhellmann): Add choices?
-            help=_('Search by server status'),
-        )
-        parser.add_argument(
-            '--flavor',
-            metavar='<flavor>',
-            help=_('Search by flavor (name or ID)'),
-        )
-        parser.add_argument(
-            '--image',
-            metavar='<image>',
-            help=_('Search by image (name or ID)'),
-        )
-        parser.add_argument(
-            '--host',
-            metavar='<hostname>',
-            help=_('Search by hostname'),
-        )
-        parser.add_argument(
-            '--all-projects',
-            action='store_true',
-            default=bool(int(os.environ.get("ALL_PROJECTS", 0))),
-            help=_('Include all projects (admin only)'),
-        )
-        parser.add_argument(
-            '--project',
-            metavar='<project>',
-            help=_("Search by project (admin only) (name or ID)")
-        )
-        identity_common.add_project_domain_option_to_parser(parser)
-        parser.add_argument(
-            '--user',
-            metavar='<user>',
-            help=_('Search by user (admin only) (name or ID)'),
-        )
-        identity_common.add_user_domain_option_to_parser(parser)
+        _add_server_search_options_to_parser(parser)
         parser.add_argument(
             '--long',
             action='store_true',
@@ -1255,6 +1855,16 @@ class ListServer(command.Lister):
                    "'osapi_max_limit' option of Nova API, "
                    "'osapi_max_limit' will be used instead."),
         )
+        parser.add_argument(
+            '--page-size',
+            metavar='<num-servers>',
+            type=int,
+            default=None,
+            help=_("Retrieve servers in pages of this size and display each "
+                   "page as soon as it is retrieved, following the pages "
+                   "until all servers (or ``--limit`` servers) have been "
+                   "listed."),
+        )
         parser.add_argument(
             '--deleted',
             action="store_true",
@@ -1297,57 +1907,15 @@ class ListServer(command.Lister):
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        identity_client = self.app.client_manager.identity
         image_client = self.app.client_manager.image
 
-        project_id = None
-        if parsed_args.project:
-            project_id = identity_common.find_project(
-                identity_client,
-                parsed_args.project,
-                parsed_args.project_domain,
-            ).id
-            parsed_args.all_projects = True
-
-        user_id = None
-        if parsed_args.user:
-            user_id = identity_common.find_user(
-                identity_client,
-                parsed_args.user,
-                parsed_args.user_domain,
-            ).id
-
-        # Nova only supports list servers searching by flavor ID. So if a
-        # flavor name is given, map it to ID.
-        flavor_id = None
-        if parsed_args.flavor:
-            flavor_id = utils.find_resource(compute_client.flavors,
-                                            parsed_args.flavor).id
-
-        # Nova only supports list servers searching by image ID. So if a
-        # image name is given, map it to ID.
-        image_id = None
-        if parsed_args.image:
-            image_id = utils.find_resource(image_client.images,
-                                           parsed_args.image).id
-
-        search_opts = {
-            'reservation_id': parsed_args.reservation_id,
-            'ip': parsed_args.ip,
-            'ip6': parsed_args.ip6,
-            'name': parsed_args.name,
-            'instance_name': parsed_args.instance_name,
-            'status': parsed_args.status,
-            'flavor': flavor_id,
-            'image': image_id,
-            'host': parsed_args.host,
-            'tenant_id': project_id,
-            'all_tenants': parsed_args.all_projects,
-            'user_id': user_id,
+        search_opts = _get_server_search_opts(self.app.client_manager,
+                                              parsed_args)
+        search_opts.update({
             'deleted': parsed_args.deleted,
             'changes-before': parsed_args.changes_before,
             'changes-since': parsed_args.changes_since,
-        }
+        })
         support_locked = (compute_client.api_version >=
                           api_versions.APIVersion('2.73'))
         if not support_locked and (parsed_args.locked or parsed_args.unlocked):
@@ -1463,83 +2031,118 @@ class ListServer(command.Lister):
                 marker_id = utils.find_resource(compute_client.servers,
                                                 parsed_args.marker).id
 
-        data = compute_client.servers.list(search_opts=search_opts,
-                                           marker=marker_id,
-                                           limit=parsed_args.limit)
-
+        page_size = parsed_args.page_size
+        if page_size is not None and page_size < 1:
+            msg = _('--page-size must be a positive number')
+            raise exceptions.CommandError(msg)
+        limit = parsed_args.limit
+        if limit is not None and limit < 0:
+            limit = None
+
+        def _list(marker, listed=0):
+            if page_size is None:
+                return compute_client.servers.list(search_opts=search_opts,
+                                                   marker=marker,
+                                                   limit=parsed_args.limit)
+            size = page_size
+            if limit is not None:
+                size = min(size, limit - listed)
+                if size <= 0:
+                    return []
+            return compute_client.servers.list(search_opts=search_opts,
+                                               marker=marker,
+                                               limit=size)
+
+        name_cache = None
+        if not parsed_args.no_name_lookup:
+            # Names found on one page are remembered for the next ones
+            name_cache = cache.NameCache.from_client_manager(
+                self.app.client_manager) or cache.NameCache(None)
+        one_by_one = parsed_args.name_lookup_one_by_one
         images = {}
         flavors = {}
-        if data and not parsed_args.no_name_lookup:
-            # Create a dict that maps image_id to image object.
-            # Needed so that we can display the "Image Name" column.
-            # "Image Name" is not crucial, so we swallow any exceptions.
-            # The 'image' attribute can be an empty string if the server was
-            # booted from a volume.
-            if parsed_args.name_lookup_one_by_one or image_id:
-                for i_id in set(filter(lambda x: x is not None,
-                                       (s.image.get('id') for s in data
-                                        if s.image))):
-                    try:
-                        images[i_id] = image_client.images.get(i_id)
-                    except Exception:
-                        pass
-            else:
-                try:
-                    images_list = image_client.images.list()
-                    for i in images_list:
-                        images[i.id] = i
-                except Exception:
-                    pass
-
-            # Create a dict that maps flavor_id to flavor object.
-            # Needed so that we can display the "Flavor Name" column.
-            # "Flavor Name" is not crucial, so we swallow any exceptions.
-            if parsed_args.name_lookup_one_by_one or flavor_id:
-                for f_id in set(filter(lambda x: x is not None,
-                                       (s.flavor.get('id') for s in data))):
-                    try:
-                        flavors[f_id] = compute_client.flavors.get(f_id)
-                    except Exception:
-                        pass
-            else:
-                try:
-                    flavors_list = compute_client.flavors.list(is_public=None)
-                    for i in flavors_list:
-                        flavors[i.id] = i
-                except Exception:
-                    pass
-
-        # Populate image_name, image_id, flavor_name and flavor_id attributes
-        # of server objects so that we can display those columns.
-        for s in data:
-            if compute_client.api_version >= api_versions.APIVersion('2.69'):
-                # NOTE(tssurya): From 2.69, we will have the keys 'flavor'
-                # and 'image' missing in the server response during
-                # infrastructure failure situations.
-                # For those servers with partial constructs we just skip the
-                # processing of the image and flavor informations.
-                if not hasattr(s, 'image') or not hasattr(s, 'flavor'):
-                    continue
-            if 'id' in s.image:
-                image = images.get(s.image['id'])
-                if image:
-                    s.image_name = image.name
-                s.image_id = s.image['id']
-            else:
-                s.image_name = ''
-                s.image_id = ''
-            if 'id' in s.flavor:
-                flavor = flavors.get(s.flavor['id'])
-                if flavor:
-                    s.flavor_name = flavor.name
-                s.flavor_id = s.flavor['id']
-            else:
-                # TODO(mriedem): Fix this for microversion >= 2.47 where the
-                # flavor is embedded in the server response without the id.
-                # We likely need to drop the Flavor ID column in that case if
-                # --long is specified.
-                s.flavor_name = ''
-                s.flavor_id = ''
+
+        def _prep_servers(data):
+            if data and name_cache:
+                # Create a dict that maps image_id to image name.
+                # Needed so that we can display the "Image Name" column.
+                # "Image Name" is not crucial, so we swallow any exceptions.
+                # The 'image' attribute can be an empty string if the server
+                # was booted from a volume.
+                images.update(cache.get_names(
+                    name_cache, 'image',
+                    (s.image.get('id') for s in data
+                     if getattr(s, 'image', None) and
+                     s.image.get('id') not in images),
+                    image_client.images.get,
+                    None if one_by_one or search_opts['image']
+                    else image_client.images.list,
+                ))
+
+                # Create a dict that maps flavor_id to flavor name.
+                # Needed so that we can display the "Flavor Name" column.
+                # "Flavor Name" is not crucial, so we swallow any exceptions.
+                flavors.update(cache.get_names(
+                    name_cache, 'flavor',
+                    (s.flavor.get('id') for s in data
+                     if getattr(s, 'flavor', None) and
+                     s.flavor.get('id') not in flavors),
+                    compute_client.flavors.get,
+                    None if one_by_one or search_opts['flavor']
+                    else functools.partial(
+                        compute_client.flavors.list, is_public=None),
+                ))
+
+            # Populate image_name, image_id, flavor_name and flavor_id
+            # attributes of server objects so that we can display those
+            # columns.
+            for s in data:
+                if (compute_client.api_version >=
+                        api_versions.APIVersion('2.69')):
+                    # NOTE(tssurya): From 2.69, we will have the keys 'flavor'
+                    # and 'image' missing in the server response during
+                    # infrastructure failure situations.
+                    # For those servers with partial constructs we just skip
+                    # the processing of the image and flavor informations.
+                    if not hasattr(s, 'image') or not hasattr(s, 'flavor'):
+                        continue
+                if 'id' in s.image:
+                    image_name = images.get(s.image['id'])
+                    if image_name:
+                        s.image_name = image_name
+                    s.image_id = s.image['id']
+                else:
+                    s.image_name = ''
+                    s.image_id = ''
+                if 'id' in s.flavor:
+                    flavor_name = flavors.get(s.flavor['id'])
+                    if flavor_name:
+                        s.flavor_name = flavor_name
+                    s.flavor_id = s.flavor['id']
+                else:
+                    # TODO(mriedem): Fix this for microversion >= 2.47 where
+                    # the flavor is embedded in the server response without
+                    # the id. We likely need to drop the Flavor ID column in
+                    # that case if --long is specified.
+                    s.flavor_name = ''
+                    s.flavor_id = ''
+            return data
+
+        # The first page is retrieved right away so that errors are
+        # reported before any output; with --page-size the following pages
+        # are retrieved and displayed one at a time.
+        first_page = _prep_servers(_list(marker_id))
+
+        def _servers():
+            data = first_page
+            listed = 0
+            while data:
+                for s in data:
+                    yield s
+                if page_size is None:
+                    return
+                listed += len(data)
+                data = _prep_servers(_list(data[-1].id, listed))
 
         table = (column_headers,
                  (utils.get_item_properties(
@@ -1551,7 +2154,7 @@ class ListServer(command.Lister):
                          'Networks': _format_servers_list_networks,
                          'Metadata': utils.format_dict,
                      },
-                 ) for s in data))
+                 ) for s in _servers()))
         return table
 
 
@@ -1575,6 +2178,7 @@ class LockServer(command.Command):
             help=_("Reason for locking the server(s). Requires "
                    "``--os-compute-api-version`` 2.73 or greater.")
         )
+        _add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -1586,10 +2190,13 @@ class LockServer(command.Command):
             msg = _('--os-compute-api-version 2.73 or greater is required to '
                     'use the --reason option.')
             raise exceptions.CommandError(msg)
-        for server in parsed_args.server:
-            serv = utils.find_resource(compute_client.servers, server)
-            (serv.lock(reason=parsed_args.reason) if support_reason
-                else serv.lock())
+
+        def _lock(server):
+            (server.lock(reason=parsed_args.reason) if support_reason
+                else server.lock())
+
+        _act_on_servers(compute_client, parsed_args.server, _lock, 'lock',
+                        workers=parsed_args.parallel)
 
 
 # FIXME(dtroyer): Here is what I want, how with argparse/cliff?
@@ -1760,10 +2367,11 @@ revert to release the new server and restart the old one.""")
             server.migrate(**kwargs)
 
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if wait.wait_for_status(
                 compute_client.servers.get,
                 server.id,
                 success_status=['active', 'verify_resize'],
+                expected_duration=wait.EXPECTED_DURATION['server_migrate'],
                 callback=_show_progress,
             ):
                 self.app.stdout.write(_('Complete\n'))
@@ -1785,15 +2393,19 @@ class PauseServer(command.Command):
             nargs='+',
             help=_('Server(s) to pause (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server
-            ).pause()
+        servers = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.pause(), 'pause',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('paused',), 'pause')
 
 
 class RebootServer(command.Command):
@@ -1843,9 +2455,10 @@ class RebootServer(command.Command):
         server.reboot(parsed_args.reboot_type)
 
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if wait.wait_for_status(
                 compute_client.servers.get,
                 server.id,
+                expected_duration=wait.EXPECTED_DURATION['server_action'],
                 callback=_show_progress,
             ):
                 self.app.stdout.write(_('Complete\n'))
@@ -1953,9 +2566,10 @@ class RebuildServer(command.ShowOne):
 
         server = server.rebuild(image, parsed_args.password, **kwargs)
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if wait.wait_for_status(
                 compute_client.servers.get,
                 server.id,
+                expected_duration=wait.EXPECTED_DURATION['server_build'],
                 callback=_show_progress,
             ):
                 self.app.stdout.write(_('Complete\n'))
@@ -1965,8 +2579,14 @@ class RebuildServer(command.ShowOne):
                 self.app.stdout.write(_('Error rebuilding server\n'))
                 raise SystemExit
 
-        details = _prep_server_detail(compute_client, image_client, server,
-                                      refresh=False)
+        # The image was looked up above, so its name is already known
+        name_cache = cache.NameCache.from_client_manager(
+            self.app.client_manager) or cache.NameCache(None)
+        name_cache.set('image', image.id, image.name)
+
+        details = _prep_server_detail(
+            compute_client, image_client, server, refresh=False,
+            name_cache=name_cache)
         return zip(*sorted(details.items()))
 
 
@@ -2269,10 +2889,11 @@ release the new server and restart the old one.""")
             )
             compute_client.servers.resize(server, flavor)
             if parsed_args.wait:
-                if utils.wait_for_status(
+                if wait.wait_for_status(
                     compute_client.servers.get,
                     server.id,
                     success_status=['active', 'verify_resize'],
+                    expected_duration=wait.EXPECTED_DURATION['server_resize'],
                     callback=_show_progress,
                 ):
                     self.app.stdout.write(_('Complete\n'))
@@ -2366,15 +2987,15 @@ class RestoreServer(command.Command):
             nargs='+',
             help=_('Server(s) to restore (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server
-            ).restore()
+        _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.restore(), 'restore',
+            workers=parsed_args.parallel)
 
 
 class ResumeServer(command.Command):
@@ -2388,16 +3009,20 @@ class ResumeServer(command.Command):
             nargs='+',
             help=_('Server(s) to resume (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
 
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).resume()
+        servers = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.resume(), 'resume',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('active',), 'resume')
 
 
 class SetServer(command.Command):
@@ -2489,15 +3114,19 @@ class ShelveServer(command.Command):
             nargs='+',
             help=_('Server(s) to shelve (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).shelve()
+        servers = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.shelve(), 'shelve',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('shelved', 'shelved_offloaded'), 'shelve')
 
 
 class ShowServer(command.ShowOne):
@@ -2505,12 +3134,18 @@ class ShowServer(command.ShowOne):
         "Show server details. Specify ``--os-compute-api-version 2.47`` "
         "or higher to see the embedded flavor information for the server.")
 
+    SINGLE_RECORD_FORMATTERS = ('json', 'shell', 'yaml')
+
     def get_parser(self, prog_name):
         parser = super(ShowServer, self).get_parser(prog_name)
         parser.add_argument(
             'server',
             metavar='<server>',
-            help=_('Server (name or ID)'),
+            nargs='+',
+            help=_('Server(s) to display (name or ID). The servers are '
+                   'retrieved concurrently and displayed one after the '
+                   'other, in the given order. Several servers cannot be '
+                   'displayed in the json, shell or yaml formats.'),
         )
         parser.add_argument(
             '--diagnostics',
@@ -2520,11 +3155,7 @@ class ShowServer(command.ShowOne):
         )
         return parser
 
-    def take_action(self, parsed_args):
-        compute_client = self.app.client_manager.compute
-        server = utils.find_resource(compute_client.servers,
-                                     parsed_args.server)
-
+    def _show_server(self, parsed_args, server, name_cache):
         if parsed_args.diagnostics:
             (resp, data) = server.diagnostics()
             if not resp.status_code == 200:
@@ -2533,12 +3164,95 @@ class ShowServer(command.ShowOne):
                 ))
                 return ({}, {})
         else:
-            data = _prep_server_detail(compute_client,
-                                       self.app.client_manager.image, server,
-                                       refresh=False)
+            data = _prep_server_detail(
+                self.app.client_manager.compute,
+                self.app.client_manager.image, server,
+                refresh=False, name_cache=name_cache)
 
         return zip(*sorted(data.items()))
 
+    def take_action(self, parsed_args):
+        compute_client = self.app.client_manager.compute
+        image_client = self.app.client_manager.image
+        name_cache = cache.NameCache.from_client_manager(
+            self.app.client_manager)
+
+        if len(parsed_args.server) == 1:
+            server = utils.find_resource(compute_client.servers,
+                                         parsed_args.server[0])
+            return self._show_server(parsed_args, server, name_cache)
+
+        # Each server is displayed as a separate record, which these
+        # formats cannot hold in a single document
+        if parsed_args.formatter in self.SINGLE_RECORD_FORMATTERS:
+            msg = _("Only one server can be displayed in the %s format, "
+                    "use 'server list' for several servers")
+            raise exceptions.CommandError(msg % parsed_args.formatter)
+
+        def _find(name_or_id):
+            return utils.find_resource(compute_client.servers, name_or_id)
+
+        results = parallel.run(_find, parsed_args.server,
+                               return_exceptions=True)
+        servers = []
+        for name_or_id, result in zip(parsed_args.server, results):
+            if isinstance(result, Exception):
+                LOG.error(_("Failed to show server with name or ID "
+                            "'%(server)s': %(e)s"),
+                          {'server': name_or_id, 'e': result})
+            else:
+                servers.append(result)
+
+        if not parsed_args.diagnostics:
+            # Look up the names of the images and flavors of all the
+            # servers at once, so that each is only looked up once
+            name_cache = name_cache or cache.NameCache(None)
+            cache.get_names(
+                name_cache, 'image',
+                (s.image.get('id') for s in servers
+                 if getattr(s, 'image', None)),
+                image_client.images.get)
+            cache.get_names(
+                name_cache, 'flavor',
+                (s.flavor.get('id') for s in servers
+                 if getattr(s, 'flavor', None)),
+                compute_client.flavors.get)
+
+        # All the servers but the last are displayed here, the last one is
+        # returned to be displayed like a single server
+        failed = len(parsed_args.server) - len(servers)
+        for server in servers if failed else servers[:-1]:
+            self.produce_output(
+                parsed_args,
+                *self._show_server(parsed_args, server, name_cache))
+        if failed:
+            msg = (_("%(result)s of %(total)s servers failed to show.") %
+                   {'result': failed, 'total': len(parsed_args.server)})
+            raise exceptions.CommandError(msg)
+        return self._show_server(parsed_args, servers[-1], name_cache)
+
+
+class _RemoteCommandParser(argparse.ArgumentParser):
+    """Parser taking the remote command from the words after "--"
+
+    Only the words after "--" make the remote command, so that the options
+    given after the server are still parsed as options; any other word left
+    in the command is reported as unrecognized.
+    """
+
+    def parse_known_args(self, args=None, namespace=None):
+        remote_command = []
+        if args is not None and '--' in args:
+            args = list(args)
+            index = args.index('--')
+            remote_command = args[index + 1:]
+            args = args[:index]
+        namespace, extras = super(_RemoteCommandParser,
+                                  self).parse_known_args(args, namespace)
+        extras = namespace.command + extras
+        namespace.command = remote_command
+        return namespace, extras
+
 
 class SshServer(command.Command):
     _description = _("SSH to server")
@@ -2548,8 +3262,26 @@ class SshServer(command.Command):
         parser.add_argument(
             'server',
             metavar='<server>',
+            nargs='?',
             help=_('Server (name or ID)'),
         )
+        parser.add_argument(
+            '--all-matching',
+            metavar='<name-regex>',
+            help=_('Run the command on all the servers whose name matches '
+                   'this regular expression rather than on a single '
+                   'server, and display the exit status and output of '
+                   'each'),
+        )
+        parser.add_argument(
+            '--parallel',
+            metavar='<num-servers>',
+            type=int,
+            default=parallel.DEFAULT_WORKERS,
+            help=_('With --all-matching, run the command on up to '
+                   '<num-servers> servers at the same time (default: %s)')
+            % parallel.DEFAULT_WORKERS,
+        )
         parser.add_argument(
             '--login',
             metavar='<login-name>',
@@ -2642,46 +3374,131 @@ class SshServer(command.Command):
             default=False,
             help=argparse.SUPPRESS,
         )
-        return parser
+        parser.add_argument(
+            'command',
+            metavar='<command>',
+            nargs='*',
+            help=_('Command to run on the server(s), given after "--"'),
+        )
+
+        return _RemoteCommandParser(
+            prog=parser.prog,
+            description=parser.description,
+            epilog=parser.epilog,
+            formatter_class=parser.formatter_class,
+            parents=[parser],
+            add_help=False,
+        )
+
+    def _run_on_servers(self, compute_client, parsed_args, options, login,
+                        ip_address_family, remote_command):
+        if not remote_command:
+            msg = _('A command is required with --all-matching')
+            raise exceptions.CommandError(msg)
+        if parsed_args.parallel < 1:
+            msg = _('--parallel must be a positive number')
+            raise exceptions.CommandError(msg)
+
+        # The addresses of all the servers come from a single listing
+        servers = compute_client.servers.list(
+            search_opts={'name': parsed_args.all_matching}, limit=-1)
+        if not servers:
+            msg = _("No server with a name matching '%s'")
+            raise exceptions.CommandError(msg % parsed_args.all_matching)
+
+        def _run(server):
+            ip_address = _get_ip_address(server.addresses,
+                                         parsed_args.address_type,
+                                         ip_address_family)
+            # Nothing can be typed in answer to a prompt
+            args = (['ssh', '-o', 'BatchMode=yes'] + options +
+                    ['%s@%s' % (login, ip_address)] + remote_command)
+            LOG.debug("ssh command: %s", ' '.join(args))
+            with open(os.devnull) as devnull:
+                process = subprocess.Popen(args, stdin=devnull,
+                                           stdout=subprocess.PIPE,
+                                           stderr=subprocess.STDOUT)
+                output = process.communicate()[0]
+            return process.returncode, output
+
+        results = parallel.run(_run, servers, workers=parsed_args.parallel,
+                               return_exceptions=True)
+        failed = 0
+        for server, result in zip(servers, results):
+            if isinstance(result, Exception):
+                failed += 1
+                LOG.error(_("Failed to run the command on server "
+                            "'%(server)s': %(e)s"),
+                          {'server': server.name, 'e': result})
+                continue
+            returncode, output = result
+            if returncode:
+                failed += 1
+            self.app.stdout.write(
+                _("==> %(server)s (%(id)s): exit status %(status)s <==\n") %
+                {'server': server.name, 'id': server.id,
+                 'status': returncode})
+            output = output.decode('utf-8', 'replace')
+            if output and not output.endswith('\n'):
+                output += '\n'
+            self.app.stdout.write(output)
+        if failed:
+            msg = (_("%(result)s of %(total)s servers failed to run the "
+                     "command.") % {'result': failed, 'total': len(servers)})
+            raise exceptions.CommandError(msg)
 
     def take_action(self, parsed_args):
 
         compute_client = self.app.client_manager.compute
-        server = utils.find_resource(
-            compute_client.servers,
-            parsed_args.server,
-        )
+
+        remote_command = parsed_args.command
+        if parsed_args.all_matching and parsed_args.server:
+            msg = _('A server cannot be given with --all-matching')
+            raise exceptions.CommandError(msg)
+        if not parsed_args.all_matching and not parsed_args.server:
+            msg = _('Either a server or --all-matching is required')
+            raise exceptions.CommandError(msg)
 
         # Build the command
-        cmd = "ssh"
+        options = []
 
         ip_address_family = [4, 6]
         if parsed_args.ipv4:
             ip_address_family = [4]
-            cmd += " -4"
+            options.append('-4')
         if parsed_args.ipv6:
             ip_address_family = [6]
-            cmd += " -6"
+            options.append('-6')
 
         if parsed_args.port:
-            cmd += " -p %d" % parsed_args.port
+            options += ['-p', '%d' % parsed_args.port]
         if parsed_args.identity:
-            cmd += " -i %s" % parsed_args.identity
+            options += ['-i', parsed_args.identity]
         if parsed_args.option:
-            cmd += " -o %s" % parsed_args.option
+            options += ['-o', parsed_args.option]
         if parsed_args.login:
             login = parsed_args.login
         else:
             login = self.app.client_manager.auth_ref.username
         if parsed_args.verbose:
-            cmd += " -v"
+            options.append('-v')
+
+        if parsed_args.all_matching:
+            self._run_on_servers(compute_client, parsed_args, options, login,
+                                 ip_address_family, remote_command)
+            return
 
-        cmd += " %s@%s"
+        server = utils.find_resource(
+            compute_client.servers,
+            parsed_args.server,
+        )
         ip_address = _get_ip_address(server.addresses,
                                      parsed_args.address_type,
                                      ip_address_family)
-        LOG.debug("ssh command: %s", (cmd % (login, ip_address)))
-        os.system(cmd % (login, ip_address))
+        args = (['ssh'] + options + ['%s@%s' % (login, ip_address)] +
+                remote_command)
+        LOG.debug("ssh command: %s", ' '.join(args))
+        subprocess.call(args)
 
 
 class StartServer(command.Command):
@@ -2695,15 +3512,19 @@ class StartServer(command.Command):
             nargs="+",
             help=_('Server(s) to start (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).start()
+        servers = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.start(), 'start',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('active',), 'start')
 
 
 class StopServer(command.Command):
@@ -2717,15 +3538,19 @@ class StopServer(command.Command):
             nargs="+",
             help=_('Server(s) to stop (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).stop()
+        servers = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.stop(), 'stop',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('shutoff',), 'stop')
 
 
 class SuspendServer(command.Command):
@@ -2739,16 +3564,20 @@ class SuspendServer(command.Command):
             nargs='+',
             help=_('Server(s) to suspend (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
 
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).suspend()
+        servers = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.suspend(), 'suspend',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('suspended',), 'suspend')
 
 
 class UnlockServer(command.Command):
@@ -2762,16 +3591,16 @@ class UnlockServer(command.Command):
             nargs='+',
             help=_('Server(s) to unlock (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
 
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).unlock()
+        _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.unlock(), 'unlock',
+            workers=parsed_args.parallel)
 
 
 class UnpauseServer(command.Command):
@@ -2785,16 +3614,20 @@ class UnpauseServer(command.Command):
             nargs='+',
             help=_('Server(s) to unpause (name or ID)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
 
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
-            utils.find_resource(
-                compute_client.servers,
-                server,
-            ).unpause()
+        servers = _act_on_servers(
+            compute_client, parsed_args.server,
+            lambda server: server.unpause(), 'unpause',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('active',), 'unpause')
 
 
 class UnrescueServer(command.Command):
@@ -2887,6 +3720,8 @@ class UnshelveServer(command.Command):
                    'SHELVED_OFFLOADED server (supported by '
                    '--os-compute-api-version 2.77 or above)'),
         )
+        _add_parallel_option_to_parser(parser)
+        _add_wait_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -2898,14 +3733,159 @@ class UnshelveServer(command.Command):
                     "to support the '--availability-zone' option.")
             raise exceptions.CommandError(msg)
 
-        for server in parsed_args.server:
+        def _unshelve(server):
             if support_az:
-                utils.find_resource(
-                    compute_client.servers,
-                    server
-                ).unshelve(availability_zone=parsed_args.availability_zone)
+                server.unshelve(
+                    availability_zone=parsed_args.availability_zone)
             else:
-                utils.find_resource(
-                    compute_client.servers,
-                    server,
-                ).unshelve()
+                server.unshelve()
+
+        servers = _act_on_servers(
+            compute_client, parsed_args.server, _unshelve, 'unshelve',
+            workers=parsed_args.parallel)
+        if parsed_args.wait:
+            _wait_for_server_action(self.app, compute_client, servers,
+                                    ('active',), 'unshelve')
+
+
+class WatchServer(command.Command):
+    _description = _("Watch servers for changes")
+
+    # Format of the table rows, the name comes last as it varies in length
+    ROW = ('%(updated)-20s  %(event)-7s  %(id)-36s  %(status)-17s  '
+           '%(task_state)-16s  %(name)s')
+
+    def get_parser(self, prog_name):
+        parser = super(WatchServer, self).get_parser(prog_name)
+        _add_server_search_options_to_parser(parser)
+        parser.add_argument(
+            '--changes-since',
+            metavar='<changes-since>',
+            default=None,
+            help=_("Also report the servers changed after a certain point "
+                   "of time. The provided time should be an ISO 8061 "
+                   "formatted time (e.g., 2016-03-04T06:27:59Z). By default "
+                   "only the changes made once the command has started are "
+                   "reported."),
+        )
+        parser.add_argument(
+            '--interval',
+            metavar='<seconds>',
+            type=float,
+            default=5,
+            help=_('Seconds between two polls (default: 5)'),
+        )
+        parser.add_argument(
+            '--count',
+            metavar='<count>',
+            type=int,
+            default=None,
+            help=_('Stop after polling this many times '
+                   '(default: watch until interrupted)'),
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            default=False,
+            help=_('Output each change as a line of JSON instead of a '
+                   'table row'),
+        )
+        return parser
+
+    def _write_change(self, parsed_args, event, server):
+        change = {
+            'updated': getattr(server, 'updated', ''),
+            'event': event,
+            'id': server.id,
+            'name': getattr(server, 'name', ''),
+            'status': getattr(server, 'status', ''),
+            'task_state': getattr(server, 'OS-EXT-STS:task_state', None),
+            'power_state': _format_servers_list_power_state(
+                getattr(server, 'OS-EXT-STS:power_state', None)),
+        }
+        if parsed_args.json:
+            line = json.dumps(change, sort_keys=True)
+        else:
+            line = self.ROW % dict(
+                (k, '' if v is None else v) for k, v in change.items())
+        self.app.stdout.write(line + '\n')
+        self.app.stdout.flush()
+
+    def take_action(self, parsed_args):
+        compute_client = self.app.client_manager.compute
+
+        if parsed_args.interval <= 0:
+            msg = _('--interval must be a positive number')
+            raise exceptions.CommandError(msg)
+        if parsed_args.count is not None and parsed_args.count < 1:
+            msg = _('--count must be a positive number')
+            raise exceptions.CommandError(msg)
+
+        search_opts = _get_server_search_opts(self.app.client_manager,
+                                              parsed_args)
+        since = parsed_args.changes_since
+        # Without --changes-since the first poll only records the servers
+        # changed recently, so that they are not reported as changes
+        report = bool(since)
+        if not since:
+            # Allow for some clock skew between the client and the API
+            since = (timeutils.utcnow() - datetime.timedelta(
+                minutes=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        try:
+            start = timeutils.parse_isotime(since)
+        except ValueError:
+            raise exceptions.CommandError(
+                _('Invalid changes-since value: %s') % since)
+        # Use the format of the timestamps of the API so they compare
+        since = timeutils.normalize_time(start).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        if not parsed_args.json:
+            self.app.stdout.write(self.ROW % {
+                'updated': 'Updated', 'event': 'Event', 'id': 'ID',
+                'status': 'Status', 'task_state': 'Task State',
+                'name': 'Name'} + '\n')
+
+        # The last state reported for each server changed since ``since``
+        seen = {}
+        polls = 0
+        try:
+            while True:
+                changed = compute_client.servers.list(
+                    search_opts=dict(search_opts, **{'changes-since': since}),
+                    limit=-1)
+                for server in sorted(
+                        changed, key=lambda s: getattr(s, 'updated', '')):
+                    state = (
+                        getattr(server, 'updated', ''),
+                        server.status,
+                        getattr(server, 'OS-EXT-STS:task_state', None),
+                    )
+                    if seen.get(server.id) == state:
+                        continue
+                    created = getattr(server, 'created', None)
+                    if (server.status or '').upper() == 'DELETED':
+                        event = 'DELETED'
+                    elif (server.id not in seen and created and
+                            timeutils.parse_isotime(created) >= start):
+                        event = 'ADDED'
+                    else:
+                        event = 'CHANGED'
+                    seen[server.id] = state
+                    if report:
+                        self._write_change(parsed_args, event, server)
+                report = True
+
+                polls += 1
+                if parsed_args.count and polls >= parsed_args.count:
+                    break
+
+                # Follow the clock of the API rather than ours; servers
+                # last updated before the new point of time will not be
+                # listed again, so they can be forgotten
+                if seen:
+                    since = max(since, max(s[0] for s in seen.values()))
+                    seen = dict((k, v) for k, v in seen.items()
+                                if v[0] >= since)
+                time.sleep(parsed_args.interval)
+        except KeyboardInterrupt:
+            pass
@@ -22,6 +22,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 from oslo_utils import importutils
 
+from openstackclient.common import wait
 from openstackclient.i18n import _
 
 
@@ -85,9 +86,10 @@ class CreateServerImage(command.ShowOne):
         )
 
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if wait.wait_for_status(
                 image_client.images.get,
                 image_id,
+                expected_duration=wait.EXPECTED_DURATION['image_snapshot'],
                 callback=_show_progress,
             ):
                 self.app.stdout.write('\n')
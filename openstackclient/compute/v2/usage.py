@@ -20,8 +20,11 @@ import datetime
 
 from novaclient import api_versions
 from osc_lib.command import command
+from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import cache
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -55,6 +58,63 @@ def _merge_usage_list(usages, next_usage_list):
             usages[next_usage.tenant_id] = next_usage
 
 
+def _merge_usage_period(usage, next_usage):
+    """Add the usage of a project over the following period of time
+
+    Unlike consecutive pages, consecutive periods of time may both include
+    a server, whose usage over the two periods is then added up.
+    """
+    servers = dict((s['instance_id'], s) for s in usage.server_usages)
+    for server in next_usage.server_usages:
+        merged = servers.get(server['instance_id'])
+        if merged is None:
+            usage.server_usages.append(server)
+            servers[server['instance_id']] = server
+            continue
+        merged['hours'] += server['hours']
+        # The later period has the current state of the server
+        for key in ('ended_at', 'state', 'uptime'):
+            if key in server:
+                merged[key] = server[key]
+    for attr in ('total_hours', 'total_memory_mb_usage',
+                 'total_vcpus_usage', 'total_local_gb_usage'):
+        if hasattr(next_usage, attr):
+            setattr(usage, attr,
+                    getattr(usage, attr, 0) + getattr(next_usage, attr))
+
+
+def _list_usage(compute_client, start, end):
+    """Return the usage of all projects over a period of time"""
+    if compute_client.api_version < api_versions.APIVersion("2.40"):
+        return compute_client.usage.list(start, end, detailed=True)
+
+    # If the number of instances used to calculate the usage is greater
+    # than CONF.api.max_limit, the usage will be split across multiple
+    # requests and the responses will need to be merged back together.
+    usages = collections.OrderedDict()
+    usage_list = compute_client.usage.list(start, end, detailed=True)
+    _merge_usage_list(usages, usage_list)
+    marker = _get_usage_list_marker(usage_list)
+    while marker:
+        next_usage_list = compute_client.usage.list(
+            start, end, detailed=True, marker=marker)
+        marker = _get_usage_list_marker(next_usage_list)
+        if marker:
+            _merge_usage_list(usages, next_usage_list)
+    return list(usages.values())
+
+
+def _split_period(start, end, count):
+    """Split a period of time into count consecutive periods
+
+    The periods are rounded to the second and the last one ends at end.
+    """
+    step = datetime.timedelta(
+        seconds=int((end - start).total_seconds() // count))
+    bounds = [start + step * i for i in range(count)] + [end]
+    return [(s, e) for s, e in zip(bounds[:-1], bounds[1:]) if s < e]
+
+
 class ListUsage(command.Lister):
     _description = _("List resource usage per project")
 
@@ -73,6 +133,16 @@ class ListUsage(command.Lister):
             default=None,
             help=_("Usage range end date, ex 2012-01-20 (default: tomorrow)")
         )
+        parser.add_argument(
+            "--parallel",
+            metavar="<num-periods>",
+            type=int,
+            default=None,
+            help=_("Split the usage range into this many consecutive "
+                   "periods, retrieve the usage of each period concurrently "
+                   "and add them up (default: retrieve the whole range at "
+                   "once)")
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -80,10 +150,7 @@ class ListUsage(command.Lister):
         def _format_project(project):
             if not project:
                 return ""
-            if project in project_cache.keys():
-                return project_cache[project].name
-            else:
-                return project
+            return project_names.get(project) or project
 
         compute_client = self.app.client_manager.compute
         columns = (
@@ -114,32 +181,39 @@ class ListUsage(command.Lister):
         else:
             end = now + datetime.timedelta(days=1)
 
-        if compute_client.api_version < api_versions.APIVersion("2.40"):
-            usage_list = compute_client.usage.list(start, end, detailed=True)
-        else:
-            # If the number of instances used to calculate the usage is greater
-            # than CONF.api.max_limit, the usage will be split across multiple
-            # requests and the responses will need to be merged back together.
+        if parsed_args.parallel is not None and parsed_args.parallel < 1:
+            msg = _("--parallel must be a positive number")
+            raise exceptions.CommandError(msg)
+
+        periods = _split_period(start, end, parsed_args.parallel or 1)
+        if len(periods) > 1:
+            def _list_period(period):
+                return _list_usage(compute_client, *period)
+
             usages = collections.OrderedDict()
-            usage_list = compute_client.usage.list(start, end, detailed=True)
-            _merge_usage_list(usages, usage_list)
-            marker = _get_usage_list_marker(usage_list)
-            while marker:
-                next_usage_list = compute_client.usage.list(
-                    start, end, detailed=True, marker=marker)
-                marker = _get_usage_list_marker(next_usage_list)
-                if marker:
-                    _merge_usage_list(usages, next_usage_list)
+            for period_usage_list in parallel.run(_list_period, periods,
+                                                  workers=len(periods)):
+                for next_usage in period_usage_list:
+                    if next_usage.tenant_id in usages:
+                        _merge_usage_period(usages[next_usage.tenant_id],
+                                            next_usage)
+                    else:
+                        usages[next_usage.tenant_id] = next_usage
             usage_list = list(usages.values())
+        else:
+            usage_list = _list_usage(compute_client, start, end)
 
-        # Cache the project list
-        project_cache = {}
-        try:
-            for p in self.app.client_manager.identity.projects.list():
-                project_cache[p.id] = p
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
+        # Map the project IDs to names, fetching the names of the projects
+        # in the usage that are not cached yet, all at once when there are
+        # many; just forget it if there's any trouble
+        identity_client = self.app.client_manager.identity
+        project_names = cache.get_names(
+            cache.NameCache.from_client_manager(self.app.client_manager),
+            'project',
+            (u.tenant_id for u in usage_list),
+            identity_client.projects.get,
+            identity_client.projects.list,
+        )
 
         if parsed_args.formatter == 'table' and len(usage_list) > 0:
             self.app.stdout.write(_("Usage from %(start)s to %(end)s: \n") % {
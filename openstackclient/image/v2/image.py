@@ -17,7 +17,15 @@
 
 import argparse
 from base64 import b64encode
+import functools
+import hashlib
+import heapq
+import itertools
+import json
 import logging
+import os
+import tempfile
+import time
 
 from glanceclient.common import utils as gc_utils
 from openstack.image import image_signer
@@ -29,6 +37,8 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import stream
+from openstackclient.common import wait
 from openstackclient.i18n import _
 from openstackclient.identity import common
 
@@ -38,8 +48,21 @@ DEFAULT_CONTAINER_FORMAT = 'bare'
 DEFAULT_DISK_FORMAT = 'raw'
 DISK_CHOICES = ["ami", "ari", "aki", "vhd", "vmdk", "raw", "qcow2", "vhdx",
                 "vdi", "iso", "ploop"]
+IMPORT_METHOD_CHOICES = ["glance-direct", "web-download"]
 MEMBER_STATUS_CHOICES = ["accepted", "pending", "rejected", "all"]
 
+# Size of the chunks used to hash a partially downloaded image
+IMAGE_CHUNK_SIZE = 1024 * 1024
+# Size of the blocks that are skipped over when they only contain zeros
+SPARSE_BLOCK_SIZE = 4096
+# Number of images sorted in memory before they are spilled to disk
+SORT_RUN_SIZE = 10000
+# Seconds to wait for an image import to finish
+IMPORT_TIMEOUT = 3600
+# Seconds after which an image still queued once imported has failed to
+# import, even though it was never seen importing
+IMPORT_QUEUED_TIMEOUT = 300
+
 
 LOG = logging.getLogger(__name__)
 
@@ -75,6 +98,243 @@ def _format_image(image):
     return info
 
 
+def _verify_image_data(image, reader):
+    """Compare the checksums of the uploaded data with the ones Glance has
+
+    Only checksums that were computed over the whole stream while it was
+    uploaded are compared.
+    """
+
+    if not reader.eof:
+        return
+
+    checks = [('checksum', 'md5')]
+    hash_algo = image.get('os_hash_algo')
+    if hash_algo in reader.hashes:
+        checks.append(('os_hash_value', hash_algo))
+    for field, algorithm in checks:
+        expected = image.get(field)
+        actual = reader.hexdigest(algorithm)
+        if expected and expected != actual:
+            msg = _("Image %(image)s data is corrupt: %(field)s is "
+                    "%(expected)s but the uploaded data has %(actual)s")
+            raise exceptions.CommandError(msg % {
+                'image': image.id,
+                'field': field,
+                'expected': expected,
+                'actual': actual,
+            })
+
+
+def _wait_for_import(image_client, image_id, timeout=IMPORT_TIMEOUT):
+    """Poll an image until its import finishes, backing off exponentially
+
+    :param timeout: give up after waiting this long (seconds)
+    :returns: the imported image
+    """
+
+    schedule = wait.intervals(wait.EXPECTED_DURATION['image_import'],
+                              timeout)
+    importing = False
+    waited = 0
+    while True:
+        image = image_client.images.get(image_id)
+        status = image.get('status')
+        if status == 'active':
+            return image
+        if status == 'importing':
+            importing = True
+        # Glance puts an image whose import failed back in the queued
+        # state, and lists the stores it failed on when using multiple
+        # stores. The import may fail before it is ever seen importing.
+        if (status in ('killed', 'deleted') or
+                image.get('os_glance_failed_import') or
+                (status == 'queued' and
+                 (importing or waited >= IMPORT_QUEUED_TIMEOUT))):
+            msg = _("Import of image %(image)s failed (status %(status)s)")
+            raise exceptions.CommandError(msg % {
+                'image': image_id,
+                'status': status,
+            })
+        try:
+            interval = next(schedule)
+        except StopIteration:
+            msg = _("Timed out waiting for the import of image %(image)s "
+                    "(status %(status)s)")
+            raise exceptions.CommandError(msg % {
+                'image': image_id,
+                'status': status,
+            })
+        time.sleep(interval)
+        waited += interval
+
+
+def _sort_key(sort_str):
+    """Build a sort key equivalent to osc_lib.utils.sort_items(..., str)"""
+
+    sort_keys = []
+    for sort_key in sort_str.strip().split(','):
+        key, _sep, direction = sort_key.partition(':')
+        sort_keys.append((key, direction == 'desc'))
+
+    def _value(item, key):
+        value = utils.get_field(item, key)
+        if not isinstance(value, str):
+            try:
+                value = str(value)
+            except Exception:
+                value = ''
+        return value
+
+    def _compare(a, b):
+        for key, reverse in sort_keys:
+            x, y = _value(a, key), _value(b, key)
+            if x != y:
+                result = -1 if x < y else 1
+                return -result if reverse else result
+        return 0
+
+    return functools.cmp_to_key(_compare)
+
+
+def _spill_run(run):
+    f = tempfile.TemporaryFile(mode='w+')
+    for item in run:
+        f.write(json.dumps(item) + '\n')
+    f.seek(0)
+    return _read_run(f)
+
+
+def _read_run(f):
+    """Yield the images of a spilled run, closing its file once read"""
+    try:
+        for line in f:
+            yield json.loads(line)
+    finally:
+        f.close()
+
+
+def _sort_images(pages, sort_str, run_size=SORT_RUN_SIZE):
+    """Sort the images of pages with a bounded number of them in memory
+
+    Images are sorted in runs of run_size with osc_lib.utils.sort_items;
+    when there is more than one run they are spilled to temporary files
+    and merged.
+
+    :returns: iterable of sorted images
+    """
+
+    runs = []
+    run = []
+    for page in pages:
+        run.extend(page)
+        if len(run) >= run_size:
+            runs.append(_spill_run(utils.sort_items(run, sort_str, str)))
+            run = []
+    run = utils.sort_items(run, sort_str, str)
+    if not runs:
+        return run
+    runs.append(iter(run))
+
+    # Decorate the images so that ties never compare the dicts
+    key = _sort_key(sort_str)
+
+    def _decorate(i, run):
+        return ((key(item), i, n, item) for n, item in enumerate(run))
+
+    decorated = [_decorate(i, r) for i, r in enumerate(runs)]
+    return (item for _key, _i, _n, item in heapq.merge(*decorated))
+
+
+def _write_sparse(f, chunk, block_size=SPARSE_BLOCK_SIZE):
+    """Write chunk to f, seeking over the blocks that only contain zeros"""
+
+    zeros = b'\0' * block_size
+    start = 0
+    # Keep the blocks aligned with the file so skipped blocks become holes
+    end = block_size - f.tell() % block_size
+    while start < len(chunk):
+        block = chunk[start:end]
+        if block == zeros[:len(block)]:
+            f.seek(len(block), os.SEEK_CUR)
+        else:
+            f.write(block)
+        start, end = end, end + block_size
+
+
+def _save_image_file(image_client, image, path, resume=False, sparse=False):
+    """Download image data to a file, verifying it while it is written
+
+    :param image_client: Image v2 client
+    :param image: the image to download
+    :param string path: name of the file to write
+    :param boolean resume:
+        continue an interrupted download by only requesting the part of
+        the image that is not yet in the file
+    :param boolean sparse:
+        do not write blocks that only contain zeros
+    """
+
+    hash_algo = image.get('os_hash_algo')
+    expected = image.get('os_hash_value')
+    if not (expected and hash_algo in hashlib.algorithms_available):
+        hash_algo, expected = 'md5', image.get('checksum')
+    hasher = hashlib.new(hash_algo)
+
+    offset = 0
+    if resume and os.path.exists(path):
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(IMAGE_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+                offset += len(chunk)
+
+    size = image.get('size')
+    if size is not None and offset > size:
+        # Not a partial download of this image
+        offset = 0
+        hasher = hashlib.new(hash_algo)
+    if not offset or size is None or offset < size:
+        headers = {}
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+        resp, body = image_client.http_client.get(
+            '/v2/images/%s/file' % image.id,
+            headers=headers,
+        )
+        if resp.status_code == 204:
+            msg = _('Image %s has no data.') % image.id
+            raise exceptions.CommandError(msg)
+        if offset and resp.status_code != 206:
+            LOG.warning(_('The image service does not support resuming '
+                          'downloads, downloading image %s again'),
+                        image.id)
+            offset = 0
+            hasher = hashlib.new(hash_algo)
+
+        with open(path, 'r+b' if offset else 'wb') as f:
+            f.seek(offset)
+            for chunk in body:
+                hasher.update(chunk)
+                if sparse:
+                    _write_sparse(f, chunk)
+                else:
+                    f.write(chunk)
+            # Extends the file over trailing holes, and drops any stale
+            # data past the end of the image
+            f.truncate()
+
+    if expected and hasher.hexdigest() != expected:
+        msg = _("Image %(image)s data in %(file)s is corrupt: %(algo)s is "
+                "%(actual)s but the image has %(expected)s")
+        raise exceptions.CommandError(msg % {
+            'image': image.id,
+            'file': path,
+            'algo': hash_algo,
+            'actual': hasher.hexdigest(),
+            'expected': expected,
+        })
+
+
 class AddProjectToImage(command.ShowOne):
     _description = _("Associate project with image")
 
@@ -179,6 +439,12 @@ class CreateImage(command.ShowOne):
             metavar="<volume>",
             help=_("Create image from a volume"),
         )
+        source_group.add_argument(
+            "--from-object",
+            metavar="<container>/<object>",
+            help=_("Upload image from an object in the Object Storage "
+                   "service, without staging it on local disk"),
+        )
         parser.add_argument(
             "--force",
             dest='force',
@@ -187,6 +453,36 @@ class CreateImage(command.ShowOne):
             help=_("Force image creation if volume is in use "
                    "(only meaningful with --volume)"),
         )
+        parser.add_argument(
+            "--progress",
+            action="store_true",
+            default=False,
+            help=_("Show upload progress and throughput"),
+        )
+        parser.add_argument(
+            "--import-method",
+            metavar="<method>",
+            choices=IMPORT_METHOD_CHOICES,
+            help=_("Create the image with the interoperable image import "
+                   "workflow using <method> instead of a direct upload. "
+                   "The supported options are: %s. glance-direct stages "
+                   "the data from --file, --from-object or stdin; "
+                   "web-download imports it from --uri")
+            % ', '.join(IMPORT_METHOD_CHOICES),
+        )
+        parser.add_argument(
+            "--uri",
+            metavar="<uri>",
+            help=_("URI to import the image data from "
+                   "(only meaningful with --import-method web-download)"),
+        )
+        parser.add_argument(
+            "--wait",
+            action="store_true",
+            default=False,
+            help=_("Wait for the image import to finish, for up to an "
+                   "hour (requires --import-method)"),
+        )
         parser.add_argument(
             '--sign-key-path',
             metavar="<sign-key-path>",
@@ -320,9 +616,41 @@ class CreateImage(command.ShowOne):
                 parsed_args.project_domain,
             ).id
 
+        import_method = parsed_args.import_method
+        if import_method:
+            if parsed_args.volume:
+                msg = _("--import-method cannot be used with --volume")
+                raise exceptions.CommandError(msg)
+            if import_method == 'web-download':
+                if not parsed_args.uri:
+                    msg = _("--import-method web-download requires --uri")
+                    raise exceptions.CommandError(msg)
+                if parsed_args.file or parsed_args.from_object:
+                    msg = _("--import-method web-download does not upload "
+                            "data, --file and --from-object are not "
+                            "allowed")
+                    raise exceptions.CommandError(msg)
+        if parsed_args.uri and import_method != 'web-download':
+            msg = _("--uri requires --import-method web-download")
+            raise exceptions.CommandError(msg)
+        if parsed_args.wait and not import_method:
+            msg = _("--wait requires --import-method")
+            raise exceptions.CommandError(msg)
+
         # open the file first to ensure any failures are handled before the
         # image is created
-        fp = gc_utils.get_data_file(parsed_args)
+        fp = size = object_etag = None
+        if parsed_args.from_object:
+            fp, size, object_etag = self._open_object(
+                parsed_args.from_object)
+        elif import_method != 'web-download':
+            fp = gc_utils.get_data_file(parsed_args)
+            if fp is not None:
+                size = gc_utils.get_file_size(fp)
+        if import_method == 'glance-direct' and fp is None:
+            msg = _("--import-method glance-direct requires image data from "
+                    "--file, --from-object or stdin")
+            raise exceptions.CommandError(msg)
         info = {}
         if fp is not None and parsed_args.volume:
             raise exceptions.CommandError(_("Uploading data and using "
@@ -396,29 +724,91 @@ class CreateImage(command.ShowOne):
             image = image_client.images.create(**kwargs)
 
         if fp is not None:
-            with fp:
+            progress = stream.Progress() if parsed_args.progress else None
+            reader = stream.HashingReader(
+                fp,
+                size=size,
+                progress=progress,
+            )
+            with fp, reader:
                 try:
-                    image_client.images.upload(image.id, fp)
+                    if import_method:
+                        image_client.images.stage(image.id, reader)
+                        image_client.images.image_import(
+                            image.id, method=import_method)
+                    else:
+                        image_client.images.upload(image.id, reader)
                 except Exception:
                     # If the upload fails for some reason attempt to remove the
-                    # dangling queued image made by the create() call above but
-                    # only if the user did not specify an id which indicates
-                    # the Image already exists and should be left alone.
-                    try:
-                        if 'id' not in kwargs:
-                            image_client.images.delete(image.id)
-                    except Exception:
-                        pass  # we don't care about this one
+                    # dangling queued image made by the create() call above
+                    self._delete_created_image(image_client, image.id, kwargs)
                     raise  # now, throw the upload exception again
 
                 # update the image after the data has been uploaded
                 image = image_client.images.get(image.id)
 
+            if progress:
+                progress.finish(reader)
+            if import_method and parsed_args.wait:
+                image = _wait_for_import(image_client, image.id)
+            try:
+                if (object_etag and reader.eof and
+                        reader.hexdigest('md5') != object_etag):
+                    msg = _("Image %(image)s data is corrupt: the MD5 of the "
+                            "data read from %(object)s is %(md5)s but the "
+                            "object ETag is %(etag)s")
+                    raise exceptions.CommandError(msg % {
+                        'image': image.id,
+                        'object': parsed_args.from_object,
+                        'md5': reader.hexdigest('md5'),
+                        'etag': object_etag,
+                    })
+                _verify_image_data(image, reader)
+            except exceptions.CommandError as e:
+                # Do not leave a corrupt image around to be used
+                if self._delete_created_image(image_client, image.id, kwargs):
+                    raise exceptions.CommandError(
+                        _("%s; the image was deleted") % e)
+                raise
+        elif import_method == 'web-download':
+            image_client.images.image_import(
+                image.id, method=import_method, uri=parsed_args.uri)
+            if parsed_args.wait:
+                image = _wait_for_import(image_client, image.id)
+            else:
+                image = image_client.images.get(image.id)
+
         if not info:
             info = _format_image(image)
 
         return zip(*sorted(info.items()))
 
+    def _delete_created_image(self, image_client, image_id, kwargs):
+        """Delete the image made by this command, ignoring any failure
+
+        The image is only deleted if the user did not specify an id, which
+        indicates the image already exists and should be left alone.
+
+        :returns: True if the image was deleted
+        """
+        if 'id' in kwargs:
+            return False
+        try:
+            image_client.images.delete(image_id)
+        except Exception:
+            return False  # we don't care about this one
+        return True
+
+    def _open_object(self, from_object):
+        container, _sep, obj = from_object.partition('/')
+        if not container or not obj:
+            msg = _("--from-object must be given as <container>/<object>")
+            raise exceptions.CommandError(msg)
+        return self.app.client_manager.object_store.object_stream(
+            container=container,
+            object=obj,
+        )
+
 
 class DeleteImage(command.Command):
     _description = _("Delete image(s)")
@@ -540,7 +930,8 @@ class ListImage(command.Lister):
             metavar="<size>",
             help=argparse.SUPPRESS,
         )
-        parser.add_argument(
+        sort_group = parser.add_mutually_exclusive_group()
+        sort_group.add_argument(
             '--sort',
             metavar="<key>[:<direction>]",
             default='name:asc',
@@ -548,6 +939,13 @@ class ListImage(command.Lister):
                    "(default: name:asc), multiple keys and directions can be "
                    "specified separated by comma"),
         )
+        sort_group.add_argument(
+            '--no-sort',
+            action='store_true',
+            default=False,
+            help=_("Do not sort the output; images are listed in the order "
+                   "returned by the Image service as each page arrives"),
+        )
         parser.add_argument(
             "--limit",
             metavar="<num-images>",
@@ -620,36 +1018,18 @@ class ListImage(command.Lister):
             columns = ("ID", "Name", "Status")
             column_headers = columns
 
-        # List of image data received
-        data = []
-        limit = None
-        if 'limit' in kwargs:
-            limit = kwargs['limit']
         if 'marker' in kwargs:
-            data = image_client.api.image_list(**kwargs)
+            pages = [image_client.api.image_list(**kwargs)]
         else:
-            # No pages received yet, so start the page marker at None.
-            marker = None
-            while True:
-                page = image_client.api.image_list(marker=marker, **kwargs)
-                if not page:
-                    break
-                data.extend(page)
-                # Set the marker to the id of the last item we received
-                marker = page[-1]['id']
-                if limit:
-                    break
+            pages = self._list_pages(image_client, kwargs)
 
         if parsed_args.property:
-            for attr, value in parsed_args.property.items():
-                api_utils.simple_filter(
-                    data,
-                    attr=attr,
-                    value=value,
-                    property_field='properties',
-                )
+            pages = self._filter_pages(pages, parsed_args.property)
 
-        data = utils.sort_items(data, parsed_args.sort, str)
+        if parsed_args.no_sort:
+            data = itertools.chain.from_iterable(pages)
+        else:
+            data = _sort_images(pages, parsed_args.sort)
 
         return (
             column_headers,
@@ -662,6 +1042,30 @@ class ListImage(command.Lister):
             ) for s in data)
         )
 
+    def _list_pages(self, image_client, kwargs):
+        # No pages received yet, so start the page marker at None.
+        marker = None
+        while True:
+            page = image_client.api.image_list(marker=marker, **kwargs)
+            if not page:
+                break
+            yield page
+            # Set the marker to the id of the last item we received
+            marker = page[-1]['id']
+            if 'limit' in kwargs:
+                break
+
+    def _filter_pages(self, pages, properties):
+        for page in pages:
+            for attr, value in properties.items():
+                api_utils.simple_filter(
+                    page,
+                    attr=attr,
+                    value=value,
+                    property_field='properties',
+                )
+            yield page
+
 
 class ListImageProjects(command.Lister):
     _description = _("List projects associated with image")
@@ -739,6 +1143,20 @@ class SaveImage(command.Command):
             metavar="<filename>",
             help=_("Downloaded image save filename (default: stdout)"),
         )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            default=False,
+            help=_("Continue an interrupted download into <filename> "
+                   "(requires --file)"),
+        )
+        parser.add_argument(
+            "--sparse",
+            action="store_true",
+            default=False,
+            help=_("Do not write blocks of zeros, creating a sparse file; "
+                   "useful for raw and qcow2 images (requires --file)"),
+        )
         parser.add_argument(
             "image",
             metavar="<image>",
@@ -752,6 +1170,20 @@ class SaveImage(command.Command):
             image_client.images,
             parsed_args.image,
         )
+
+        if parsed_args.resume or parsed_args.sparse:
+            if not parsed_args.file:
+                msg = _("--resume and --sparse require --file")
+                raise exceptions.CommandError(msg)
+            _save_image_file(
+                image_client,
+                image,
+                parsed_args.file,
+                resume=parsed_args.resume,
+                sparse=parsed_args.sparse,
+            )
+            return
+
         data = image_client.images.data(image.id)
 
         if data.wrapped is None:
@@ -14,12 +14,14 @@
 import abc
 import contextlib
 import logging
+import threading
 
 import openstack.exceptions
 from osc_lib.command import command
 from osc_lib import exceptions
 import six
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -189,25 +191,51 @@ class NetworkAndComputeDelete(NetworkAndComputeCommand):
     following the rules in doc/source/command-errors.rst.
     """
 
+    def __init__(self, *args, **kwargs):
+        super(NetworkAndComputeDelete, self).__init__(*args, **kwargs)
+        # take_action_*() find the resource to delete from self.r, which
+        # is kept per thread
+        self._deleting = threading.local()
+
+    @property
+    def r(self):
+        """The name or ID of the resource being deleted by this thread"""
+        try:
+            return self._deleting.r
+        except AttributeError:
+            raise AttributeError(
+                "%s.r is only set while take_action() deletes a resource"
+                % type(self).__name__)
+
+    @r.setter
+    def r(self, value):
+        self._deleting.r = value
+
     def take_action(self, parsed_args):
         ret = 0
         resources = getattr(parsed_args, self.resource, [])
 
-        for r in resources:
+        # The endpoint is the same for all the resources, so it is only
+        # detected once
+        if self.app.client_manager.is_network_endpoint_enabled():
+            client = self.app.client_manager.network
+            delete = self.take_action_network
+        else:
+            client = self.app.client_manager.compute
+            delete = self.take_action_compute
+
+        def _delete(r):
             self.r = r
-            try:
-                if self.app.client_manager.is_network_endpoint_enabled():
-                    self.take_action_network(self.app.client_manager.network,
-                                             parsed_args)
-                else:
-                    self.take_action_compute(self.app.client_manager.compute,
-                                             parsed_args)
-            except Exception as e:
+            delete(client, parsed_args)
+
+        results = parallel.run(_delete, resources, return_exceptions=True)
+        for r, result in zip(resources, results):
+            if isinstance(result, Exception):
                 msg = _("Failed to delete %(resource)s with name or ID "
                         "'%(name_or_id)s': %(e)s") % {
                             "resource": self.resource,
                             "name_or_id": r,
-                            "e": e,
+                            "e": result,
                 }
                 LOG.error(msg)
                 ret += 1
@@ -18,6 +18,7 @@
 
 import itertools
 import logging
+import operator
 
 from osc_lib.cli import format_columns
 from osc_lib.command import command
@@ -41,12 +42,85 @@ def _get_columns(item):
     return sdk_utils.get_osc_show_columns_for_sdk_resource(item, {})
 
 
-def _get_ranges(item):
-    item = [int(i) if isinstance(i, six.string_types) else i for i in item]
-    for a, b in itertools.groupby(enumerate(item), lambda xy: xy[1] - xy[0]):
-        b = list(b)
-        yield "%s-%s" % (b[0][1], b[-1][1]) if b[0][1] != b[-1][1] else \
-            str(b[0][1])
+def _get_intervals(ids):
+    """Compress segment IDs into a sorted list of (first, last) intervals
+
+    The IDs of tunnel ranges can number in the millions, so the IDs are not
+    looped over one by one: an ID minus its index is the same all along a
+    run of consecutive IDs, which lets the end of each run be found by
+    binary search.
+    """
+    ids = list(ids)
+    if ids and not isinstance(ids[0], six.integer_types):
+        ids = list(map(int, ids))
+    if not all(map(operator.lt, ids, itertools.islice(ids, 1, None))):
+        ids = sorted(set(ids))
+
+    intervals = []
+    start = 0
+    while start < len(ids):
+        offset = ids[start] - start
+        # Gallop to bracket the end of the run, then bisect
+        last = start
+        step = 1
+        while (last + step < len(ids) and
+               ids[last + step] - (last + step) == offset):
+            last += step
+            step *= 2
+        end = min(last + step, len(ids))
+        while end - last > 1:
+            middle = (last + end) // 2
+            if ids[middle] - middle == offset:
+                last = middle
+            else:
+                end = middle
+        intervals.append((ids[start], ids[last]))
+        start = last + 1
+    return intervals
+
+
+def _get_available_intervals(minimum, maximum, used, available):
+    """Return the intervals of available segment IDs of a range
+
+    The available IDs are all the IDs of the range that are not used.  When
+    the numbers agree they are derived from the few used IDs rather than
+    from the expanded list of available ones.
+    """
+    available = available or []
+    if minimum is None or maximum is None:
+        return _get_intervals(available)
+    used = sorted(i for i in set(map(int, used or {}))
+                  if minimum <= i <= maximum)
+    if len(available) + len(used) != maximum - minimum + 1:
+        return _get_intervals(available)
+    intervals = []
+    first = minimum
+    for i in used + [maximum + 1]:
+        if i > first:
+            intervals.append((first, i - 1))
+        first = i + 1
+    return intervals
+
+
+def _count_intervals(intervals):
+    return sum(last - first + 1 for first, last in intervals)
+
+
+def _first_intervals(intervals, count):
+    """Return the intervals holding the first count IDs of intervals"""
+    result = []
+    for first, last in intervals:
+        if count <= 0:
+            break
+        last = min(last, first + count - 1)
+        result.append((first, last))
+        count -= last - first + 1
+    return result
+
+
+def _format_intervals(intervals):
+    return ["%s-%s" % (first, last) if first != last else str(first)
+            for first, last in intervals]
 
 
 def _hack_tuple_value_update_by_index(tup, index, value):
@@ -72,21 +146,70 @@ def _exchange_dict_keys_with_values(orig_dict):
 
 def _update_available_from_props(columns, props):
     index_available = columns.index('available')
+    intervals = _get_available_intervals(
+        props[columns.index('minimum')],
+        props[columns.index('maximum')],
+        props[columns.index('used')],
+        props[index_available],
+    )
     props = _hack_tuple_value_update_by_index(
-        props, index_available, list(_get_ranges(props[index_available])))
+        props, index_available, _format_intervals(intervals))
     return props
 
 
 def _update_used_from_props(columns, props):
     index_used = columns.index('used')
-    updated_used = _exchange_dict_keys_with_values(props[index_used])
+    updated_used = _exchange_dict_keys_with_values(props[index_used] or {})
     for k, v in updated_used.items():
-        updated_used[k] = list(_get_ranges(v))
+        updated_used[k] = _format_intervals(_get_intervals(v))
     props = _hack_tuple_value_update_by_index(
         props, index_used, updated_used)
     return props
 
 
+def _add_free_query_options_to_parser(parser):
+    parser.add_argument(
+        '--free-count',
+        action='store_true',
+        help=_('Also display the number of available segment identifiers'),
+    )
+    parser.add_argument(
+        '--first-free',
+        metavar='<count>',
+        type=int,
+        help=_('Also display the first <count> available segment '
+               'identifiers'),
+    )
+
+
+def _check_free_query_options(parsed_args):
+    if parsed_args.first_free is not None and parsed_args.first_free < 1:
+        msg = _("--first-free must be a positive integer")
+        raise exceptions.CommandError(msg)
+
+
+def _get_free_query_fields(parsed_args, obj):
+    """Return the names and values of the free segment queries asked for"""
+    names = ()
+    values = ()
+    if not parsed_args.free_count and parsed_args.first_free is None:
+        return names, values
+    intervals = _get_available_intervals(
+        getattr(obj, 'minimum', None),
+        getattr(obj, 'maximum', None),
+        getattr(obj, 'used', None),
+        getattr(obj, 'available', None),
+    )
+    if parsed_args.free_count:
+        names += ('free_count',)
+        values += (_count_intervals(intervals),)
+    if parsed_args.first_free is not None:
+        names += ('first_free',)
+        values += (_format_intervals(
+            _first_intervals(intervals, parsed_args.first_free)),)
+    return names, values
+
+
 def _update_additional_fields_from_props(columns, props):
     props = _update_available_from_props(columns, props)
     props = _update_used_from_props(columns, props)
@@ -299,6 +422,7 @@ class ListNetworkSegmentRange(command.Lister):
             action='store_true',
             help=_('List network segment ranges without available segments'),
         )
+        _add_free_query_options_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -312,6 +436,7 @@ class ListNetworkSegmentRange(command.Lister):
                      'Network API: %(e)s') % {'e': e})
             raise exceptions.CommandError(msg)
 
+        _check_free_query_options(parsed_args)
         filters = {}
         data = network_client.network_segment_ranges(**filters)
 
@@ -353,6 +478,11 @@ class ListNetworkSegmentRange(command.Lister):
                 'available',
             )
 
+        if parsed_args.free_count:
+            headers = headers + ('Free Count',)
+        if parsed_args.first_free is not None:
+            headers = headers + ('First Free',)
+
         display_props = tuple()
         for s in data:
             props = utils.get_item_properties(s, columns)
@@ -366,6 +496,7 @@ class ListNetworkSegmentRange(command.Lister):
                 continue
             if parsed_args.long:
                 props = _update_additional_fields_from_props(columns, props)
+            props += _get_free_query_fields(parsed_args, s)[1]
             display_props += (props,)
 
         return headers, display_props
@@ -438,6 +569,7 @@ class ShowNetworkSegmentRange(command.ShowOne):
             metavar='<network-segment-range>',
             help=_('Network segment range to display (name or ID)'),
         )
+        _add_free_query_options_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -451,6 +583,7 @@ class ShowNetworkSegmentRange(command.ShowOne):
                      'Network API: %(e)s') % {'e': e})
             raise exceptions.CommandError(msg)
 
+        _check_free_query_options(parsed_args)
         obj = network_client.find_network_segment_range(
             parsed_args.network_segment_range,
             ignore_missing=False
@@ -458,4 +591,5 @@ class ShowNetworkSegmentRange(command.ShowOne):
         display_columns, columns = _get_columns(obj)
         data = utils.get_item_properties(obj, columns, formatters=_formatters)
         data = _update_additional_fields_from_props(columns, props=data)
-        return (display_columns, data)
+        names, values = _get_free_query_fields(parsed_args, obj)
+        return (display_columns + names, data + values)
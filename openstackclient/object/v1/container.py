@@ -22,6 +22,7 @@ from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import utils
 
+from openstackclient.common import parallel
 from openstackclient.i18n import _
 
 
@@ -135,11 +136,22 @@ class ListContainer(command.Lister):
             default=False,
             help=_('List all containers (default is 10000)'),
         )
+        parser.add_argument(
+            '--metadata',
+            action='store_true',
+            default=False,
+            help=_('List container ACLs, sync target and properties in '
+                   'addition to the --long fields; this fetches the '
+                   'details of the containers concurrently'),
+        )
         return parser
 
     def take_action(self, parsed_args):
 
-        if parsed_args.long:
+        if parsed_args.metadata:
+            columns = ('Name', 'Bytes', 'Count', 'Read ACL', 'Write ACL',
+                       'Sync To', 'Properties')
+        elif parsed_args.long:
             columns = ('Name', 'Bytes', 'Count')
         else:
             columns = ('Name',)
@@ -156,14 +168,34 @@ class ListContainer(command.Lister):
         if parsed_args.all:
             kwargs['full_listing'] = True
 
-        data = self.app.client_manager.object_store.container_list(
+        object_store = self.app.client_manager.object_store
+        data = object_store.container_list(
             **kwargs
         )
 
+        formatters = {}
+        if parsed_args.metadata:
+            # The account listing already carries the byte and object
+            # counts, only the remaining metadata needs a HEAD request.
+            details = parallel.run(
+                lambda c: object_store.container_show(container=c['name']),
+                data,
+                return_exceptions=True,
+            )
+            for c, detail in zip(data, details):
+                if isinstance(detail, Exception):
+                    LOG.warning(_("Unable to show container %(name)s: "
+                                  "%(e)s"), {'name': c['name'], 'e': detail})
+                    continue
+                for key in ('read_acl', 'write_acl', 'sync_to', 'properties'):
+                    if key in detail:
+                        c[key] = detail[key]
+            formatters['Properties'] = format_columns.DictColumn
+
         return (columns,
                 (utils.get_dict_properties(
                     s, columns,
-                    formatters={},
+                    formatters=formatters,
                 ) for s in data))
 
 
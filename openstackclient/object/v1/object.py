@@ -15,7 +15,9 @@
 
 """Object v1 action implementations"""
 
+import datetime
 import logging
+import time
 
 from osc_lib.cli import format_columns
 from osc_lib.cli import parseractions
@@ -23,12 +25,30 @@ from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.api import object_store_v1
 from openstackclient.i18n import _
 
 
 LOG = logging.getLogger(__name__)
 
 
+def _format_expires(expires):
+    """Format an expiry time in seconds since the epoch as UTC"""
+    return datetime.datetime.utcfromtimestamp(expires).strftime(
+        '%Y-%m-%dT%H:%M:%SZ')
+
+
+def _get_temp_url_key(object_store, parsed_args):
+    key = parsed_args.key or object_store.temp_url_key(
+        container=parsed_args.container,
+    )
+    if not key:
+        msg = _('No temporary URL key is set on container %s or its '
+                'account')
+        raise exceptions.CommandError(msg % parsed_args.container)
+    return key
+
+
 class CreateObject(command.Lister):
     _description = _("Upload object to container")
 
@@ -43,7 +63,9 @@ class CreateObject(command.Lister):
             'objects',
             metavar='<filename>',
             nargs="+",
-            help=_('Local filename(s) to upload'),
+            help=_("Local filename(s) to upload; using '-' as the "
+                   "filename reads the object from stdin and requires "
+                   "--name"),
         )
         parser.add_argument(
             '--name',
@@ -51,6 +73,14 @@ class CreateObject(command.Lister):
             help=_('Upload a file and rename it. '
                    'Can only be used when uploading a single object')
         )
+        parser.add_argument(
+            '--segment-size',
+            metavar='<bytes>',
+            type=int,
+            help=_('When reading from stdin, store objects larger than '
+                   '<bytes> as a segmented object in '
+                   '<container>_segments (default 1 GiB, at most 5 GiB)'),
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -59,6 +89,12 @@ class CreateObject(command.Lister):
                 msg = _('Attempting to upload multiple objects and '
                         'using --name is not permitted')
                 raise exceptions.CommandError(msg)
+        if (parsed_args.segment_size is not None and
+                not 1 <= parsed_args.segment_size <=
+                object_store_v1.MAX_SEGMENT_SIZE):
+            msg = _('--segment-size must be between 1 and %d bytes')
+            raise exceptions.CommandError(
+                msg % object_store_v1.MAX_SEGMENT_SIZE)
         results = []
         for obj in parsed_args.objects:
             if len(obj) > 1024:
@@ -69,6 +105,7 @@ class CreateObject(command.Lister):
                 container=parsed_args.container,
                 object=obj,
                 name=parsed_args.name,
+                segment_size=parsed_args.segment_size,
             )
             results.append(data)
 
@@ -80,6 +117,189 @@ class CreateObject(command.Lister):
                 ) for s in results))
 
 
+class CreateObjectFormPost(command.ShowOne):
+    _description = _("Sign an HTML form to upload objects to a container")
+
+    def get_parser(self, prog_name):
+        parser = super(CreateObjectFormPost, self).get_parser(prog_name)
+        parser.add_argument(
+            'container',
+            metavar='<container>',
+            help=_('Container to upload the objects to'),
+        )
+        # --prefix is taken by the shell formatter of ShowOne
+        parser.add_argument(
+            '--object-prefix',
+            metavar='<prefix>',
+            dest='object_prefix',
+            default='',
+            help=_('Prefix of the names of the uploaded objects'),
+        )
+        parser.add_argument(
+            '--redirect',
+            metavar='<url>',
+            default='',
+            help=_('URL to redirect the browser to once the upload is done'),
+        )
+        parser.add_argument(
+            '--max-file-size',
+            metavar='<bytes>',
+            type=int,
+            required=True,
+            help=_('Maximum size of each uploaded file in bytes'),
+        )
+        parser.add_argument(
+            '--max-file-count',
+            metavar='<count>',
+            type=int,
+            default=1,
+            help=_('Maximum number of files uploaded with the form '
+                   '(default 1)'),
+        )
+        parser.add_argument(
+            '--lifetime',
+            metavar='<seconds>',
+            type=int,
+            default=3600,
+            help=_('Validity period of the form in seconds (default 3600)'),
+        )
+        parser.add_argument(
+            '--digest',
+            metavar='<digest>',
+            choices=['sha1', 'sha256', 'sha512'],
+            default='sha256',
+            help=_('HMAC digest used to sign the form, one of sha1, '
+                   'sha256 or sha512 (default sha256)'),
+        )
+        parser.add_argument(
+            '--key',
+            metavar='<key>',
+            help=_('Temporary URL key (default: the key set on '
+                   '<container> or on the account)'),
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        object_store = self.app.client_manager.object_store
+
+        if parsed_args.max_file_size < 1:
+            msg = _('--max-file-size must be a positive number')
+            raise exceptions.CommandError(msg)
+        if parsed_args.max_file_count < 1:
+            msg = _('--max-file-count must be a positive number')
+            raise exceptions.CommandError(msg)
+
+        key = _get_temp_url_key(object_store, parsed_args)
+        expires = int(time.time()) + parsed_args.lifetime
+        url, signature = object_store.object_form_post(
+            parsed_args.container,
+            expires,
+            key,
+            prefix=parsed_args.object_prefix,
+            redirect=parsed_args.redirect,
+            max_file_size=parsed_args.max_file_size,
+            max_file_count=parsed_args.max_file_count,
+            digest=parsed_args.digest,
+        )
+
+        # The form fields, as named by the FormPost middleware
+        data = {
+            'url': url,
+            'redirect': parsed_args.redirect,
+            'max_file_size': parsed_args.max_file_size,
+            'max_file_count': parsed_args.max_file_count,
+            'expires': expires,
+            'signature': signature,
+            'expires_at': _format_expires(expires),
+        }
+        return zip(*sorted(data.items()))
+
+
+class CreateObjectTempURL(command.Lister):
+    _description = _("Generate temporary URLs for objects")
+
+    def get_parser(self, prog_name):
+        parser = super(CreateObjectTempURL, self).get_parser(prog_name)
+        parser.add_argument(
+            'container',
+            metavar='<container>',
+            help=_('Container of the objects'),
+        )
+        parser.add_argument(
+            'objects',
+            metavar='<object>',
+            nargs='*',
+            help=_('Object(s) to generate URLs for (default: every object '
+                   'in <container>)'),
+        )
+        parser.add_argument(
+            '--prefix',
+            metavar='<prefix>',
+            help=_('Generate URLs for the objects whose name starts with '
+                   '<prefix> (ignored when <object> is given)'),
+        )
+        parser.add_argument(
+            '--lifetime',
+            metavar='<seconds>',
+            type=int,
+            default=3600,
+            help=_('Validity period of the URLs in seconds (default 3600)'),
+        )
+        parser.add_argument(
+            '--method',
+            metavar='<method>',
+            choices=['GET', 'HEAD', 'PUT', 'POST', 'DELETE'],
+            default='GET',
+            help=_('HTTP method the URLs are valid for (default GET)'),
+        )
+        parser.add_argument(
+            '--digest',
+            metavar='<digest>',
+            choices=['sha1', 'sha256', 'sha512'],
+            default='sha256',
+            help=_('HMAC digest used to sign the URLs, one of sha1, '
+                   'sha256 or sha512 (default sha256)'),
+        )
+        parser.add_argument(
+            '--key',
+            metavar='<key>',
+            help=_('Temporary URL key (default: the key set on '
+                   '<container> or on the account)'),
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        object_store = self.app.client_manager.object_store
+
+        key = _get_temp_url_key(object_store, parsed_args)
+
+        if parsed_args.objects:
+            names = parsed_args.objects
+        else:
+            listing = object_store.object_list(
+                container=parsed_args.container,
+                prefix=parsed_args.prefix,
+                all_data=True,
+            )
+            names = [o['name'] for o in listing]
+
+        expires = int(time.time()) + parsed_args.lifetime
+        expires_at = _format_expires(expires)
+
+        columns = ('Object', 'URL', 'Expires')
+        return (columns,
+                ((name,
+                  object_store.object_temp_url(
+                      parsed_args.container,
+                      name,
+                      expires,
+                      key,
+                      method=parsed_args.method,
+                      digest=parsed_args.digest,
+                  ),
+                  expires_at) for name in names))
+
+
 class DeleteObject(command.Command):
     _description = _("Delete object from container")
 
@@ -217,6 +437,20 @@ class SaveObject(command.Command):
             metavar="<object>",
             help=_("Object to save"),
         )
+        parser.add_argument(
+            "--chunk-size",
+            metavar="<bytes>",
+            type=int,
+            help=_("Size of the chunks read from the download stream "
+                   "(default 65536)"),
+        )
+        parser.add_argument(
+            "--ignore-checksum",
+            action="store_true",
+            default=False,
+            help=_("Do not verify the downloaded data against the object "
+                   "ETag"),
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -224,6 +458,8 @@ class SaveObject(command.Command):
             container=parsed_args.container,
             object=parsed_args.object,
             file=parsed_args.file,
+            chunk_size=parsed_args.chunk_size,
+            verify=not parsed_args.ignore_checksum,
         )
 
 
@@ -13,9 +13,17 @@
 
 """Object Store v1 API Library Tests"""
 
+import gzip
+import hashlib
+import hmac
+import io
+import os
+
+import fixtures
 import mock
 
 from keystoneauth1 import session
+from osc_lib import exceptions
 from requests_mock.contrib import fixture
 
 from openstackclient.api import object_store_v1 as object_store
@@ -29,6 +37,14 @@ FAKE_URL = 'http://gopher.com/v1/' + FAKE_ACCOUNT
 FAKE_CONTAINER = 'rainbarrel'
 FAKE_OBJECT = 'spigot'
 
+
+def gzip_compress(data):
+    out = io.BytesIO()
+    with gzip.GzipFile(fileobj=out, mode='wb') as f:
+        f.write(data)
+    return out.getvalue()
+
+
 LIST_CONTAINER_RESP = [
     'qaz',
     'fred',
@@ -209,6 +225,102 @@ class TestObject(TestObjectAPIv1):
         self.base_object_create('111\n222\n333\n')
         self.base_object_create(bytes([0x31, 0x00, 0x0d, 0x0a, 0x7f, 0xff]))
 
+    def _register_stream_put(self, url, uploads, headers=None):
+        def _consume(request, context):
+            body = request.body
+            if body is not None and not isinstance(body, bytes):
+                body = b''.join(body)
+            uploads.append((url, body, request.headers))
+            return ''
+
+        self.requests_mock.register_uri(
+            'PUT',
+            url,
+            headers=headers or {},
+            text=_consume,
+            status_code=201,
+        )
+
+    def test_object_create_stdin(self):
+        uploads = []
+        self._register_stream_put(
+            FAKE_URL + '/qaz/counter.txt',
+            uploads,
+            headers={'etag': 'youreit', 'x-trans-id': '1qaz2wsx'},
+        )
+        with mock.patch('sys.stdin', io.BytesIO(b'111\n222\n333\n')):
+            ret = self.api.object_create(
+                container='qaz',
+                object='-',
+                name='counter.txt',
+                segment_size=1024,
+            )
+        data = {
+            'account': FAKE_ACCOUNT,
+            'container': 'qaz',
+            'object': 'counter.txt',
+            'etag': 'youreit',
+            'x-trans-id': '1qaz2wsx',
+        }
+        self.assertEqual(data, ret)
+        self.assertEqual(
+            [(FAKE_URL + '/qaz/counter.txt', b'111\n222\n333\n')],
+            [(u, b) for u, b, h in uploads],
+        )
+        self.assertEqual('chunked', uploads[0][2]['Transfer-Encoding'])
+
+    @mock.patch('openstackclient.api.object_store_v1.time.time',
+                return_value=1.5)
+    def test_object_create_stdin_segmented(self, mock_time):
+        uploads = []
+        segments = FAKE_URL + '/qaz_segments'
+        prefix = segments + '/counter.txt/1.500000/4/'
+        self.requests_mock.register_uri('PUT', segments, status_code=201)
+        self._register_stream_put(FAKE_URL + '/qaz/counter.txt', uploads)
+        for index in range(3):
+            self._register_stream_put(prefix + '%08d' % index, uploads)
+
+        with mock.patch('sys.stdin', io.BytesIO(b'111\n222\n333\n')):
+            self.api.object_create(
+                container='qaz',
+                object='-',
+                name='counter.txt',
+                segment_size=4,
+            )
+
+        self.assertEqual(
+            [
+                (FAKE_URL + '/qaz/counter.txt', b'111\n'),
+                (prefix + '00000000', None),
+                (prefix + '00000001', b'222\n'),
+                (prefix + '00000002', b'333\n'),
+                (FAKE_URL + '/qaz/counter.txt', None),
+            ],
+            [(u, b) for u, b, h in uploads],
+        )
+        self.assertEqual('/qaz/counter.txt', uploads[1][2]['X-Copy-From'])
+        self.assertEqual('qaz_segments/counter.txt/1.500000/4/',
+                         uploads[4][2]['X-Object-Manifest'])
+
+    def test_object_create_stdin_default_segment_size(self):
+        with mock.patch.object(self.api, '_object_create_stream') as m, \
+                mock.patch('sys.stdin', io.BytesIO(b'111\n')):
+            self.api.object_create(
+                container='qaz',
+                object='-',
+                name='counter.txt',
+            )
+        self.assertEqual(object_store.DEFAULT_SEGMENT_SIZE,
+                         m.call_args[1]['segment_size'])
+
+    def test_object_create_stdin_no_name(self):
+        self.assertRaises(
+            exceptions.CommandError,
+            self.api.object_create,
+            container='qaz',
+            object='-',
+        )
+
     def test_object_delete(self):
         self.requests_mock.register_uri(
             'DELETE',
@@ -335,3 +447,232 @@ class TestObject(TestObjectAPIv1):
             object=FAKE_OBJECT,
         )
         self.assertEqual(resp, ret)
+
+    def test_object_save(self):
+        content = b'0123456789' * 1000
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/' + FAKE_OBJECT,
+            headers={'etag': hashlib.md5(content).hexdigest()},
+            content=content,
+            status_code=200,
+        )
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        file = os.path.join(tmp_dir, 'sub', FAKE_OBJECT)
+        self.api.object_save(
+            container='qaz',
+            object=FAKE_OBJECT,
+            file=file,
+            chunk_size=1024,
+        )
+        with open(file, 'rb') as f:
+            self.assertEqual(content, f.read())
+        self.assertEqual([FAKE_OBJECT],
+                         os.listdir(os.path.join(tmp_dir, 'sub')))
+
+    def test_object_save_checksum_mismatch(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/' + FAKE_OBJECT,
+            headers={'etag': '"%s"' % hashlib.md5(b'wilma').hexdigest()},
+            content=b'fred',
+            status_code=200,
+        )
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        file = os.path.join(tmp_dir, FAKE_OBJECT)
+        self.assertRaises(
+            exceptions.CommandError,
+            self.api.object_save,
+            container='qaz',
+            object=FAKE_OBJECT,
+            file=file,
+        )
+        self.assertEqual([], os.listdir(tmp_dir))
+
+    def test_object_save_no_verify(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/' + FAKE_OBJECT,
+            headers={'etag': hashlib.md5(b'wilma').hexdigest()},
+            content=b'fred',
+            status_code=200,
+        )
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        file = os.path.join(tmp_dir, FAKE_OBJECT)
+        self.api.object_save(
+            container='qaz',
+            object=FAKE_OBJECT,
+            file=file,
+            verify=False,
+        )
+        with open(file, 'rb') as f:
+            self.assertEqual(b'fred', f.read())
+
+    def test_object_save_large_object(self):
+        for headers in (
+            {'x-object-manifest': 'qaz_segments/' + FAKE_OBJECT},
+            {'x-static-large-object': 'True'},
+        ):
+            # The ETag of a segmented object is not the MD5 of its content
+            headers['etag'] = '"%s"' % hashlib.md5(b'wilma').hexdigest()
+            self.requests_mock.register_uri(
+                'GET',
+                FAKE_URL + '/qaz/' + FAKE_OBJECT,
+                headers=headers,
+                content=b'fred',
+                status_code=200,
+            )
+            tmp_dir = self.useFixture(fixtures.TempDir()).path
+            file = os.path.join(tmp_dir, FAKE_OBJECT)
+            self.api.object_save(
+                container='qaz',
+                object=FAKE_OBJECT,
+                file=file,
+            )
+            with open(file, 'rb') as f:
+                self.assertEqual(b'fred', f.read())
+
+    def test_object_save_content_encoding(self):
+        content = b'0123456789' * 1000
+        encoded = gzip_compress(content)
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/' + FAKE_OBJECT,
+            # The ETag is the MD5 of the data as stored
+            headers={'etag': hashlib.md5(encoded).hexdigest(),
+                     'content-encoding': 'gzip'},
+            content=encoded,
+            status_code=200,
+        )
+        tmp_dir = self.useFixture(fixtures.TempDir()).path
+        file = os.path.join(tmp_dir, FAKE_OBJECT)
+        self.api.object_save(
+            container='qaz',
+            object=FAKE_OBJECT,
+            file=file,
+        )
+        with open(file, 'rb') as f:
+            self.assertEqual(content, f.read())
+
+    def test_object_stream(self):
+        content = b'0123456789' * 100
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/' + FAKE_OBJECT,
+            headers={
+                'etag': hashlib.md5(content).hexdigest(),
+                'content-length': str(len(content)),
+            },
+            content=content,
+            status_code=200,
+        )
+        f, size, etag = self.api.object_stream(
+            container='qaz',
+            object=FAKE_OBJECT,
+        )
+        self.assertEqual(content, f.read())
+        self.assertEqual(len(content), size)
+        self.assertEqual(hashlib.md5(content).hexdigest(), etag)
+
+    def test_object_stream_content_encoding(self):
+        content = b'0123456789' * 100
+        encoded = gzip_compress(content)
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/' + FAKE_OBJECT,
+            headers={
+                'etag': hashlib.md5(encoded).hexdigest(),
+                'content-length': str(len(encoded)),
+                'content-encoding': 'gzip',
+            },
+            content=encoded,
+            status_code=200,
+        )
+        f, size, etag = self.api.object_stream(
+            container='qaz',
+            object=FAKE_OBJECT,
+        )
+        self.assertEqual(content, f.read())
+        self.assertIsNone(size)
+        self.assertIsNone(etag)
+
+    def test_object_temp_url(self):
+        path = '/v1/' + FAKE_ACCOUNT + '/qaz/' + FAKE_OBJECT
+        signature = hmac.new(
+            b'secret',
+            ('GET\n1500000000\n' + path).encode('utf-8'),
+            hashlib.sha256,
+        ).hexdigest()
+        ret = self.api.object_temp_url('qaz', FAKE_OBJECT, 1500000000,
+                                       'secret')
+        self.assertEqual(
+            'http://gopher.com' + path + '?temp_url_sig=' + signature +
+            '&temp_url_expires=1500000000',
+            ret,
+        )
+
+    def test_object_temp_url_quoted(self):
+        path = '/v1/' + FAKE_ACCOUNT + '/qaz/a b'
+        signature = hmac.new(
+            b'secret',
+            ('PUT\n1500000000\n' + path).encode('utf-8'),
+            hashlib.sha1,
+        ).hexdigest()
+        ret = self.api.object_temp_url('qaz', 'a b', 1500000000, 'secret',
+                                       method='put', digest='sha1')
+        self.assertEqual(
+            'http://gopher.com/v1/' + FAKE_ACCOUNT + '/qaz/a%20b' +
+            '?temp_url_sig=' + signature + '&temp_url_expires=1500000000',
+            ret,
+        )
+
+    def test_object_form_post(self):
+        path = '/v1/' + FAKE_ACCOUNT + '/qaz/up/'
+        signature = hmac.new(
+            b'secret',
+            (path + '\nhttps://example.com/\n1024\n2\n1500000000').encode(
+                'utf-8'),
+            hashlib.sha256,
+        ).hexdigest()
+        ret = self.api.object_form_post(
+            'qaz', 1500000000, 'secret', prefix='up/',
+            redirect='https://example.com/', max_file_size=1024,
+            max_file_count=2,
+        )
+        self.assertEqual(('http://gopher.com' + path, signature), ret)
+
+    def test_object_form_post_sha1(self):
+        path = '/v1/' + FAKE_ACCOUNT + '/qaz/'
+        signature = hmac.new(
+            b'secret',
+            (path + '\n\n1\n1\n1500000000').encode('utf-8'),
+            hashlib.sha1,
+        ).hexdigest()
+        ret = self.api.object_form_post(
+            'qaz', 1500000000, 'secret', max_file_size=1, digest='sha1',
+        )
+        self.assertEqual(('http://gopher.com' + path, signature), ret)
+
+    def test_temp_url_key_container(self):
+        self.requests_mock.register_uri(
+            'HEAD',
+            FAKE_URL + '/qaz',
+            headers={'x-container-meta-temp-url-key': 'fred'},
+            status_code=204,
+        )
+        self.assertEqual('fred', self.api.temp_url_key(container='qaz'))
+
+    def test_temp_url_key_account(self):
+        self.requests_mock.register_uri(
+            'HEAD',
+            FAKE_URL + '/qaz',
+            headers={},
+            status_code=204,
+        )
+        self.requests_mock.register_uri(
+            'HEAD',
+            FAKE_URL,
+            headers={'x-account-meta-temp-url-key': 'wilma'},
+            status_code=204,
+        )
+        self.assertEqual('wilma', self.api.temp_url_key(container='qaz'))
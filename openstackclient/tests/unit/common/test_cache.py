@@ -0,0 +1,178 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import collections
+import os
+
+import mock
+
+from openstackclient.common import cache
+from openstackclient.tests.unit import fakes
+from openstackclient.tests.unit import utils
+
+
+Resource = collections.namedtuple('Resource', 'id name')
+
+
+class TestNameCache(utils.TestCase):
+
+    def setUp(self):
+        super(TestNameCache, self).setUp()
+        self.path = os.path.join(cache.cache_dir(), 'test.json')
+
+    def test_get_unknown(self):
+        name_cache = cache.NameCache(self.path)
+        self.assertIsNone(name_cache.get('image', 'id1'))
+        self.assertFalse(name_cache.has_names('image'))
+
+    def test_save_and_load(self):
+        name_cache = cache.NameCache(self.path)
+        name_cache.set('image', 'id1', 'cirros')
+        name_cache.set('flavor', 'id2', None)
+        name_cache.save()
+
+        name_cache = cache.NameCache(self.path)
+        self.assertEqual('cirros', name_cache.get('image', 'id1'))
+        self.assertEqual('', name_cache.get('flavor', 'id2'))
+        self.assertTrue(name_cache.has_names('image'))
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+    def test_expired(self):
+        name_cache = cache.NameCache(self.path, ttl=60)
+        with mock.patch('time.time', return_value=1000):
+            name_cache.set('image', 'id1', 'cirros')
+        with mock.patch('time.time', return_value=1061):
+            self.assertIsNone(name_cache.get('image', 'id1'))
+            self.assertFalse(name_cache.has_names('image'))
+
+    def test_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as f:
+            f.write('{')
+        name_cache = cache.NameCache(self.path)
+        self.assertIsNone(name_cache.get('image', 'id1'))
+
+    def test_from_client_manager_no_project(self):
+        client_manager = fakes.FakeClientManager()
+        self.assertIsNone(cache.NameCache.from_client_manager(client_manager))
+
+    def test_from_client_manager_per_project(self):
+        client_manager = fakes.FakeClientManager()
+        client_manager.auth_ref = mock.Mock(project_id='project1')
+        first = cache.NameCache.from_client_manager(client_manager)
+        client_manager.auth_ref = mock.Mock(project_id='project2')
+        second = cache.NameCache.from_client_manager(client_manager)
+        self.assertNotEqual(first.path, second.path)
+
+    def test_from_client_manager_disabled(self):
+        client_manager = fakes.FakeClientManager()
+        client_manager.auth_ref = mock.Mock(project_id='project1')
+        with mock.patch.dict(os.environ, {'OS_NAME_CACHE': 'false'}):
+            self.assertIsNone(
+                cache.NameCache.from_client_manager(client_manager))
+        config = dict(client_manager.get_configuration(), name_cache=False)
+        with mock.patch.object(client_manager, 'get_configuration',
+                               return_value=config):
+            self.assertIsNone(
+                cache.NameCache.from_client_manager(client_manager))
+
+    def test_from_client_manager_ttl(self):
+        client_manager = fakes.FakeClientManager()
+        client_manager.auth_ref = mock.Mock(project_id='project1')
+        with mock.patch.dict(os.environ, {'OS_NAME_CACHE_TTL': '60'}):
+            name_cache = cache.NameCache.from_client_manager(client_manager)
+        self.assertEqual(60, name_cache.ttl)
+
+    def test_missing(self):
+        name_cache = cache.NameCache(self.path, ttl=600, negative_ttl=60)
+        with mock.patch('time.time', return_value=1000):
+            name_cache.set_missing('image', 'id1')
+            name_cache.save()
+        name_cache = cache.NameCache(self.path, ttl=600, negative_ttl=60)
+        with mock.patch('time.time', return_value=1059):
+            self.assertTrue(name_cache.is_missing('image', 'id1'))
+            self.assertIsNone(name_cache.get('image', 'id1'))
+            self.assertFalse(name_cache.has_names('image'))
+        with mock.patch('time.time', return_value=1061):
+            self.assertFalse(name_cache.is_missing('image', 'id1'))
+
+
+class TestGetNames(utils.TestCase):
+
+    def setUp(self):
+        super(TestGetNames, self).setUp()
+        self.name_cache = cache.NameCache(
+            os.path.join(cache.cache_dir(), 'test.json'))
+        self.get = mock.Mock(side_effect=lambda i: Resource(i, 'get-' + i))
+        self.list_all = mock.Mock(return_value=[
+            Resource('id1', 'list-id1'),
+            Resource('id2', 'list-id2'),
+        ])
+
+    def test_no_cache_lists(self):
+        names = cache.get_names(None, 'image', ['id1', 'id1', None],
+                                self.get, self.list_all)
+        self.assertEqual({'id1': 'list-id1'}, names)
+        self.list_all.assert_called_once_with()
+        self.get.assert_not_called()
+
+    def test_no_cache_one_by_one(self):
+        names = cache.get_names(None, 'image', ['id1', 'id2'], self.get)
+        self.assertEqual({'id1': 'get-id1', 'id2': 'get-id2'}, names)
+
+    def test_cold_cache_lists_once(self):
+        names = cache.get_names(self.name_cache, 'image', ['id1'],
+                                self.get, self.list_all)
+        self.assertEqual({'id1': 'list-id1'}, names)
+
+        # Every listed name was cached, so nothing is fetched again
+        names = cache.get_names(self.name_cache, 'image', ['id1', 'id2'],
+                                self.get, self.list_all)
+        self.assertEqual({'id1': 'list-id1', 'id2': 'list-id2'}, names)
+        self.list_all.assert_called_once_with()
+        self.get.assert_not_called()
+
+    def test_warm_cache_gets_unknown(self):
+        self.name_cache.set('image', 'id1', 'cached-id1')
+        names = cache.get_names(self.name_cache, 'image', ['id1', 'id3'],
+                                self.get, self.list_all)
+        self.assertEqual({'id1': 'cached-id1', 'id3': 'get-id3'}, names)
+        self.list_all.assert_not_called()
+        self.get.assert_called_once_with('id3')
+        self.assertEqual('get-id3', cache.NameCache(
+            self.name_cache.path).get('image', 'id3'))
+
+    def test_warm_cache_lists_many_unknown(self):
+        self.name_cache.set('image', 'id1', 'cached-id1')
+        ids = ['id%d' % i for i in range(2, cache.MAX_LOOKUPS + 3)]
+        names = cache.get_names(self.name_cache, 'image', ids,
+                                self.get, self.list_all)
+        self.assertEqual('list-id2', names['id2'])
+        self.assertIsNone(names['id3'])
+        self.list_all.assert_called_once_with()
+        self.get.assert_not_called()
+
+    def test_get_fails(self):
+        self.name_cache.set('image', 'id1', 'cached-id1')
+        self.get.side_effect = Exception('not found')
+        names = cache.get_names(self.name_cache, 'image', ['id3'],
+                                self.get, self.list_all)
+        self.assertEqual({'id3': None}, names)
+        self.assertIsNone(self.name_cache.get('image', 'id3'))
+        self.assertTrue(self.name_cache.is_missing('image', 'id3'))
+
+        # The failure is remembered, so the ID is not looked up again
+        names = cache.get_names(self.name_cache, 'image', ['id3'],
+                                self.get, self.list_all)
+        self.assertEqual({'id3': None}, names)
+        self.get.assert_called_once_with('id3')
@@ -0,0 +1,66 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import mock
+
+from openstackclient.common import parallel
+from openstackclient.tests.unit import utils
+
+
+def _square(i):
+    if i < 0:
+        raise ValueError(i)
+    return i * i
+
+
+class TestParallelRun(utils.TestCase):
+
+    def test_run_empty(self):
+        self.assertEqual([], parallel.run(_square, []))
+
+    def test_run_keeps_order(self):
+        self.assertEqual(
+            [i * i for i in range(50)],
+            parallel.run(_square, range(50), workers=8),
+        )
+
+    def test_run_single_worker(self):
+        self.assertEqual([0, 1, 4], parallel.run(_square, [0, 1, 2],
+                                                 workers=1))
+
+    def test_run_raises(self):
+        self.assertRaises(ValueError, parallel.run, _square, [1, -1, 2])
+
+    def test_run_return_exceptions(self):
+        results = parallel.run(_square, [1, -1, 2], return_exceptions=True)
+        self.assertEqual(1, results[0])
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(4, results[2])
+
+
+class TestRateLimiter(utils.TestCase):
+
+    @mock.patch('time.sleep')
+    @mock.patch('time.time', return_value=100)
+    def test_wait(self, mock_time, mock_sleep):
+        limiter = parallel.RateLimiter(rate=4)
+        for i in range(3):
+            limiter.wait()
+        mock_sleep.assert_has_calls([mock.call(0.25), mock.call(0.5)])
+
+    @mock.patch('time.sleep')
+    def test_no_limit(self, mock_sleep):
+        limiter = parallel.RateLimiter()
+        for i in range(3):
+            limiter.wait()
+        mock_sleep.assert_not_called()
@@ -0,0 +1,82 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import hashlib
+import io
+
+import mock
+import six
+
+from openstackclient.common import stream
+from openstackclient.tests.unit import utils
+
+
+class TestHashingReader(utils.TestCase):
+
+    def _read_all(self, reader):
+        chunks = []
+        chunk = reader.read(65536)
+        while chunk:
+            chunks.append(chunk)
+            chunk = reader.read(65536)
+        return b''.join(chunks)
+
+    def test_read(self):
+        data = b'0123456789' * 1000
+        progress = mock.Mock()
+        with stream.HashingReader(io.BytesIO(data), size=len(data),
+                                  chunk_size=1024, read_ahead=2,
+                                  progress=progress) as reader:
+            self.assertEqual(data, self._read_all(reader))
+
+        self.assertTrue(reader.eof)
+        self.assertEqual(len(data), reader.bytes)
+        self.assertEqual(hashlib.md5(data).hexdigest(),
+                         reader.hexdigest('md5'))
+        self.assertEqual(hashlib.sha512(data).hexdigest(),
+                         reader.hexdigest('sha512'))
+        self.assertEqual(10, progress.call_count)
+        self.assertEqual(b'', reader.read())
+
+    def test_read_error(self):
+        source = mock.Mock()
+        source.read.side_effect = IOError('bad disk')
+        reader = stream.HashingReader(source)
+        self.assertRaises(IOError, reader.read)
+        self.assertTrue(reader.eof)
+
+    def test_close_stops_read_ahead(self):
+        data = b'x' * 1024 * 64
+        source = io.BytesIO(data)
+        reader = stream.HashingReader(source, chunk_size=1024, read_ahead=1)
+        self.assertEqual(b'x' * 1024, reader.read())
+        reader.close()
+        reader._thread.join(5)
+        self.assertFalse(reader._thread.is_alive())
+        self.assertLess(source.tell(), len(data))
+
+
+class TestProgress(utils.TestCase):
+
+    def test_progress(self):
+        output = six.StringIO()
+        progress = stream.Progress(output=output)
+        reader = mock.Mock(size=4 * 1024 * 1024, bytes=1024 * 1024,
+                           throughput=2048)
+        progress(reader)
+        progress.finish(reader)
+        self.assertEqual(
+            '\r 25% 1.0 MiB of 4.0 MiB (2.0 KiB/s)'
+            '\r 25% 1.0 MiB of 4.0 MiB (2.0 KiB/s)\n',
+            output.getvalue(),
+        )
@@ -0,0 +1,99 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import itertools
+
+import mock
+
+from openstackclient.common import wait
+from openstackclient.tests.unit import utils
+
+
+class NotFound(Exception):
+    pass
+
+
+class TestIntervals(utils.TestCase):
+
+    def test_backoff(self):
+        with mock.patch('random.uniform', return_value=1):
+            schedule = list(itertools.islice(wait.intervals(), 12))
+        self.assertEqual(wait.INITIAL_INTERVAL, schedule[0])
+        self.assertEqual(wait.INITIAL_INTERVAL * wait.BACKOFF_FACTOR,
+                         schedule[1])
+        self.assertEqual(wait.MAX_INTERVAL, schedule[-1])
+        self.assertEqual(sorted(schedule), schedule)
+
+    def test_jitter(self):
+        schedule = list(itertools.islice(wait.intervals(), 50))
+        self.assertTrue(all(
+            i <= wait.MAX_INTERVAL * (1 + wait.JITTER) for i in schedule))
+        self.assertTrue(
+            wait.INITIAL_INTERVAL * (1 - wait.JITTER) <= schedule[0] <=
+            wait.INITIAL_INTERVAL * (1 + wait.JITTER))
+
+    def test_expected_duration(self):
+        with mock.patch('random.uniform', return_value=1):
+            schedule = list(itertools.islice(
+                wait.intervals(expected_duration=600), 20))
+        self.assertEqual(60, schedule[0])
+        self.assertEqual(120, schedule[-1])
+
+    def test_timeout(self):
+        schedule = list(wait.intervals(timeout=10))
+        self.assertAlmostEqual(10, sum(schedule))
+
+
+@mock.patch('time.sleep')
+class TestWaitForStatus(utils.TestCase):
+
+    def _status_f(self, *statuses):
+        return mock.Mock(side_effect=[
+            mock.Mock(status=s, progress=None) for s in statuses])
+
+    def test_wait_for_status(self, mock_sleep):
+        status_f = self._status_f('BUILD', 'BUILD', 'ACTIVE')
+        callback = mock.Mock()
+
+        self.assertTrue(wait.wait_for_status(status_f, 'id1',
+                                             callback=callback))
+
+        status_f.assert_called_with('id1')
+        self.assertEqual(2, mock_sleep.call_count)
+        callback.assert_called_with(0)
+
+    def test_wait_for_status_error(self, mock_sleep):
+        status_f = self._status_f('BUILD', 'ERROR')
+        self.assertFalse(wait.wait_for_status(status_f, 'id1'))
+
+    def test_wait_for_status_timeout(self, mock_sleep):
+        status_f = mock.Mock(return_value=mock.Mock(status='BUILD'))
+        self.assertFalse(wait.wait_for_status(status_f, 'id1', timeout=5))
+        self.assertAlmostEqual(
+            5, sum(c[0][0] for c in mock_sleep.call_args_list))
+
+    def test_wait_for_delete(self, mock_sleep):
+        manager = mock.Mock()
+        manager.get.side_effect = [mock.Mock(status='ACTIVE'), NotFound()]
+        self.assertTrue(wait.wait_for_delete(manager, 'id1'))
+        self.assertEqual(1, mock_sleep.call_count)
+
+    def test_wait_for_delete_error(self, mock_sleep):
+        manager = mock.Mock()
+        manager.get.return_value = mock.Mock(status='ERROR')
+        self.assertFalse(wait.wait_for_delete(manager, 'id1'))
+
+    def test_wait_for_delete_timeout(self, mock_sleep):
+        manager = mock.Mock()
+        manager.get.return_value = mock.Mock(status='DELETING')
+        self.assertFalse(wait.wait_for_delete(manager, 'id1', timeout=20))
@@ -27,6 +27,74 @@ class TestConsole(compute_fakes.TestComputev2):
         self.servers_mock.reset_mock()
 
 
+@mock.patch('time.sleep')
+class TestConsoleLogShow(TestConsole):
+
+    def setUp(self):
+        super(TestConsoleLogShow, self).setUp()
+        self.fake_server = compute_fakes.FakeServer.create_one_server(
+            methods={'get_console_output': None})
+        self.servers_mock.get.return_value = self.fake_server
+
+        self.cmd = console.ShowConsoleLog(self.app, None)
+
+    def test_console_log_show(self, mock_sleep):
+        self.fake_server.get_console_output.return_value = 'line1\nline2'
+        arglist = [
+            '--lines', '2',
+            'foo_vm',
+        ]
+        verifylist = [
+            ('lines', 2),
+            ('follow', False),
+            ('server', 'foo_vm'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.fake_server.get_console_output.assert_called_once_with(length=3)
+        self.assertEqual('line1\nline2\n', self.app.stdout.make_string())
+        mock_sleep.assert_not_called()
+
+    def test_console_log_show_follow(self, mock_sleep):
+        many = ''.join('new%d\n' % i for i in range(console.FOLLOW_LINES))
+        self.fake_server.get_console_output.side_effect = [
+            'line1\nline2\npart',
+            # Nothing new
+            'line1\nline2\npart',
+            # The unfinished line is complete
+            'line2\npartial\nline3\n',
+            # Too many lines to find the last line shown
+            many,
+            'line3\n' + many,
+            KeyboardInterrupt(),
+        ]
+        arglist = [
+            '--follow',
+            'foo_vm',
+        ]
+        verifylist = [
+            ('follow', True),
+            ('server', 'foo_vm'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.assertEqual('line1\nline2\npartial\nline3\n' + many,
+                         self.app.stdout.make_string())
+        self.assertEqual(
+            [mock.call(length=None),
+             mock.call(length=console.FOLLOW_LINES),
+             mock.call(length=console.FOLLOW_LINES),
+             mock.call(length=console.FOLLOW_LINES),
+             mock.call(length=console.FOLLOW_LINES * 2),
+             mock.call(length=console.FOLLOW_LINES * 2)],
+            self.fake_server.get_console_output.call_args_list)
+        self.assertEqual(4, mock_sleep.call_count)
+
+
 class TestConsoleUrlShow(TestConsole):
 
     def setUp(self):
@@ -585,6 +585,27 @@ class TestFlavorList(TestFlavor):
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(tuple(self.data_long), tuple(data))
 
+    def test_flavor_list_long_embedded_extra_specs(self):
+        self.app.client_manager.compute.api_version = \
+            novaclient.api_versions.APIVersion('2.61')
+        flavor_ = compute_fakes.FakeFlavor.create_one_flavor(
+            attrs={'extra_specs': {'embedded': 'value'}})
+        self.flavors_mock.list.return_value = [flavor_]
+        arglist = [
+            '--long',
+        ]
+        verifylist = [
+            ('long', True),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns_long, columns)
+        self.assertEqual(u'embedded=\'value\'', tuple(data)[0][-1])
+        flavor_.get_keys.assert_not_called()
+
 
 class TestFlavorSet(TestFlavor):
 
@@ -46,6 +46,15 @@ class TestHypervisorList(TestHypervisor):
         self.hypervisors = compute_fakes.FakeHypervisor.create_hypervisors()
         self.hypervisors_mock.list.return_value = self.hypervisors
 
+        # Both hypervisors are on host 'aaa'
+        self.aggregate = compute_fakes.FakeAggregate.create_one_aggregate(
+            attrs={'hosts': ['aaa']})
+        self.aggregates_mock.list.return_value = [
+            self.aggregate,
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                attrs={'hosts': ['bbb']}),
+        ]
+
         self.columns = (
             "ID",
             "Hypervisor Hostname",
@@ -62,7 +71,8 @@ class TestHypervisorList(TestHypervisor):
             "vCPUs Used",
             "vCPUs",
             "Memory MB Used",
-            "Memory MB"
+            "Memory MB",
+            "Aggregates",
         )
         self.data = (
             (
@@ -91,7 +101,8 @@ class TestHypervisorList(TestHypervisor):
                 self.hypervisors[0].vcpus_used,
                 self.hypervisors[0].vcpus,
                 self.hypervisors[0].memory_mb_used,
-                self.hypervisors[0].memory_mb
+                self.hypervisors[0].memory_mb,
+                self.aggregate.name,
             ),
             (
                 self.hypervisors[1].id,
@@ -102,7 +113,8 @@ class TestHypervisorList(TestHypervisor):
                 self.hypervisors[1].vcpus_used,
                 self.hypervisors[1].vcpus,
                 self.hypervisors[1].memory_mb_used,
-                self.hypervisors[1].memory_mb
+                self.hypervisors[1].memory_mb,
+                self.aggregate.name,
             ),
         )
         # Get the command object to test
@@ -185,9 +197,17 @@ class TestHypervisorList(TestHypervisor):
         columns, data = self.cmd.take_action(parsed_args)
 
         self.hypervisors_mock.list.assert_called_with()
+        self.aggregates_mock.list.assert_called_once_with()
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(self.data_long, tuple(data))
 
+    def test_hypervisor_list_no_aggregates_without_long(self):
+        parsed_args = self.check_parser(self.cmd, [], [])
+
+        self.cmd.take_action(parsed_args)
+
+        self.aggregates_mock.list.assert_not_called()
+
 
 class TestHypervisorShow(TestHypervisor):
 
@@ -294,6 +314,29 @@ class TestHypervisorShow(TestHypervisor):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
 
+    def test_hypervisor_show_cell_aggregates(self):
+        self.hypervisor.service['host'] = 'cell1@aaa'
+        self.aggregates_mock.list.return_value = [
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                attrs={'name': 'cell1@agg1', 'hosts': ['aaa']}),
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                attrs={'name': 'cell2@agg2', 'hosts': ['aaa']}),
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                attrs={'name': 'cell1@agg3', 'hosts': ['bbb']}),
+        ]
+        arglist = [
+            self.hypervisor.hypervisor_hostname,
+        ]
+        verifylist = [
+            ('hypervisor', self.hypervisor.hypervisor_hostname),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['cell1@agg1'], data[0])
+        self.assertEqual('cell1@aaa', data[columns.index('service_host')])
+
     def test_hyprvisor_show_uptime_not_implemented(self):
         arglist = [
             self.hypervisor.hypervisor_hostname,
@@ -15,17 +15,23 @@
 import argparse
 import collections
 import copy
+import datetime
 import getpass
+import json
+import os
 
+import fixtures
 import mock
 from mock import call
 from novaclient import api_versions
+from novaclient import exceptions as nova_exceptions
 from openstack import exceptions as sdk_exceptions
 from osc_lib import exceptions
-from osc_lib import utils as common_utils
 from oslo_utils import timeutils
 import six
 
+from openstackclient.common import cache
+from openstackclient.common import wait
 from openstackclient.compute.v2 import server
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit.image.v2 import fakes as image_fakes
@@ -92,7 +98,8 @@ class TestServer(compute_fakes.TestComputev2):
                                                                      0)
         return servers
 
-    def run_method_with_servers(self, method_name, server_count):
+    def run_method_with_servers(self, method_name, server_count,
+                                parallel=None):
         servers = self.setup_servers_mock(server_count)
 
         arglist = []
@@ -103,6 +110,9 @@ class TestServer(compute_fakes.TestComputev2):
         verifylist = [
             ('server', arglist),
         ]
+        if parallel:
+            arglist = arglist + ['--parallel', str(parallel)]
+            verifylist.append(('parallel', parallel))
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         result = self.cmd.take_action(parsed_args)
@@ -1351,8 +1361,11 @@ class TestServerCreate(TestServer):
                           self.cmd.take_action, parsed_args)
         self.assertNotCalled(self.servers_mock.create)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(wait, 'wait_for_status')
     def test_server_create_with_wait_ok(self, mock_wait_for_status):
+        # Retrieve the server once, as waiting would
+        mock_wait_for_status.side_effect = (
+            lambda status_f, res_id, **kwargs: bool(status_f(res_id)))
         arglist = [
             '--image', 'image1',
             '--flavor', 'flavor1',
@@ -1370,10 +1383,13 @@ class TestServerCreate(TestServer):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
         columns, data = self.cmd.take_action(parsed_args)
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.new_server.id,
+            expected_duration=wait.EXPECTED_DURATION['server_build'],
             callback=mock.ANY,
         )
+        # The server retrieved while waiting is not retrieved again
+        self.servers_mock.get.assert_called_once_with(self.new_server.id)
 
         kwargs = dict(
             meta=None,
@@ -1399,7 +1415,7 @@ class TestServerCreate(TestServer):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist(), data)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(wait, 'wait_for_status', return_value=False)
     def test_server_create_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--image', 'image1',
@@ -1420,10 +1436,14 @@ class TestServerCreate(TestServer):
         self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
 
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.new_server.id,
+            expected_duration=wait.EXPECTED_DURATION['server_build'],
             callback=mock.ANY,
         )
+        status_f = mock_wait_for_status.call_args[0][0]
+        self.assertEqual(self.new_server, status_f(self.new_server.id))
+        self.servers_mock.get.assert_called_once_with(self.new_server.id)
 
         kwargs = dict(
             meta=None,
@@ -2376,6 +2396,180 @@ class TestServerCreate(TestServer):
         self.assertFalse(self.flavors_mock.called)
 
 
+class TestServerBatchCreate(TestServer):
+
+    def setUp(self):
+        super(TestServerBatchCreate, self).setUp()
+
+        self.image = image_fakes.FakeImage.create_one_image()
+        self.images_mock.get.return_value = self.image
+
+        self.flavor = compute_fakes.FakeFlavor.create_one_flavor()
+        self.flavors_mock.get.return_value = self.flavor
+
+        self.app.client_manager.network = mock.Mock()
+        self.network_client = self.app.client_manager.network
+        self.network_client.find_network.return_value.id = 'net-id'
+        self.network_client.find_security_group.return_value.id = 'sg-id'
+
+        def _create(name, image, flavor, **kwargs):
+            return compute_fakes.FakeServer.create_one_server(
+                attrs={'name': name})
+        self.servers_mock.create.side_effect = _create
+
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'servers.yaml')
+
+        self.cmd = server.CreateServerBatch(self.app, None)
+
+    def _write(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+    def test_server_batch_create(self):
+        self._write(
+            'defaults:\n'
+            '  image: image1\n'
+            '  flavor: flavor1\n'
+            '  network: private\n'
+            '  security_group: [default]\n'
+            'servers:\n'
+            '  - name: web\n'
+            '    count: 2\n'
+            '  - name: db\n'
+            '    key_name: mykey\n'
+        )
+        arglist = [self.path, '--concurrency', '2']
+        verifylist = [
+            ('file', self.path),
+            ('concurrency', 2),
+            ('wait', False),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(('Name', 'ID', 'Status'), columns)
+        self.assertEqual(['web-1', 'web-2', 'db'], [row[0] for row in data])
+        self.assertEqual(['BUILD'] * 3, [row[2] for row in data])
+        # Shared references are only looked up once
+        self.images_mock.get.assert_called_once_with('image1')
+        self.flavors_mock.get.assert_called_once_with('flavor1')
+        self.network_client.find_network.assert_called_once_with(
+            'private', ignore_missing=False)
+        self.assertEqual(3, self.servers_mock.create.call_count)
+        self.servers_mock.create.assert_any_call(
+            'db', self.image, self.flavor,
+            meta=None,
+            reservation_id=None,
+            min_count=1,
+            max_count=1,
+            security_groups=['sg-id'],
+            userdata=None,
+            key_name='mykey',
+            availability_zone=None,
+            block_device_mapping_v2=[],
+            nics=[{'net-id': 'net-id', 'v4-fixed-ip': '',
+                   'v6-fixed-ip': '', 'port-id': ''}],
+            scheduler_hints={},
+            config_drive=None,
+        )
+
+    @mock.patch.object(server, '_wait_for_servers')
+    def test_server_batch_create_wait_with_failures(self, mock_wait):
+        self._write(
+            '{"servers": [{"name": "a", "image": "i", "flavor": "f"},'
+            ' {"name": "b", "image": "i", "flavor": "f"},'
+            ' {"name": "c", "image": "i", "flavor": "f"}]}'
+        )
+        created = {}
+
+        def _create(name, image, flavor, **kwargs):
+            if name == 'b':
+                raise exceptions.Forbidden(403)
+            created[name] = compute_fakes.FakeServer.create_one_server(
+                attrs={'name': name})
+            return created[name]
+        self.servers_mock.create.side_effect = _create
+        mock_wait.side_effect = lambda *args, **kwargs: [created['c'].id]
+        arglist = [self.path, '--wait', '--rate', '100']
+        verifylist = [
+            ('wait', True),
+            ('rate', 100),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(self.cmd, 'produce_output') as mock_output:
+            e = self.assertRaises(exceptions.CommandError,
+                                  self.cmd.take_action, parsed_args)
+
+        self.assertEqual('2 of 3 servers failed to create.', str(e))
+        mock_output.assert_called_once_with(parsed_args, (
+            'Name', 'ID', 'Status'), [
+            ['a', created['a'].id, 'ACTIVE'],
+            ['b', '', 'ERROR'],
+            ['c', created['c'].id, 'ERROR'],
+        ])
+        mock_wait.assert_called_once_with(
+            self.app.client_manager.compute,
+            [created['a'].id, created['c'].id],
+            callback=mock.ANY,
+            expected_duration=wait.EXPECTED_DURATION['server_build'],
+        )
+
+    def test_server_batch_create_unknown_attribute(self):
+        self._write(
+            'servers:\n'
+            '  - name: web\n'
+            '    image: image1\n'
+            '    flavor: flavor1\n'
+            '    colour: blue\n'
+        )
+        parsed_args = self.check_parser(self.cmd, [self.path], [])
+
+        e = self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                              parsed_args)
+        self.assertEqual('Unknown server attributes: colour', str(e))
+        self.servers_mock.create.assert_not_called()
+
+    def test_server_batch_create_invalid_count(self):
+        for count in ('two', '0', '-1', 'true'):
+            self._write(
+                'servers:\n'
+                '  - name: web\n'
+                '    image: image1\n'
+                '    flavor: flavor1\n'
+                '    count: %s\n' % count
+            )
+            parsed_args = self.check_parser(self.cmd, [self.path], [])
+
+            e = self.assertRaises(exceptions.CommandError,
+                                  self.cmd.take_action, parsed_args)
+            self.assertIn("The count of server 'web' must be a positive "
+                          "integer", str(e))
+        self.servers_mock.create.assert_not_called()
+
+    def test_server_batch_create_lookup_fails(self):
+        self._write(
+            'servers:\n'
+            '  - name: web\n'
+            '    image: image1\n'
+            '    flavor: flavor1\n'
+            '  - name: db\n'
+            '    image: image1\n'
+            '    flavor: missing\n'
+        )
+        self.flavors_mock.get.side_effect = [
+            self.flavor, exceptions.NotFound(404)]
+        self.flavors_mock.find.side_effect = exceptions.NotFound(404)
+        parsed_args = self.check_parser(self.cmd, [self.path], [])
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+        # Nothing is created unless every reference is found
+        self.servers_mock.create.assert_not_called()
+
+
 class TestServerDelete(TestServer):
 
     def setUp(self):
@@ -2423,7 +2617,7 @@ class TestServerDelete(TestServer):
         self.servers_mock.delete.assert_has_calls(calls)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=True)
+    @mock.patch.object(wait, 'wait_for_delete', return_value=True)
     def test_server_delete_wait_ok(self, mock_wait_for_delete):
         servers = self.setup_servers_mock(count=1)
 
@@ -2441,11 +2635,56 @@ class TestServerDelete(TestServer):
         mock_wait_for_delete.assert_called_once_with(
             self.servers_mock,
             servers[0].id,
+            expected_duration=wait.EXPECTED_DURATION['server_delete'],
             callback=mock.ANY,
         )
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=False)
+    @mock.patch.object(server, '_wait_for_servers', return_value=[])
+    def test_server_delete_multi_servers_wait(self, mock_wait):
+        servers = self.setup_servers_mock(count=2)
+
+        arglist = [s.id for s in servers] + ['--wait']
+        verifylist = [
+            ('server', [s.id for s in servers]),
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.servers_mock.delete.assert_has_calls(
+            [call(s.id) for s in servers])
+        mock_wait.assert_called_once_with(
+            self.app.client_manager.compute,
+            [s.id for s in servers],
+            success_status=('deleted',),
+            callback=mock.ANY,
+            expected_duration=wait.EXPECTED_DURATION['server_delete'],
+            all_projects=False,
+        )
+
+    @mock.patch.object(server, '_wait_for_servers')
+    def test_server_delete_parallel_wait_fails(self, mock_wait):
+        servers = self.setup_servers_mock(count=2)
+        mock_wait.return_value = [servers[1].id]
+
+        arglist = [s.id for s in servers] + ['--wait', '--parallel', '2']
+        verifylist = [
+            ('server', [s.id for s in servers]),
+            ('wait', True),
+            ('parallel', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        e = self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                              parsed_args)
+
+        self.assertEqual('1 of 2 servers failed to delete.', str(e))
+        self.servers_mock.delete.assert_has_calls(
+            [call(s.id) for s in servers], any_order=True)
+
+    @mock.patch.object(wait, 'wait_for_delete', return_value=False)
     def test_server_delete_wait_fails(self, mock_wait_for_delete):
         servers = self.setup_servers_mock(count=1)
 
@@ -2463,6 +2702,7 @@ class TestServerDelete(TestServer):
         mock_wait_for_delete.assert_called_once_with(
             self.servers_mock,
             servers[0].id,
+            expected_duration=wait.EXPECTED_DURATION['server_delete'],
             callback=mock.ANY,
         )
 
@@ -2736,6 +2976,111 @@ class TestServerList(TestServer):
         self.assertEqual(self.columns, columns)
         self.assertEqual(tuple(self.data), tuple(data))
 
+    def test_server_list_name_lookup_one_by_one_missing(self):
+        arglist = [
+            '--name-lookup-one-by-one'
+        ]
+        verifylist = [
+            ('name_lookup_one_by_one', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.images_mock.get.side_effect = exceptions.NotFound(None)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # Each missing image is looked up only once
+        image_ids = set(s.image['id'] for s in self.servers if s.image)
+        self.assertEqual(len(image_ids), self.images_mock.get.call_count)
+        self.assertEqual(self.columns, columns)
+        for s, row in zip(self.servers, data):
+            self.assertEqual('' if s.image else s.image, row[4])
+            self.assertEqual(self.flavor.name, row[5])
+
+    def test_server_list_name_cache(self):
+        name_cache = cache.NameCache(
+            os.path.join(cache.cache_dir(), 'test.json'))
+        for s in self.servers:
+            if s.image:
+                name_cache.set('image', s.image['id'], self.image.name)
+            name_cache.set('flavor', s.flavor['id'], self.flavor.name)
+        parsed_args = self.check_parser(self.cmd, [], [])
+
+        with mock.patch.object(cache.NameCache, 'from_client_manager',
+                               return_value=name_cache):
+            columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertFalse(self.images_mock.list.call_count)
+        self.assertFalse(self.flavors_mock.list.call_count)
+        self.assertFalse(self.images_mock.get.call_count)
+        self.assertFalse(self.flavors_mock.get.call_count)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(tuple(self.data), tuple(data))
+
+    def test_server_list_page_size(self):
+        arglist = [
+            '--page-size', '2',
+        ]
+        verifylist = [
+            ('page_size', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.servers_mock.list.side_effect = [
+            self.servers[:2], self.servers[2:], [],
+        ]
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # Only the first page is retrieved before the output is consumed
+        self.servers_mock.list.assert_called_once_with(
+            search_opts=self.search_opts, marker=None, limit=2)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(tuple(self.data), tuple(data))
+        self.servers_mock.list.assert_has_calls([
+            call(search_opts=self.search_opts, marker=self.servers[1].id,
+                 limit=2),
+            call(search_opts=self.search_opts, marker=self.servers[2].id,
+                 limit=2),
+        ])
+        # The names of the first page are reused for the following ones
+        self.images_mock.list.assert_called_once_with()
+        self.flavors_mock.list.assert_called_once_with(is_public=None)
+
+    def test_server_list_page_size_with_limit(self):
+        arglist = [
+            '--page-size', '2',
+            '--limit', '3',
+        ]
+        verifylist = [
+            ('page_size', 2),
+            ('limit', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.servers_mock.list.side_effect = [
+            self.servers[:2], self.servers[2:],
+        ]
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(tuple(self.data), tuple(data))
+        self.servers_mock.list.assert_has_calls([
+            call(search_opts=self.search_opts, marker=None, limit=2),
+            call(search_opts=self.search_opts, marker=self.servers[1].id,
+                 limit=1),
+        ])
+        self.assertEqual(2, self.servers_mock.list.call_count)
+
+    def test_server_list_page_size_invalid(self):
+        arglist = [
+            '--page-size', '0',
+        ]
+        verifylist = [
+            ('page_size', 0),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+
     def test_server_list_with_image(self):
 
         arglist = [
@@ -3468,7 +3813,7 @@ class TestServerMigrate(TestServer):
         self.assertNotCalled(self.servers_mock.migrate)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(wait, 'wait_for_status', return_value=True)
     def test_server_migrate_with_wait(self, mock_wait_for_status):
         arglist = [
             '--wait', self.server.id,
@@ -3488,7 +3833,7 @@ class TestServerMigrate(TestServer):
         self.assertNotCalled(self.servers_mock.live_migrate)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(wait, 'wait_for_status', return_value=False)
     def test_server_migrate_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--wait', self.server.id,
@@ -3646,7 +3991,7 @@ class TestServerRebuild(TestServer):
         self.server.rebuild.assert_called_with(self.image, None,
                                                description=description)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(wait, 'wait_for_status', return_value=True)
     def test_rebuild_with_wait_ok(self, mock_wait_for_status):
         arglist = [
             '--wait',
@@ -3666,6 +4011,7 @@ class TestServerRebuild(TestServer):
         mock_wait_for_status.assert_called_once_with(
             self.servers_mock.get,
             self.server.id,
+            expected_duration=wait.EXPECTED_DURATION['server_build'],
             callback=mock.ANY,
             # **kwargs
         )
@@ -3674,7 +4020,7 @@ class TestServerRebuild(TestServer):
         self.images_mock.get.assert_called_with(self.image.id)
         self.server.rebuild.assert_called_with(self.image, None)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(wait, 'wait_for_status', return_value=False)
     def test_rebuild_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--wait',
@@ -3691,6 +4037,7 @@ class TestServerRebuild(TestServer):
         mock_wait_for_status.assert_called_once_with(
             self.servers_mock.get,
             self.server.id,
+            expected_duration=wait.EXPECTED_DURATION['server_build'],
             callback=mock.ANY,
         )
 
@@ -4269,7 +4616,7 @@ class TestServerResize(TestServer):
         self.assertIn('The --revert option has been deprecated.',
                       six.text_type(mock_warning.call_args[0][0]))
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(wait, 'wait_for_status', return_value=True)
     def test_server_resize_with_wait_ok(self, mock_wait_for_status):
 
         arglist = [
@@ -4293,7 +4640,10 @@ class TestServerResize(TestServer):
             self.server.id,
         )
 
-        kwargs = dict(success_status=['active', 'verify_resize'],)
+        kwargs = dict(
+            success_status=['active', 'verify_resize'],
+            expected_duration=wait.EXPECTED_DURATION['server_resize'],
+        )
 
         mock_wait_for_status.assert_called_once_with(
             self.servers_mock.get,
@@ -4309,7 +4659,7 @@ class TestServerResize(TestServer):
         self.assertNotCalled(self.servers_mock.confirm_resize)
         self.assertNotCalled(self.servers_mock.revert_resize)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(wait, 'wait_for_status', return_value=False)
     def test_server_resize_with_wait_fails(self, mock_wait_for_status):
 
         arglist = [
@@ -4333,7 +4683,10 @@ class TestServerResize(TestServer):
             self.server.id,
         )
 
-        kwargs = dict(success_status=['active', 'verify_resize'],)
+        kwargs = dict(
+            success_status=['active', 'verify_resize'],
+            expected_duration=wait.EXPECTED_DURATION['server_resize'],
+        )
 
         mock_wait_for_status.assert_called_once_with(
             self.servers_mock.get,
@@ -4699,7 +5052,7 @@ class TestServerShow(TestServer):
         ]
         verifylist = [
             ('diagnostics', False),
-            ('server', self.server.name),
+            ('server', [self.server.name]),
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
@@ -4716,7 +5069,7 @@ class TestServerShow(TestServer):
         ]
         verifylist = [
             ('diagnostics', False),
-            ('server', self.server.name),
+            ('server', [self.server.name]),
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
         self.server.info['flavor'] = {
@@ -4742,7 +5095,7 @@ class TestServerShow(TestServer):
         ]
         verifylist = [
             ('diagnostics', True),
-            ('server', self.server.name),
+            ('server', [self.server.name]),
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
@@ -4751,6 +5104,226 @@ class TestServerShow(TestServer):
         self.assertEqual(('test',), columns)
         self.assertEqual(('test',), data)
 
+    def test_show_multiple(self):
+        other = compute_fakes.FakeServer.create_one_server(attrs={
+            'image': {'id': self.image.id},
+            'flavor': {'id': self.flavor.id},
+            'tenant_id': 'tenant-id-xxx',
+            'networks': {},
+        })
+        self.servers_mock.get.side_effect = (
+            lambda name_or_id: {self.server.id: self.server,
+                                other.id: other}[name_or_id])
+        arglist = [
+            self.server.id,
+            other.id,
+        ]
+        verifylist = [
+            ('server', [self.server.id, other.id]),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(self.cmd, 'produce_output') as produce:
+            columns, data = self.cmd.take_action(parsed_args)
+
+        produce.assert_called_once_with(parsed_args, self.columns, self.data)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(other.id, data[3])
+        # The image and flavor shared by the servers are looked up once
+        self.images_mock.get.assert_called_once_with(self.image.id)
+        self.flavors_mock.get.assert_called_once_with(self.flavor.id)
+
+    def test_show_multiple_not_found(self):
+        self.servers_mock.get.side_effect = (
+            lambda name_or_id: {self.server.id: self.server}[name_or_id])
+        self.servers_mock.find.side_effect = exceptions.NotFound(404)
+        arglist = [
+            self.server.id,
+            'unknown',
+        ]
+        verifylist = [
+            ('server', [self.server.id, 'unknown']),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(self.cmd, 'produce_output') as produce:
+            exc = self.assertRaises(exceptions.CommandError,
+                                    self.cmd.take_action,
+                                    parsed_args)
+
+        self.assertEqual('1 of 2 servers failed to show.', str(exc))
+        produce.assert_called_once_with(parsed_args, self.columns, self.data)
+
+    def test_show_multiple_machine_readable(self):
+        for formatter in ('json', 'shell', 'yaml'):
+            arglist = [
+                '-f', formatter,
+                self.server.id,
+                self.server.id,
+            ]
+            verifylist = [
+                ('formatter', formatter),
+                ('server', [self.server.id, self.server.id]),
+            ]
+            parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+            exc = self.assertRaises(exceptions.CommandError,
+                                    self.cmd.take_action,
+                                    parsed_args)
+            self.assertIn('Only one server can be displayed', str(exc))
+        self.servers_mock.get.assert_not_called()
+
+
+class TestServerSsh(TestServer):
+
+    def setUp(self):
+        super(TestServerSsh, self).setUp()
+
+        self.app.client_manager.auth_ref = mock.Mock(username='cloud')
+        self.servers = [
+            compute_fakes.FakeServer.create_one_server(attrs={
+                'addresses': {'public': [
+                    {'addr': '192.0.2.%d' % i, 'version': 4}]},
+            }) for i in (1, 2)
+        ]
+        self.servers_mock.get.return_value = self.servers[0]
+        self.servers_mock.list.return_value = self.servers
+
+        self.cmd = server.SshServer(self.app, None)
+
+    @mock.patch('subprocess.call')
+    def test_server_ssh(self, mock_call):
+        arglist = [
+            '--login', 'admin',
+            '--port', '2222',
+            self.servers[0].id,
+        ]
+        verifylist = [
+            ('login', 'admin'),
+            ('port', 2222),
+            ('server', self.servers[0].id),
+            ('command', []),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        mock_call.assert_called_once_with(
+            ['ssh', '-p', '2222', 'admin@192.0.2.1'])
+
+    @mock.patch('subprocess.call')
+    def test_server_ssh_options_after_server(self, mock_call):
+        arglist = [
+            self.servers[0].id,
+            '-4',
+            '--login', 'root',
+            '-i', 'my key',
+            '--', 'ls', '-l', '>', '$(out)',
+        ]
+        verifylist = [
+            ('server', self.servers[0].id),
+            ('ipv4', True),
+            ('login', 'root'),
+            ('identity', 'my key'),
+            ('command', ['ls', '-l', '>', '$(out)']),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        mock_call.assert_called_once_with(
+            ['ssh', '-4', '-i', 'my key', 'root@192.0.2.1',
+             'ls', '-l', '>', '$(out)'])
+
+    def test_server_ssh_command_without_separator(self):
+        arglist = [
+            self.servers[0].id,
+            'uptime',
+        ]
+        verifylist = []
+
+        self.assertRaises(utils.ParserException, self.check_parser,
+                          self.cmd, arglist, verifylist)
+
+    @mock.patch('subprocess.Popen')
+    def test_server_ssh_all_matching(self, mock_popen):
+        processes = [
+            mock.Mock(returncode=0, communicate=mock.Mock(
+                return_value=(b'up 3 days', None))),
+            mock.Mock(returncode=1, communicate=mock.Mock(
+                return_value=(b'failed\n', None))),
+        ]
+        mock_popen.side_effect = (
+            lambda args, **kwargs: {'cloud@192.0.2.1': processes[0],
+                                    'cloud@192.0.2.2': processes[1]}[args[3]])
+        arglist = [
+            '--all-matching', '^web',
+            '--parallel', '2',
+            '--', 'uptime', '-p',
+        ]
+        verifylist = [
+            ('all_matching', '^web'),
+            ('parallel', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        exc = self.assertRaises(exceptions.CommandError,
+                                self.cmd.take_action,
+                                parsed_args)
+
+        self.assertEqual('1 of 2 servers failed to run the command.',
+                         str(exc))
+        self.servers_mock.list.assert_called_once_with(
+            search_opts={'name': '^web'}, limit=-1)
+        self.servers_mock.get.assert_not_called()
+        mock_popen.assert_has_calls([
+            call(['ssh', '-o', 'BatchMode=yes', 'cloud@192.0.2.1',
+                  'uptime', '-p'],
+                 stdin=mock.ANY, stdout=mock.ANY, stderr=mock.ANY),
+            call(['ssh', '-o', 'BatchMode=yes', 'cloud@192.0.2.2',
+                  'uptime', '-p'],
+                 stdin=mock.ANY, stdout=mock.ANY, stderr=mock.ANY),
+        ], any_order=True)
+        self.assertEqual(
+            '==> %s (%s): exit status 0 <==\nup 3 days\n'
+            '==> %s (%s): exit status 1 <==\nfailed\n' % (
+                self.servers[0].name, self.servers[0].id,
+                self.servers[1].name, self.servers[1].id),
+            self.app.stdout.make_string())
+
+    def test_server_ssh_all_matching_no_command(self):
+        arglist = [
+            '--all-matching', '^web',
+        ]
+        verifylist = [
+            ('all_matching', '^web'),
+            ('server', None),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action,
+                          parsed_args)
+        self.servers_mock.list.assert_not_called()
+
+    def test_server_ssh_all_matching_with_server(self):
+        arglist = [
+            '--all-matching', '^web',
+            self.servers[0].id,
+            '--', 'uptime',
+        ]
+        verifylist = [
+            ('all_matching', '^web'),
+            ('server', self.servers[0].id),
+            ('command', ['uptime']),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action,
+                          parsed_args)
+        self.servers_mock.list.assert_not_called()
+
 
 class TestServerStart(TestServer):
 
@@ -4771,6 +5344,47 @@ class TestServerStart(TestServer):
     def test_server_start_multi_servers(self):
         self.run_method_with_servers('start', 3)
 
+    def test_server_start_multi_servers_parallel(self):
+        self.run_method_with_servers('start', 3, parallel=2)
+
+    @mock.patch.object(server, '_wait_for_servers', return_value=[])
+    def test_server_start_wait(self, mock_wait):
+        servers = self.setup_servers_mock(2)
+        arglist = [s.id for s in servers] + ['--wait']
+        verifylist = [
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        for s in servers:
+            s.start.assert_called_once_with()
+        mock_wait.assert_called_once_with(
+            self.app.client_manager.compute,
+            [s.id for s in servers],
+            success_status=('active',),
+            callback=mock.ANY,
+            expected_duration=wait.EXPECTED_DURATION['server_action'],
+            all_projects=False,
+        )
+
+    @mock.patch.object(server, '_wait_for_servers', return_value=[])
+    def test_server_start_wait_other_project(self, mock_wait):
+        servers = self.setup_servers_mock(2)
+        servers[0].tenant_id = 'project-id'
+        servers[1].tenant_id = 'other-project-id'
+        self.app.client_manager.auth_ref = mock.Mock(project_id='project-id')
+        arglist = [s.id for s in servers] + ['--wait']
+        verifylist = [
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.assertTrue(mock_wait.call_args[1]['all_projects'])
+
 
 class TestServerStop(TestServer):
 
@@ -4791,6 +5405,40 @@ class TestServerStop(TestServer):
     def test_server_stop_multi_servers(self):
         self.run_method_with_servers('stop', 3)
 
+    def test_server_stop_multi_servers_parallel(self):
+        self.run_method_with_servers('stop', 3, parallel=3)
+
+    def test_server_stop_parallel_with_failures(self):
+        servers = self.setup_servers_mock(3)
+        self.servers_mock.get = mock.Mock(
+            side_effect=lambda name: dict(
+                (s.id, s) for s in servers)[name])
+        servers[1].stop.side_effect = exceptions.Conflict(409)
+        arglist = [s.id for s in servers] + ['--parallel', '2']
+        verifylist = [
+            ('server', [s.id for s in servers]),
+            ('parallel', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        e = self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                              parsed_args)
+
+        self.assertEqual('1 of 3 servers failed to stop.', str(e))
+        for s in servers:
+            s.stop.assert_called_once_with()
+
+    def test_server_stop_parallel_invalid(self):
+        servers = self.setup_servers_mock(1)
+        arglist = [servers[0].id, '--parallel', '0']
+        verifylist = [
+            ('parallel', 0),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+
 
 class TestServerSuspend(TestServer):
 
@@ -5005,6 +5653,107 @@ class TestServerUnshelveV277(TestServerUnshelve):
         self.server.unshelve.assert_called_with(availability_zone="foo-az")
 
 
+@mock.patch('time.sleep')
+class TestServerWatch(TestServer):
+
+    def setUp(self):
+        super(TestServerWatch, self).setUp()
+
+        self.cmd = server.WatchServer(self.app, None)
+
+    def _server(self, status, updated, created='2020-01-01T00:00:00Z'):
+        return compute_fakes.FakeServer.create_one_server(attrs={
+            'status': status,
+            'updated': updated,
+            'created': created,
+        })
+
+    def test_server_watch(self, mock_sleep):
+        old = self._server('ACTIVE', '2020-01-02T00:00:00Z')
+        old_stopped = self._server('SHUTOFF', '2020-01-02T00:01:00Z')
+        old_stopped.id = old.id
+        new = self._server('BUILD', '2020-01-02T00:01:00Z',
+                           created='2020-01-02T00:01:00Z')
+        gone = self._server('DELETED', '2020-01-02T00:02:00Z')
+        self.servers_mock.list.side_effect = [
+            [old],
+            [old, new, old_stopped],
+            [gone, new],
+        ]
+
+        arglist = [
+            '--changes-since', '2020-01-02T00:00:00Z',
+            '--count', '3',
+            '--json',
+        ]
+        verifylist = [
+            ('changes_since', '2020-01-02T00:00:00Z'),
+            ('count', 3),
+            ('json', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        changes = [json.loads(line) for line in
+                   self.app.stdout.make_string().splitlines()]
+        self.assertEqual(
+            [('CHANGED', old.id, 'ACTIVE'),
+             ('ADDED', new.id, 'BUILD'),
+             ('CHANGED', old.id, 'SHUTOFF'),
+             ('DELETED', gone.id, 'DELETED')],
+            [(c['event'], c['id'], c['status']) for c in changes])
+        self.assertEqual(
+            ['2020-01-02T00:00:00Z',
+             '2020-01-02T00:00:00Z',
+             '2020-01-02T00:01:00Z'],
+            [c[1]['search_opts']['changes-since']
+             for c in self.servers_mock.list.call_args_list])
+        self.assertEqual(
+            -1, self.servers_mock.list.call_args[1]['limit'])
+        self.assertEqual(2, mock_sleep.call_count)
+
+    def test_server_watch_from_now(self, mock_sleep):
+        recent = self._server('ACTIVE', '2020-01-02T00:00:00Z')
+        recent_error = self._server('ERROR', '2020-01-02T00:01:00Z')
+        recent_error.id = recent.id
+        self.servers_mock.list.side_effect = [
+            [recent],
+            [recent],
+            [recent_error],
+        ]
+
+        arglist = ['--count', '3']
+        verifylist = [('count', 3), ('json', False)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(timeutils, 'utcnow', return_value=(
+                datetime.datetime(2020, 1, 2, 0, 0, 30))):
+            self.cmd.take_action(parsed_args)
+
+        # Only the header and the change after the first poll are shown
+        lines = self.app.stdout.make_string().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith('Updated'))
+        self.assertEqual(
+            ['2020-01-02T00:01:00Z', 'CHANGED', recent.id, 'ERROR'],
+            lines[1].split()[:4])
+        self.assertEqual(
+            '2020-01-01T23:59:30Z',
+            self.servers_mock.list.call_args_list[0][1]['search_opts'][
+                'changes-since'])
+
+    def test_server_watch_invalid_changes_since(self, mock_sleep):
+        arglist = ['--changes-since', 'Invalid time value']
+        verifylist = [('changes_since', 'Invalid time value')]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action,
+                          parsed_args)
+        self.servers_mock.list.assert_not_called()
+
+
 class TestServerGeneral(TestServer):
     OLD = {
         'private': [
@@ -5143,3 +5892,96 @@ class TestServerGeneral(TestServer):
 
         # Check the results.
         self.assertEqual(info, server_detail)
+
+
+@mock.patch('time.sleep')
+class TestWaitForServers(TestServer):
+
+    def _server(self, status):
+        return compute_fakes.FakeServer.create_one_server(
+            attrs={'status': status})
+
+    def test_wait_for_servers(self, mock_sleep):
+        active = self._server('ACTIVE')
+        building = self._server('BUILD')
+        building_active = self._server('ACTIVE')
+        building_active.id = building.id
+        self.servers_mock.list.side_effect = [
+            [active, building],
+            [active, building_active],
+        ]
+        callback = mock.Mock()
+
+        failed = server._wait_for_servers(
+            self.app.client_manager.compute, [active.id, building.id],
+            callback=callback)
+
+        self.assertEqual([], failed)
+        self.assertEqual(2, self.servers_mock.list.call_count)
+        self.assertIn('changes-since',
+                      self.servers_mock.list.call_args[1]['search_opts'])
+        self.assertNotIn('all_tenants',
+                         self.servers_mock.list.call_args[1]['search_opts'])
+        self.servers_mock.get.assert_not_called()
+        callback.assert_has_calls([call(50), call(100)])
+        self.assertEqual(1, mock_sleep.call_count)
+
+    def test_wait_for_servers_many_pages(self, mock_sleep):
+        servers = [self._server('ACTIVE') for _i in range(5)]
+
+        def list_servers(search_opts=None, limit=None):
+            # Only the first page unless every page is requested
+            return servers if limit == -1 else servers[:2]
+
+        self.servers_mock.list.side_effect = list_servers
+
+        failed = server._wait_for_servers(
+            self.app.client_manager.compute, [s.id for s in servers])
+
+        self.assertEqual([], failed)
+        self.assertEqual(-1, self.servers_mock.list.call_args[1]['limit'])
+        self.servers_mock.get.assert_not_called()
+        mock_sleep.assert_not_called()
+
+    def test_wait_for_servers_error(self, mock_sleep):
+        errored = self._server('ERROR')
+        self.servers_mock.list.return_value = [errored]
+
+        failed = server._wait_for_servers(
+            self.app.client_manager.compute, [errored.id])
+
+        self.assertEqual([errored.id], failed)
+        mock_sleep.assert_not_called()
+
+    def test_wait_for_servers_unlisted(self, mock_sleep):
+        self.servers_mock.list.return_value = []
+        self.servers_mock.get = mock.Mock(
+            side_effect=nova_exceptions.NotFound(404))
+
+        failed = server._wait_for_servers(
+            self.app.client_manager.compute, ['unlisted'],
+            success_status=('deleted',))
+
+        self.assertEqual([], failed)
+        self.servers_mock.get.assert_called_once_with('unlisted')
+
+    def test_wait_for_servers_all_projects(self, mock_sleep):
+        active = self._server('ACTIVE')
+        self.servers_mock.list.return_value = [active]
+
+        failed = server._wait_for_servers(
+            self.app.client_manager.compute, [active.id], all_projects=True)
+
+        self.assertEqual([], failed)
+        self.assertTrue(
+            self.servers_mock.list.call_args[1]['search_opts']['all_tenants'])
+        self.servers_mock.get.assert_not_called()
+
+    def test_wait_for_servers_get_fails(self, mock_sleep):
+        self.servers_mock.list.return_value = []
+        self.servers_mock.get = mock.Mock(
+            side_effect=nova_exceptions.Forbidden(403))
+
+        self.assertRaises(nova_exceptions.Forbidden,
+                          server._wait_for_servers,
+                          self.app.client_manager.compute, ['unlisted'])
@@ -77,7 +77,8 @@ class TestUsageList(TestUsage):
 
         columns, data = self.cmd.take_action(parsed_args)
 
-        self.projects_mock.list.assert_called_with()
+        self.projects_mock.list.assert_called_once_with()
+        self.projects_mock.get.assert_not_called()
 
         self.assertEqual(self.columns, columns)
         self.assertEqual(tuple(self.data), tuple(data))
@@ -96,7 +97,8 @@ class TestUsageList(TestUsage):
 
         columns, data = self.cmd.take_action(parsed_args)
 
-        self.projects_mock.list.assert_called_with()
+        self.projects_mock.list.assert_called_once_with()
+        self.projects_mock.get.assert_not_called()
         self.usage_mock.list.assert_called_with(
             datetime.datetime(2016, 11, 11, 0, 0),
             datetime.datetime(2016, 12, 20, 0, 0),
@@ -121,7 +123,8 @@ class TestUsageList(TestUsage):
 
         columns, data = self.cmd.take_action(parsed_args)
 
-        self.projects_mock.list.assert_called_with()
+        self.projects_mock.list.assert_called_once_with()
+        self.projects_mock.get.assert_not_called()
         self.usage_mock.list.assert_has_calls([
             mock.call(mock.ANY, mock.ANY, detailed=True),
             mock.call(mock.ANY, mock.ANY, detailed=True,
@@ -130,6 +133,49 @@ class TestUsageList(TestUsage):
         self.assertEqual(self.columns, columns)
         self.assertEqual(tuple(self.data), tuple(data))
 
+    def test_usage_list_parallel(self):
+        arglist = [
+            '--start', '2016-11-11',
+            '--end', '2016-11-21',
+            '--parallel', '2',
+        ]
+        verifylist = [
+            ('start', '2016-11-11'),
+            ('end', '2016-11-21'),
+            ('parallel', 2),
+        ]
+        # The same server is used during both periods
+        first, second = compute_fakes.FakeUsage.create_usages(
+            attrs={'tenant_id': self.project.name}, count=2)
+        second.server_usages[0]['instance_id'] = (
+            first.server_usages[0]['instance_id'])
+        second.server_usages[0]['state'] = 'terminated'
+        other_project = compute_fakes.FakeUsage.create_one_usage()
+        self.usage_mock.list.side_effect = (
+            lambda start, end, detailed: {
+                datetime.datetime(2016, 11, 11): [first],
+                datetime.datetime(2016, 11, 16): [second, other_project],
+            }[start])
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.usage_mock.list.assert_has_calls([
+            mock.call(datetime.datetime(2016, 11, 11),
+                      datetime.datetime(2016, 11, 16),
+                      detailed=True),
+            mock.call(datetime.datetime(2016, 11, 16),
+                      datetime.datetime(2016, 11, 21),
+                      detailed=True),
+        ], any_order=True)
+        self.assertEqual(self.columns, columns)
+        data = tuple(data)
+        self.assertEqual(2, len(data))
+        self.assertEqual((self.project.name, 1, 1024.0, 2.0, 2.0), data[0])
+        self.assertEqual(2.0, first.server_usages[0]['hours'])
+        self.assertEqual('terminated', first.server_usages[0]['state'])
+
 
 class TestUsageShow(TestUsage):
 
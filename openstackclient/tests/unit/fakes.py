@@ -73,6 +73,9 @@ class FakeStdout(object):
     def write(self, text):
         self.content.append(text)
 
+    def flush(self):
+        pass
+
     def make_string(self):
         result = ''
         for line in self.content:
@@ -120,7 +120,9 @@ IMAGE_schema = {
                 "active",
                 "killed",
                 "deleted",
-                "pending_delete"
+                "pending_delete",
+                "uploading",
+                "importing"
             ],
             "type": "string",
             "description": "Status of the image (READ-ONLY)"
@@ -154,6 +156,7 @@ class FakeImagev2Client(object):
         self.image_members.resource_class = fakes.FakeResource(None, {})
         self.image_tags = mock.Mock()
         self.image_tags.resource_class = fakes.FakeResource(None, {})
+        self.http_client = mock.Mock()
         self.auth_token = kwargs['token']
         self.management_url = kwargs['endpoint']
         self.version = 2.0
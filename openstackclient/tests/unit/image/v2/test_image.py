@@ -14,12 +14,17 @@
 #
 
 import copy
+import hashlib
+import os
 
+import fixtures
 from glanceclient.common import utils as glanceclient_utils
 from glanceclient.v2 import schemas
 import mock
 from osc_lib.cli import format_columns
 from osc_lib import exceptions
+from osc_lib import utils
+import six
 import warlock
 
 from openstackclient.image.v2 import image
@@ -288,6 +293,269 @@ class TestImageCreate(TestImage):
             image_fakes.FakeImage.get_image_data(self.new_image),
             data)
 
+    def _upload_file(self, content, attrs, extra_args=()):
+        def _upload(image_id, data):
+            while data.read(65536):
+                pass
+
+        self.images_mock.upload.side_effect = _upload
+        self.images_mock.get.return_value = (
+            image_fakes.FakeImage.create_one_image(attrs))
+        self.images_mock.configure_mock(**{
+            'find.side_effect': exceptions.CommandError('x'),
+        })
+
+        arglist = [
+            '--file', 'filer',
+            self.new_image.name,
+        ] + list(extra_args)
+        verifylist = [
+            ('file', 'filer'),
+            ('name', self.new_image.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch('glanceclient.common.utils.get_data_file',
+                        return_value=six.BytesIO(content)):
+            return self.cmd.take_action(parsed_args)
+
+    def test_image_create_file_verified(self):
+        content = b'image data' * 1000
+        columns, data = self._upload_file(content, {
+            'checksum': hashlib.md5(content).hexdigest(),
+            'os_hash_algo': 'sha512',
+            'os_hash_value': hashlib.sha512(content).hexdigest(),
+        })
+        self.assertIn('checksum', columns)
+
+    def test_image_create_file_corrupt(self):
+        content = b'image data' * 1000
+        self.assertRaisesRegex(
+            exceptions.CommandError,
+            'the image was deleted',
+            self._upload_file,
+            content,
+            {
+                'checksum': hashlib.md5(content).hexdigest(),
+                'os_hash_algo': 'sha512',
+                'os_hash_value': hashlib.sha512(b'other').hexdigest(),
+            },
+        )
+        self.images_mock.delete.assert_called_once_with(
+            self.images_mock.get.return_value.id)
+
+    def test_image_create_file_corrupt_existing_id(self):
+        content = b'image data' * 1000
+        attrs = {
+            'checksum': hashlib.md5(b'other').hexdigest(),
+        }
+        self.assertRaisesRegex(
+            exceptions.CommandError,
+            'data is corrupt',
+            self._upload_file,
+            content,
+            attrs,
+            ['--id', self.new_image.id],
+        )
+        self.images_mock.delete.assert_not_called()
+
+    def _create_from_object(self, content, etag):
+        def _upload(image_id, data):
+            while data.read(65536):
+                pass
+
+        self.images_mock.upload.side_effect = _upload
+        self.images_mock.get.return_value = (
+            image_fakes.FakeImage.create_one_image({
+                'checksum': hashlib.md5(content).hexdigest(),
+            }))
+        self.images_mock.configure_mock(**{
+            'find.side_effect': exceptions.CommandError('x'),
+        })
+        object_store = mock.Mock()
+        object_store.object_stream.return_value = (
+            six.BytesIO(content), len(content), etag)
+        self.app.client_manager.object_store = object_store
+
+        arglist = [
+            '--from-object', 'bucket/images/cirros.img',
+            self.new_image.name,
+        ]
+        verifylist = [
+            ('from_object', 'bucket/images/cirros.img'),
+            ('name', self.new_image.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch('glanceclient.common.utils.get_data_file') as m:
+            result = self.cmd.take_action(parsed_args)
+            m.assert_not_called()
+        object_store.object_stream.assert_called_once_with(
+            container='bucket',
+            object='images/cirros.img',
+        )
+        return result
+
+    def test_image_create_from_object(self):
+        content = b'image data' * 1000
+        self._create_from_object(content, hashlib.md5(content).hexdigest())
+        self.images_mock.upload.assert_called_once_with(
+            self.new_image.id, mock.ANY)
+
+    def test_image_create_from_object_corrupt(self):
+        content = b'image data' * 1000
+        self.assertRaisesRegex(
+            exceptions.CommandError,
+            'ETag .*; the image was deleted',
+            self._create_from_object,
+            content,
+            hashlib.md5(b'other').hexdigest(),
+        )
+        self.images_mock.delete.assert_called_once_with(
+            self.images_mock.get.return_value.id)
+
+    def test_image_create_from_object_invalid(self):
+        arglist = [
+            '--from-object', 'bucket',
+            self.new_image.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+
+    @mock.patch('openstackclient.image.v2.image.time.sleep')
+    def test_image_create_import_glance_direct(self, sleep_mock):
+        content = b'image data' * 1000
+
+        def _stage(image_id, data):
+            while data.read(65536):
+                pass
+
+        self.images_mock.stage.side_effect = _stage
+        importing = image_fakes.FakeImage.create_one_image(
+            {'id': self.new_image.id, 'status': 'importing'})
+        active = image_fakes.FakeImage.create_one_image({
+            'id': self.new_image.id,
+            'status': 'active',
+            'checksum': hashlib.md5(content).hexdigest(),
+        })
+        self.images_mock.get.side_effect = [importing, importing, active]
+        self.images_mock.configure_mock(**{
+            'find.side_effect': exceptions.CommandError('x'),
+        })
+
+        arglist = [
+            '--file', 'filer',
+            '--import-method', 'glance-direct',
+            '--wait',
+            self.new_image.name,
+        ]
+        verifylist = [
+            ('file', 'filer'),
+            ('import_method', 'glance-direct'),
+            ('wait', True),
+            ('name', self.new_image.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch('glanceclient.common.utils.get_data_file',
+                        return_value=six.BytesIO(content)):
+            columns, data = self.cmd.take_action(parsed_args)
+
+        self.images_mock.upload.assert_not_called()
+        self.images_mock.stage.assert_called_once_with(
+            self.new_image.id, mock.ANY)
+        self.images_mock.image_import.assert_called_once_with(
+            self.new_image.id, method='glance-direct')
+        self.assertEqual(1, sleep_mock.call_count)
+        self.assertIn('active', data)
+
+    def test_image_create_import_web_download(self):
+        self.images_mock.configure_mock(**{
+            'find.side_effect': exceptions.CommandError('x'),
+        })
+
+        arglist = [
+            '--import-method', 'web-download',
+            '--uri', 'http://example.com/cirros.img',
+            self.new_image.name,
+        ]
+        verifylist = [
+            ('import_method', 'web-download'),
+            ('uri', 'http://example.com/cirros.img'),
+            ('name', self.new_image.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch('glanceclient.common.utils.get_data_file') as m:
+            self.cmd.take_action(parsed_args)
+            m.assert_not_called()
+
+        self.images_mock.upload.assert_not_called()
+        self.images_mock.stage.assert_not_called()
+        self.images_mock.image_import.assert_called_once_with(
+            self.new_image.id,
+            method='web-download',
+            uri='http://example.com/cirros.img',
+        )
+
+    def test_image_create_import_web_download_no_uri(self):
+        arglist = [
+            '--import-method', 'web-download',
+            self.new_image.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+        self.images_mock.create.assert_not_called()
+
+    @mock.patch('openstackclient.image.v2.image.time.sleep')
+    def test_image_import_failed(self, sleep_mock):
+        self.images_mock.get.side_effect = [
+            image_fakes.FakeImage.create_one_image({'status': 'importing'}),
+            image_fakes.FakeImage.create_one_image({'status': 'queued'}),
+        ]
+        self.assertRaises(exceptions.CommandError,
+                          image._wait_for_import,
+                          self.app.client_manager.image,
+                          self.new_image.id)
+
+    @mock.patch('openstackclient.image.v2.image.time.sleep')
+    def test_image_import_failed_never_importing(self, sleep_mock):
+        self.images_mock.get.return_value = (
+            image_fakes.FakeImage.create_one_image({'status': 'queued'}))
+        e = self.assertRaises(exceptions.CommandError,
+                              image._wait_for_import,
+                              self.app.client_manager.image,
+                              self.new_image.id)
+        self.assertIn('failed', str(e))
+        waited = sum(c[0][0] for c in sleep_mock.call_args_list)
+        self.assertGreaterEqual(waited, image.IMPORT_QUEUED_TIMEOUT)
+        self.assertLess(waited, image.IMPORT_TIMEOUT)
+
+    @mock.patch('openstackclient.image.v2.image.time.sleep')
+    def test_image_import_timeout(self, sleep_mock):
+        self.images_mock.get.return_value = (
+            image_fakes.FakeImage.create_one_image({'status': 'importing'}))
+        e = self.assertRaises(exceptions.CommandError,
+                              image._wait_for_import,
+                              self.app.client_manager.image,
+                              self.new_image.id,
+                              timeout=100)
+        self.assertIn('Timed out', str(e))
+        self.assertAlmostEqual(
+            100, sum(c[0][0] for c in sleep_mock.call_args_list))
+
+    def test_image_create_wait_without_import(self):
+        arglist = [
+            '--wait',
+            self.new_image.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+        self.images_mock.create.assert_not_called()
+
     def test_image_create_dead_options(self):
 
         arglist = [
@@ -752,6 +1020,79 @@ class TestImageList(TestImage):
         self.assertEqual(self.columns, columns)
         self.assertListItemEqual(self.datalist, tuple(data))
 
+    def test_image_list_no_sort_option(self):
+        images = image_fakes.FakeImage.create_images(count=3)
+        self.api_mock.image_list.side_effect = [
+            images[:2], images[2:], [],
+        ]
+
+        arglist = ['--no-sort']
+        verifylist = [('no_sort', True)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # Pages are only requested as the rows are consumed
+        self.api_mock.image_list.assert_not_called()
+        self.assertEqual(images[0].id, next(data)[0])
+        self.api_mock.image_list.assert_called_once_with(marker=None)
+        self.assertEqual([i.id for i in images[1:]],
+                         [row[0] for row in data])
+        self.api_mock.image_list.assert_called_with(marker=images[2].id)
+
+    def test_image_list_sort_spilled(self):
+        pages = [
+            [{'id': str(i), 'name': name, 'size': size}
+             for i, (name, size) in enumerate(page)]
+            for page in (
+                [('b', 1), ('a', 2), ('c', 1)],
+                [('a', 1), ('b', 2)],
+                [('c', 2), ('a', 3)],
+            )
+        ]
+        expected = utils.sort_items(
+            [dict(i) for page in pages for i in page],
+            'size:desc,name',
+            str,
+        )
+        self.assertEqual(
+            expected,
+            list(image._sort_images(iter(pages), 'size:desc,name',
+                                    run_size=2)),
+        )
+
+    def test_image_list_sort_spilled_duplicate_keys(self):
+        pages = [
+            [{'id': str(n), 'name': 'same'} for n in range(i, i + 10)]
+            for i in range(0, 30, 10)
+        ]
+
+        data = list(image._sort_images(iter(pages), 'name', run_size=10))
+
+        self.assertEqual([str(n) for n in range(30)],
+                         [i['id'] for i in data])
+
+    def test_image_list_sort_spilled_files_closed(self):
+        pages = [
+            [{'id': str(n), 'name': str(n)} for n in range(i, i + 2)]
+            for i in range(0, 6, 2)
+        ]
+        files = []
+
+        def temporary_file(*args, **kwargs):
+            f = real_temporary_file(*args, **kwargs)
+            files.append(f)
+            return f
+
+        real_temporary_file = image.tempfile.TemporaryFile
+        with mock.patch.object(image.tempfile, 'TemporaryFile',
+                               side_effect=temporary_file):
+            data = list(image._sort_images(iter(pages), 'name', run_size=2))
+
+        self.assertEqual(6, len(data))
+        self.assertEqual(3, len(files))
+        self.assertTrue(all(f.closed for f in files))
+
     def test_image_list_limit_option(self):
         ret_limit = 1
         arglist = [
@@ -1638,3 +1979,97 @@ class TestImageSave(TestImage):
 
         # Raise SystemExit if no data was provided.
         self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
+
+    def _save_file(self, content, arglist, resp_status=200, attrs=None):
+        image_attrs = {
+            'size': len(content),
+            'checksum': hashlib.md5(content).hexdigest(),
+            'os_hash_algo': 'sha512',
+            'os_hash_value': hashlib.sha512(content).hexdigest(),
+        }
+        image_attrs.update(attrs or {})
+        self.images_mock.get.return_value = (
+            image_fakes.FakeImage.create_one_image(image_attrs))
+        self.images_mock.configure_mock(**{
+            'find.side_effect': exceptions.CommandError('x'),
+        })
+        resp = mock.Mock(status_code=resp_status)
+        http_client = self.app.client_manager.image.http_client
+        http_client.get.return_value = (
+            resp, iter([content[i:i + 1000]
+                        for i in range(0, len(content), 1000)]))
+
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.cmd.take_action(parsed_args)
+        return http_client.get
+
+    def test_save_resume(self):
+        content = b'0123456789' * 1000
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'img')
+        with open(path, 'wb') as f:
+            f.write(content[:3000])
+
+        get_mock = self._save_file(
+            content[3000:],
+            ['--file', path, '--resume', self.image.id],
+            resp_status=206,
+            attrs={
+                'size': len(content),
+                'checksum': hashlib.md5(content).hexdigest(),
+                'os_hash_value': hashlib.sha512(content).hexdigest(),
+            },
+        )
+
+        get_mock.assert_called_once_with(
+            '/v2/images/%s/file' % self.images_mock.get.return_value.id,
+            headers={'Range': 'bytes=3000-'},
+        )
+        with open(path, 'rb') as f:
+            self.assertEqual(content, f.read())
+
+    def test_save_resume_not_supported(self):
+        content = b'0123456789' * 1000
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'img')
+        with open(path, 'wb') as f:
+            f.write(b'x' * 3000)
+
+        self._save_file(content, ['--file', path, '--resume', self.image.id])
+
+        with open(path, 'rb') as f:
+            self.assertEqual(content, f.read())
+
+    def test_save_resume_complete(self):
+        content = b'0123456789' * 1000
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'img')
+        with open(path, 'wb') as f:
+            f.write(content)
+
+        get_mock = self._save_file(
+            content, ['--file', path, '--resume', self.image.id])
+
+        get_mock.assert_not_called()
+
+    def test_save_sparse(self):
+        content = b'\0' * 10000 + b'data' + b'\0' * 10000
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'img')
+
+        self._save_file(content, ['--file', path, '--sparse', self.image.id])
+
+        with open(path, 'rb') as f:
+            self.assertEqual(content, f.read())
+
+    def test_save_corrupt(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'img')
+        self.assertRaises(
+            exceptions.CommandError,
+            self._save_file,
+            b'0123456789',
+            ['--file', path, '--sparse', self.image.id],
+            attrs={'os_hash_value': hashlib.sha512(b'other').hexdigest()},
+        )
+
+    def test_save_resume_no_file(self):
+        parsed_args = self.check_parser(
+            self.cmd, ['--resume', self.image.id], [])
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
@@ -102,6 +102,26 @@ class FakeNetworkAndComputeShowOne(common.NetworkAndComputeShowOne):
         return client.compute_action(parsed_args)
 
 
+class FakeNetworkAndComputeDelete(common.NetworkAndComputeDelete):
+
+    resource = 'resource'
+
+    def update_parser_common(self, parser):
+        parser.add_argument(
+            'resource',
+            metavar='<resource>',
+            nargs='+',
+            help='Resource argument',
+        )
+        return parser
+
+    def take_action_network(self, client, parsed_args):
+        client.network_action(self.r)
+
+    def take_action_compute(self, client, parsed_args):
+        client.compute_action(self.r)
+
+
 class TestNetworkAndCompute(utils.TestCommand):
 
     def setUp(self):
@@ -187,3 +207,55 @@ class TestNetworkAndComputeShowOne(TestNetworkAndCompute):
             m_action.side_effect = openstack.exceptions.HttpException("bar")
             self.assertRaisesRegex(exceptions.CommandError, "bar",
                                    self.cmd.take_action, mock.Mock())
+
+
+class TestNetworkAndComputeDelete(utils.TestCommand):
+
+    def setUp(self):
+        super(TestNetworkAndComputeDelete, self).setUp()
+        self.app.client_manager.network = mock.Mock()
+        self.network = self.app.client_manager.network
+        self.app.client_manager.compute = mock.Mock()
+        self.compute = self.app.client_manager.compute
+        self.app.client_manager.is_network_endpoint_enabled = mock.Mock(
+            return_value=True)
+        self.cmd = FakeNetworkAndComputeDelete(self.app, argparse.Namespace())
+
+    def test_delete_multi(self):
+        arglist = ['r%d' % i for i in range(20)]
+        verifylist = [('resource', arglist)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.app.client_manager.is_network_endpoint_enabled.reset_mock()
+
+        result = self.cmd.take_action(parsed_args)
+
+        self.assertIsNone(result)
+        self.app.client_manager.is_network_endpoint_enabled.\
+            assert_called_once_with()
+        self.network.network_action.assert_has_calls(
+            [mock.call(r) for r in arglist], any_order=True)
+        self.assertEqual(20, self.network.network_action.call_count)
+
+    def test_delete_multi_compute_with_exception(self):
+        self.app.client_manager.is_network_endpoint_enabled.return_value = (
+            False)
+
+        def compute_action(r):
+            if r != 'r0':
+                raise exceptions.CommandError
+
+        self.compute.compute_action.side_effect = compute_action
+        arglist = ['r0', 'r1', 'r2']
+        verifylist = [('resource', arglist)]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaisesRegex(exceptions.CommandError,
+                               '2 of 3 resources failed to delete.',
+                               self.cmd.take_action, parsed_args)
+        self.network.network_action.assert_not_called()
+        self.assertEqual(3, self.compute.compute_action.call_count)
+
+    def test_r_not_set(self):
+        self.assertRaisesRegex(AttributeError,
+                               'only set while take_action',
+                               getattr, self.cmd, 'r')
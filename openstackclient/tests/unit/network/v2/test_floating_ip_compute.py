@@ -140,15 +140,17 @@ class TestDeleteFloatingIPCompute(TestFloatingIPCompute):
         calls = []
         for f in self._floating_ips:
             calls.append(call(f['id']))
-        fip_mock.assert_has_calls(calls)
+        fip_mock.assert_has_calls(calls, any_order=True)
         self.assertIsNone(result)
 
     def test_floating_ip_delete_multi_exception(self, fip_mock):
         fip_mock.return_value = mock.Mock(return_value=None)
-        fip_mock.side_effect = ([
-            mock.Mock(return_value=None),
-            exceptions.CommandError,
-        ])
+
+        def delete(i):
+            if i == 'unexist_floating_ip':
+                raise exceptions.CommandError
+
+        fip_mock.side_effect = delete
         arglist = [
             self._floating_ips[0]['id'],
             'unexist_floating_ip',
@@ -306,10 +306,9 @@ class TestDeleteFloatingIPNetwork(TestFloatingIPNetwork):
         self.assertIsNone(result)
 
     def test_floating_ip_delete_multi(self):
-        self.network.find_ip.side_effect = [
-            self.floating_ips[0],
-            self.floating_ips[1],
-        ]
+        floating_ips = dict((f.id, f) for f in self.floating_ips)
+        self.network.find_ip.side_effect = (
+            lambda name, ignore_missing: floating_ips[name])
         arglist = []
         verifylist = []
 
@@ -332,19 +331,23 @@ class TestDeleteFloatingIPNetwork(TestFloatingIPNetwork):
                 ignore_missing=False,
             ),
         ]
-        self.network.find_ip.assert_has_calls(calls)
+        self.network.find_ip.assert_has_calls(calls, any_order=True)
 
         calls = []
         for f in self.floating_ips:
             calls.append(call(f))
-        self.network.delete_ip.assert_has_calls(calls)
+        self.network.delete_ip.assert_has_calls(calls, any_order=True)
         self.assertIsNone(result)
 
     def test_floating_ip_delete_multi_exception(self):
-        self.network.find_ip.side_effect = [
-            self.floating_ips[0],
-            exceptions.CommandError,
-        ]
+        floating_ips = {self.floating_ips[0].id: self.floating_ips[0]}
+
+        def find_ip(name, ignore_missing):
+            if name not in floating_ips:
+                raise exceptions.CommandError
+            return floating_ips[name]
+
+        self.network.find_ip.side_effect = find_ip
         arglist = [
             self.floating_ips[0].id,
             'unexist_floating_ip',
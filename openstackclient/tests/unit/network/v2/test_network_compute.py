@@ -224,15 +224,17 @@ class TestDeleteNetworkCompute(TestNetworkCompute):
         calls = []
         for n in self._networks:
             calls.append(call(n['id']))
-        net_mock.assert_has_calls(calls)
+        net_mock.assert_has_calls(calls, any_order=True)
         self.assertIsNone(result)
 
     def test_network_delete_multi_with_exception(self, net_mock):
         net_mock.return_value = mock.Mock(return_value=None)
-        net_mock.side_effect = ([
-            mock.Mock(return_value=None),
-            exceptions.CommandError,
-        ])
+
+        def delete(i):
+            if i != self._networks[0]['id']:
+                raise exceptions.CommandError
+
+        net_mock.side_effect = delete
         arglist = [
             self._networks[0]['id'],
             'xxxx-yyyy-zzzz',
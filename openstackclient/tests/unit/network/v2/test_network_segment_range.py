@@ -478,6 +478,38 @@ class TestListNetworkSegmentRange(TestNetworkSegmentRange):
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(self.data_long, list(data))
 
+    def test_list_free_queries(self):
+        arglist = [
+            '--free-count',
+            '--first-free', '3',
+        ]
+        verifylist = [
+            ('long', False),
+            ('free_count', True),
+            ('first_free', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns + ('Free Count', 'First Free'),
+                         columns)
+        self.assertEqual(
+            [d + (5, ['100-102']) for d in self.data], list(data))
+
+    def test_list_first_free_not_positive(self):
+        arglist = [
+            '--first-free', '0',
+        ]
+        verifylist = [
+            ('first_free', 0),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+        self.network.network_segment_ranges.assert_not_called()
+
 
 class TestSetNetworkSegmentRange(TestNetworkSegmentRange):
 
@@ -629,3 +661,59 @@ class TestShowNetworkSegmentRange(TestNetworkSegmentRange):
 
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
+
+    def test_show_free_queries(self):
+        arglist = [
+            self._network_segment_range.id,
+            '--free-count',
+            '--first-free', '6',
+        ]
+        verifylist = [
+            ('network_segment_range', self._network_segment_range.id),
+            ('free_count', True),
+            ('first_free', 6),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns + ('free_count', 'first_free'),
+                         columns)
+        self.assertEqual(self.data + (5, ['100-103', '105']), data)
+
+    def test_show_available_not_matching_used(self):
+        # The used IDs come back as strings.  The available IDs, which need
+        # not be sorted, are not all the unused ones, so they are used as is
+        used = {'4097': 'project-id', '4098': 'project-id',
+                '10000': 'project-id'}
+        available = [i for i in range(1, 65536)
+                     if str(i) not in used and i != 20000]
+        available.reverse()
+        segment_range = network_fakes.FakeNetworkSegmentRange.\
+            create_one_network_segment_range({
+                'network_type': 'vxlan',
+                'physical_network': None,
+                'minimum': 1,
+                'maximum': 65535,
+                'used': used,
+                'available': available,
+            })
+        self.network.find_network_segment_range.return_value = segment_range
+        arglist = [
+            segment_range.id,
+            '--free-count',
+        ]
+        verifylist = [
+            ('network_segment_range', segment_range.id),
+            ('free_count', True),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        columns, data = self.cmd.take_action(parsed_args)
+
+        data = dict(zip(columns, data))
+        self.assertEqual(['1-4096', '4099-9999', '10001-19999',
+                          '20001-65535'], data['available'])
+        self.assertEqual({'project-id': ['4097-4098', '10000']},
+                         data['used'])
+        self.assertEqual(65531, data['free_count'])
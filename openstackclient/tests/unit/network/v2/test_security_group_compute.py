@@ -168,15 +168,17 @@ class TestDeleteSecurityGroupCompute(TestSecurityGroupCompute):
         calls = []
         for s in self._security_groups:
             calls.append(call(s['id']))
-        sg_mock.assert_has_calls(calls)
+        sg_mock.assert_has_calls(calls, any_order=True)
         self.assertIsNone(result)
 
     def test_security_group_multi_delete_with_exception(self, sg_mock):
         sg_mock.return_value = mock.Mock(return_value=None)
-        sg_mock.side_effect = ([
-            mock.Mock(return_value=None),
-            exceptions.CommandError,
-        ])
+
+        def delete(i):
+            if i == 'unexist_security_group':
+                raise exceptions.CommandError
+
+        sg_mock.side_effect = delete
         arglist = [
             self._security_groups[0]['id'],
             'unexist_security_group',
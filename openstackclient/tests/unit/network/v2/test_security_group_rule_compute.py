@@ -298,7 +298,7 @@ class TestDeleteSecurityGroupRuleCompute(TestSecurityGroupRuleCompute):
         calls = []
         for s in self._security_group_rules:
             calls.append(call(s['id']))
-        sgr_mock.assert_has_calls(calls)
+        sgr_mock.assert_has_calls(calls, any_order=True)
         self.assertIsNone(result)
 
     def test_security_group_rule_delete_multi_with_exception(self, sgr_mock):
@@ -312,8 +312,11 @@ class TestDeleteSecurityGroupRuleCompute(TestSecurityGroupRuleCompute):
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        find_mock_result = [None, exceptions.CommandError]
-        sgr_mock.side_effect = find_mock_result
+        def delete(i):
+            if i == 'unexist_rule':
+                raise exceptions.CommandError
+
+        sgr_mock.side_effect = delete
 
         try:
             self.cmd.take_action(parsed_args)
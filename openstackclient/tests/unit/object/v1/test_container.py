@@ -16,6 +16,7 @@
 import copy
 
 import mock
+from osc_lib import exceptions
 
 from openstackclient.api import object_store_v1 as object_store
 from openstackclient.object.v1 import container
@@ -325,6 +326,69 @@ class TestContainerList(TestContainer):
         )
         self.assertEqual(datalist, tuple(data))
 
+    @mock.patch(
+        'openstackclient.api.object_store_v1.APIv1.container_show'
+    )
+    def test_object_list_containers_metadata(self, s_mock, c_mock):
+        c_mock.return_value = [
+            copy.deepcopy(object_fakes.CONTAINER),
+            copy.deepcopy(object_fakes.CONTAINER_3),
+        ]
+
+        def _show(container):
+            if container != object_fakes.container_name:
+                raise exceptions.NotFound('gone')
+            return {
+                'container': object_fakes.container_name,
+                'read_acl': '.r:*',
+                'properties': {'Owner': 'fred'},
+            }
+
+        s_mock.side_effect = _show
+
+        arglist = [
+            '--metadata',
+        ]
+        verifylist = [
+            ('metadata', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        s_mock.assert_has_calls([
+            mock.call(container=object_fakes.container_name),
+            mock.call(container=object_fakes.container_name_3),
+        ], any_order=True)
+
+        collist = ('Name', 'Bytes', 'Count', 'Read ACL', 'Write ACL',
+                   'Sync To', 'Properties')
+        self.assertEqual(collist, columns)
+        data = tuple(data)
+        self.assertEqual(
+            (
+                object_fakes.container_name,
+                object_fakes.container_bytes,
+                object_fakes.container_count,
+                '.r:*',
+                '',
+                '',
+            ),
+            data[0][:6],
+        )
+        self.assertEqual({'Owner': 'fred'}, data[0][6].machine_readable())
+        self.assertEqual(
+            (
+                object_fakes.container_name_3,
+                object_fakes.container_bytes * 3,
+                object_fakes.container_count * 3,
+                '',
+                '',
+                '',
+            ),
+            data[1][:6],
+        )
+
     def test_object_list_containers_all(self, c_mock):
         c_mock.return_value = [
             copy.deepcopy(object_fakes.CONTAINER),
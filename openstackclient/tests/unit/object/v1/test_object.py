@@ -16,6 +16,7 @@
 import copy
 
 import mock
+from osc_lib import exceptions
 
 from openstackclient.api import object_store_v1 as object_store
 from openstackclient.object.v1 import object as obj
@@ -381,3 +382,238 @@ class TestObjectShow(TestObject):
             object_fakes.object_name_1,
         )
         self.assertEqual(datalist, data)
+
+
+@mock.patch(
+    'openstackclient.api.object_store_v1.APIv1.object_list'
+)
+@mock.patch(
+    'openstackclient.api.object_store_v1.APIv1.temp_url_key'
+)
+@mock.patch(
+    'openstackclient.object.v1.object.time.time',
+    return_value=1500000000,
+)
+class TestObjectTempURLCreate(TestObject):
+
+    columns = ('Object', 'URL', 'Expires')
+
+    def setUp(self):
+        super(TestObjectTempURLCreate, self).setUp()
+        self.api.endpoint = object_fakes.ENDPOINT
+
+        # Get the command object to test
+        self.cmd = obj.CreateObjectTempURL(self.app, None)
+
+    def test_object_temp_url_create(self, t_mock, k_mock, o_mock):
+        k_mock.return_value = 'secret'
+
+        arglist = [
+            object_fakes.container_name,
+            object_fakes.object_name_1,
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('objects', [object_fakes.object_name_1]),
+            ('lifetime', 3600),
+            ('method', 'GET'),
+            ('digest', 'sha256'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        k_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+        )
+        o_mock.assert_not_called()
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(
+            [(
+                object_fakes.object_name_1,
+                self.api.object_temp_url(
+                    object_fakes.container_name,
+                    object_fakes.object_name_1,
+                    1500003600,
+                    'secret',
+                ),
+                '2017-07-14T03:40:00Z',
+            )],
+            list(data),
+        )
+
+    def test_object_temp_url_create_prefix(self, t_mock, k_mock, o_mock):
+        o_mock.return_value = [
+            copy.deepcopy(object_fakes.OBJECT),
+            copy.deepcopy(object_fakes.OBJECT_2),
+        ]
+
+        arglist = [
+            '--prefix', 'p',
+            '--key', 'secret',
+            '--lifetime', '60',
+            '--method', 'PUT',
+            '--digest', 'sha512',
+            object_fakes.container_name,
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('objects', []),
+            ('prefix', 'p'),
+            ('key', 'secret'),
+            ('lifetime', 60),
+            ('method', 'PUT'),
+            ('digest', 'sha512'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        k_mock.assert_not_called()
+        o_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+            prefix='p',
+            all_data=True,
+        )
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(
+            [
+                (
+                    name,
+                    self.api.object_temp_url(
+                        object_fakes.container_name,
+                        name,
+                        1500000060,
+                        'secret',
+                        method='PUT',
+                        digest='sha512',
+                    ),
+                    '2017-07-14T02:41:00Z',
+                )
+                for name in (object_fakes.object_name_1,
+                             object_fakes.object_name_2)
+            ],
+            list(data),
+        )
+
+    def test_object_temp_url_create_no_key(self, t_mock, k_mock, o_mock):
+        k_mock.return_value = None
+
+        arglist = [
+            object_fakes.container_name,
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+
+
+@mock.patch(
+    'openstackclient.api.object_store_v1.APIv1.temp_url_key'
+)
+@mock.patch(
+    'openstackclient.object.v1.object.time.time',
+    return_value=1500000000,
+)
+class TestObjectFormPostCreate(TestObject):
+
+    columns = (
+        'expires',
+        'expires_at',
+        'max_file_count',
+        'max_file_size',
+        'redirect',
+        'signature',
+        'url',
+    )
+
+    def setUp(self):
+        super(TestObjectFormPostCreate, self).setUp()
+        self.api.endpoint = object_fakes.ENDPOINT
+
+        # Get the command object to test
+        self.cmd = obj.CreateObjectFormPost(self.app, None)
+
+    def test_object_form_post_create(self, t_mock, k_mock):
+        k_mock.return_value = 'secret'
+
+        arglist = [
+            object_fakes.container_name,
+            '--object-prefix', 'up/',
+            '--redirect', 'https://example.com/done',
+            '--max-file-size', '1024',
+            '--max-file-count', '2',
+            '--lifetime', '60',
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('object_prefix', 'up/'),
+            ('redirect', 'https://example.com/done'),
+            ('max_file_size', 1024),
+            ('max_file_count', 2),
+            ('lifetime', 60),
+            ('digest', 'sha256'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        k_mock.assert_called_once_with(
+            container=object_fakes.container_name,
+        )
+        url, signature = self.api.object_form_post(
+            object_fakes.container_name,
+            1500000060,
+            'secret',
+            prefix='up/',
+            redirect='https://example.com/done',
+            max_file_size=1024,
+            max_file_count=2,
+        )
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(
+            (
+                1500000060,
+                '2017-07-14T02:41:00Z',
+                2,
+                1024,
+                'https://example.com/done',
+                signature,
+                url,
+            ),
+            data,
+        )
+
+    def test_object_form_post_create_no_key(self, t_mock, k_mock):
+        k_mock.return_value = None
+
+        arglist = [
+            object_fakes.container_name,
+            '--max-file-size', '1024',
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('max_file_size', 1024),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+
+    def test_object_form_post_create_bad_count(self, t_mock, k_mock):
+        arglist = [
+            object_fakes.container_name,
+            '--max-file-size', '1024',
+            '--max-file-count', '0',
+        ]
+        verifylist = [
+            ('max_file_count', 0),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+        k_mock.assert_not_called()
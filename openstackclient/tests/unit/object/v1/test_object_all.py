@@ -59,6 +59,34 @@ class TestObjectCreate(TestObjectAll):
                           self.cmd.take_action,
                           parsed_args)
 
+    def _test_object_create_segment_size(self, segment_size):
+        arglist = [
+            object_fakes.container_name,
+            '-',
+            '--name', object_fakes.object_upload_name,
+            '--segment-size', segment_size,
+        ]
+        verifylist = [
+            ('segment_size', int(segment_size)),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(self.app.client_manager.object_store,
+                               'object_create') as create_mock:
+            self.assertRaises(exceptions.CommandError,
+                              self.cmd.take_action,
+                              parsed_args)
+            create_mock.assert_not_called()
+
+    def test_object_create_segment_size_negative(self):
+        self._test_object_create_segment_size('-1')
+
+    def test_object_create_segment_size_zero(self):
+        self._test_object_create_segment_size('0')
+
+    def test_object_create_segment_size_too_large(self):
+        self._test_object_create_segment_size(str(5 * 1024 ** 3 + 1))
+
 
 class TestObjectList(TestObjectAll):
 
@@ -40,6 +40,10 @@ class TestCase(testtools.TestCase):
     def setUp(self):
         testtools.TestCase.setUp(self)
 
+        # Keep the on-disk name caches out of the home directory
+        self.useFixture(fixtures.EnvironmentVariable(
+            'XDG_CACHE_HOME', self.useFixture(fixtures.TempDir()).path))
+
         if (os.environ.get("OS_STDOUT_CAPTURE") == "True" or
                 os.environ.get("OS_STDOUT_CAPTURE") == "1"):
             stdout = self.useFixture(fixtures.StringStream("stdout")).stream